@@ -0,0 +1,47 @@
+"""
+Compares the storages of the gaps groups (Python lists and, with `compact=True`, arrays of 32-bit ints) on a BAliBASE
+instance: memory taken by the gaps groups of the pre-computed alignments and time taken by a seeded loop of crossovers
+and mutations. Compact storage saves memory, but it is not faster (reading positions from arrays boxes them again).
+
+Usage: python gaps_storage.py [instance] [number of iterations]
+"""
+import logging
+import random
+import sys
+import time
+
+from pymsa.core.score import SumOfPairs
+
+from sequoya.operator import SPXMSA, ShiftClosedGapGroups
+from sequoya.problem import BAliBASE
+
+
+def run_operators(problem: BAliBASE, number_of_iterations: int) -> float:
+    random.seed(1)
+    population = problem.import_instance()
+    crossover, mutation = SPXMSA(probability=1.0), ShiftClosedGapGroups(probability=1.0)
+
+    start_time = time.perf_counter()
+
+    for _ in range(number_of_iterations):
+        for offspring in crossover.execute(random.sample(population, 2)):
+            mutation.execute(offspring)
+
+    return time.perf_counter() - start_time
+
+
+if __name__ == '__main__':
+    logging.getLogger('Sequoya').setLevel(logging.WARNING)
+
+    instance = sys.argv[1] if len(sys.argv) > 1 else 'BB11005'
+    number_of_iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+
+    print(f'Instance: {instance}')
+
+    for compact in (False, True):
+        problem = BAliBASE(instance=instance, path='../resources', score_list=[SumOfPairs()], compact=compact)
+        size = sum(solution.gaps_groups.get_size_in_bytes() for solution in problem.sequences)
+        computing_time = run_operators(problem, number_of_iterations)
+
+        print(f'{"Compact" if compact else "List"} storage: {size} bytes of gaps groups, '
+              f'{computing_time:.2f} seconds for {number_of_iterations} iterations')
@@ -0,0 +1,43 @@
+"""
+Reports the size in bytes of pickled solutions of a BAliBASE instance, using the default pickling of the solution
+state (all the original sequences and identifiers included) and the compact one (key of the instance store plus the
+data of the solution).
+
+Usage: python pickle_size.py [instance] [number of solutions]
+"""
+import logging
+import pickle
+import sys
+
+from pymsa.core.score import SumOfPairs
+
+from sequoya.problem import BAliBASE
+
+
+def default_pickle_size(solution) -> int:
+    state = {name: value for name, value in solution.__dict__.items() if name != 'store'}
+    state['_gaps_groups'] = [list(gaps_group) for gaps_group in solution.gaps_groups]
+    state['_dirty_columns'] = solution.dirty_columns.get_ranges()
+
+    return len(pickle.dumps((solution.__class__, state), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def compact_pickle_size(solution) -> int:
+    return len(pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+if __name__ == '__main__':
+    logging.getLogger('Sequoya').setLevel(logging.WARNING)
+
+    instance = sys.argv[1] if len(sys.argv) > 1 else 'BB11005'
+    number_of_solutions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    problem = BAliBASE(instance=instance, path='../resources', score_list=[SumOfPairs()])
+    solutions = [problem.evaluate(problem.create_solution()) for _ in range(number_of_solutions)]
+
+    default_size = sum(default_pickle_size(solution) for solution in solutions) / number_of_solutions
+    compact_size = sum(compact_pickle_size(solution) for solution in solutions) / number_of_solutions
+
+    print(f'Instance: {instance} ({problem.number_of_variables} sequences)')
+    print(f'Default pickle: {default_size:.0f} bytes per solution')
+    print(f'Compact pickle: {compact_size:.0f} bytes per solution ({compact_size / default_size:.1%})')
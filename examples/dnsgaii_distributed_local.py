@@ -32,7 +32,8 @@ if __name__ == '__main__':
         crossover=SPXMSA(probability=0.7),
         termination_criterion=StoppingByEvaluations(max_evaluations=max_evaluations),
         number_of_cores=ncores,
-        client=client
+        client=client,
+        shared_memory=True
     )
 
     algorithm.observable.register(observer=ProgressBarObserver(max=max_evaluations))
@@ -7,6 +7,7 @@ from pymsa.core.score import SumOfPairs, PercentageOfTotallyConservedColumns
 
 from sequoya.operator import SPXMSA, ShiftClosedGapGroups
 from sequoya.problem import BAliBASE
+from sequoya.util.evaluator import BatchEvaluator
 from sequoya.util.solution import get_representative_set
 from sequoya.util.visualization import MSAPlot
 
@@ -26,7 +27,8 @@ if __name__ == '__main__':
         mutation=ShiftClosedGapGroups(probability=0.3),
         crossover=SPXMSA(probability=0.7),
         dominance_comparator=GDominanceComparator(reference_point),
-        termination_criterion=StoppingByEvaluations(max_evaluations=max_evaluations)
+        termination_criterion=StoppingByEvaluations(max_evaluations=max_evaluations),
+        population_evaluator=BatchEvaluator()
     )
 
     algorithm.observable.register(observer=ProgressBarObserver(max=max_evaluations))
@@ -6,6 +6,7 @@ from pymsa.core.score import SumOfPairs, PercentageOfTotallyConservedColumns
 
 from sequoya.operator import SPXMSA, ShiftClosedGapGroups
 from sequoya.problem import BAliBASE
+from sequoya.util.evaluator import ProcessPoolEvaluator
 from sequoya.util.solution import restore_objs, get_representative_set
 from sequoya.util.visualization import MSAPlot
 
@@ -17,19 +18,23 @@ if __name__ == '__main__':
     # creates the algorithm
     max_evaluations = 50000
 
-    algorithm = NSGAII(
-        problem=problem,
-        population_size=100,
-        offspring_population_size=100,
-        mutation=ShiftClosedGapGroups(probability=0.3),
-        crossover=SPXMSA(probability=0.7),
-        termination_criterion=StoppingByEvaluations(max_evaluations=max_evaluations)
-    )
+    # the pool of worker processes is shut down on leaving the block, even if the run fails
+    with ProcessPoolEvaluator() as population_evaluator:
+        algorithm = NSGAII(
+            problem=problem,
+            population_size=100,
+            offspring_population_size=100,
+            mutation=ShiftClosedGapGroups(probability=0.3),
+            crossover=SPXMSA(probability=0.7),
+            termination_criterion=StoppingByEvaluations(max_evaluations=max_evaluations),
+            population_evaluator=population_evaluator
+        )
 
-    algorithm.observable.register(observer=ProgressBarObserver(max=max_evaluations))
-    algorithm.observable.register(observer=VisualizerObserver())
+        algorithm.observable.register(observer=ProgressBarObserver(max=max_evaluations))
+        algorithm.observable.register(observer=VisualizerObserver())
+
+        algorithm.run()
 
-    algorithm.run()
     front = algorithm.get_result()
     front = restore_objs(front, problem)
 
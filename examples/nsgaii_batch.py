@@ -0,0 +1,33 @@
+from jmetal.algorithm.multiobjective.nsgaii import NSGAII
+from jmetal.util.termination_criterion import StoppingByEvaluations
+from pymsa.core.score import SumOfPairs, PercentageOfTotallyConservedColumns
+
+from sequoya.operator import SPXMSA, ShiftClosedGapGroups
+from sequoya.util.cache import InstanceCache
+from sequoya.util.runner import BatchRunner, find_instances
+
+
+def create_algorithm(problem):
+    return NSGAII(
+        problem=problem,
+        population_size=100,
+        offspring_population_size=100,
+        mutation=ShiftClosedGapGroups(probability=0.3),
+        crossover=SPXMSA(probability=0.7),
+        termination_criterion=StoppingByEvaluations(max_evaluations=25000)
+    )
+
+
+if __name__ == '__main__':
+    # solves every instance of the reference sets RV11 and RV12; running it again skips the completed ones
+    runner = BatchRunner(path='../resources',
+                         score_list=[SumOfPairs(), PercentageOfTotallyConservedColumns()],
+                         create_algorithm=create_algorithm,
+                         results_filename='NSGAII-RV11-RV12.npz',
+                         problem_options={'instance_cache': InstanceCache('../resources/.cache')})
+
+    with runner:
+        results = runner.run(find_instances('../resources', ['RV11', 'RV12']))
+
+    for instance, computing_time in zip(results.columns['instance'], results.columns['computing_time']):
+        print(instance, computing_time, results.get_front(instance).max(axis=0))
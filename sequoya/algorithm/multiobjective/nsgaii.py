@@ -2,7 +2,6 @@ import logging
 import time
 from typing import List, TypeVar
 
-import dask
 from distributed import as_completed, Client
 from jmetal.config import store
 from jmetal.core.algorithm import Algorithm
@@ -14,8 +13,10 @@ from jmetal.util.ranking import FastNonDominatedRanking
 from jmetal.util.replacement import RankingAndDensityEstimatorReplacement, RemovalPolicyType
 from jmetal.util.termination_criterion import TerminationCriterion
 
+from sequoya.core.shared import SharedPopulation, release_attached_population
 from sequoya.core.solution import MSASolution
 from sequoya.problem import MSA
+from sequoya.util.solution import is_duplicate
 
 LOGGER = logging.getLogger('Sequoya')
 
@@ -37,8 +38,19 @@ def reproduction(mating_population: List[MSASolution], problem, crossover_operat
     return problem.evaluate(offspring_population[0])
 
 
+def shared_reproduction(population: SharedPopulation, start: int, problem, crossover_operator, mutation_operator,
+                        solution_class: type) -> MSASolution:
+    """ Reproduction of the two parents found in the slots of a shared population from `start` on. """
+    mating_population = [population.get(index, solution_class) for index in range(start, start + 2)]
+
+    return reproduction(mating_population, problem, crossover_operator, mutation_operator)
+
+
 class DistributedNSGAII(Algorithm[S, R]):
 
+    # rounds of new solutions created to replace the duplicates of the initial population, before accepting them
+    MAX_INITIAL_ROUNDS = 10
+
     def __init__(self,
                  problem: MSA,
                  population_size: int,
@@ -50,7 +62,13 @@ class DistributedNSGAII(Algorithm[S, R]):
                      MultiComparator([FastNonDominatedRanking.get_comparator(),
                                       CrowdingDistance.get_comparator()])),
                  termination_criterion: TerminationCriterion = store.default_termination_criteria,
-                 dominance_comparator: Comparator = store.default_comparator):
+                 dominance_comparator: Comparator = store.default_comparator,
+                 shared_memory: bool = False):
+        """
+        :param shared_memory: If True, the problem is sent once to each worker, and the parents of every reproduction
+        task are passed through a :class:`SharedPopulation` (by index) instead of being pickled, which requires the
+        workers to run on the same host (e.g., a `LocalCluster`) and the solutions to share the store of the problem.
+        """
         super(DistributedNSGAII, self).__init__()
         self.problem = problem
         self.population_size = population_size
@@ -64,12 +82,23 @@ class DistributedNSGAII(Algorithm[S, R]):
 
         self.number_of_cores = number_of_cores
         self.client = client
+        self.shared_memory = shared_memory
 
     def create_initial_solutions(self) -> List[S]:
         return [self.problem.create_solution() for _ in range(self.number_of_cores)]
 
     def evaluate(self, solutions: List[S]) -> List[S]:
-        return self.client.map(self.problem.evaluate, solutions)
+        """ Evaluates the solutions in (at most) one batch per core, see :meth:`MSA.evaluate_batch`. Problems without
+        batch evaluation are evaluated one solution per task. """
+        if not hasattr(self.problem, 'evaluate_batch'):
+            return self.client.gather(self.client.map(self.problem.evaluate, solutions, pure=False))
+
+        batch_size = -(-len(solutions) // self.number_of_cores)
+        batches = [solutions[i:i + batch_size] for i in range(0, len(solutions), batch_size)]
+
+        futures = self.client.map(self.problem.evaluate_batch, batches, pure=False)
+
+        return [solution for batch in self.client.gather(futures) for solution in batch]
 
     def stopping_condition_is_met(self) -> bool:
         return self.termination_criterion.is_met
@@ -95,68 +124,62 @@ class DistributedNSGAII(Algorithm[S, R]):
         self.observable.notify_all(**observable_data)
 
     def run(self):
-        """ Execute the algorithm. """
+        """ Execute the algorithm. The initial population is evaluated in batches (see :meth:`evaluate`), replacing
+        duplicated solutions for up to `MAX_INITIAL_ROUNDS` rounds; then every offspring is created and evaluated in a
+        task of its own, as soon as a worker is free (steady-state). """
         self.start_computing_time = time.time()
 
-        LOGGER.info(f'Creating initial set of {self.number_of_cores}-solutions')
-        create_solution = dask.delayed(self.problem.create_solution)
-        evaluate_solution = dask.delayed(self.problem.evaluate)
-
-        task_pool = as_completed([], with_results=True)
-
-        for _ in range(self.number_of_cores):
-            new_solution = create_solution()
-            new_evaluated_solution = evaluate_solution(new_solution)
-            future = self.client.compute(new_evaluated_solution)
-
-            task_pool.add(future)
-
-        batches = task_pool.batches()
-
         LOGGER.info(f'Creating initial population of {self.population_size} individuals')
 
-        auxiliar_population = []
-        while len(auxiliar_population) < self.population_size:
-            batch = next(batches)
-            for _, received_solution in batch:
-                auxiliar_population.append(received_solution)
+        auxiliar_population, duplicates = [], []
+        rounds = 0
+        while len(auxiliar_population) < self.population_size and rounds < self.MAX_INITIAL_ROUNDS:
+            new_solutions = [self.problem.create_solution()
+                             for _ in range(self.population_size - len(auxiliar_population))]
+            duplicates = []
+            rounds += 1
 
-                if len(auxiliar_population) < self.population_size:
-                    break
+            for received_solution in self.evaluate(new_solutions):
+                if not is_duplicate(received_solution, auxiliar_population):
+                    auxiliar_population.append(received_solution)
+                else:
+                    duplicates.append(received_solution)
 
-            # submit as many new tasks as we collected
-            for _ in batch:
-                new_solution = create_solution()
-                new_evaluated_solution = evaluate_solution(new_solution)
-                future = self.client.compute(new_evaluated_solution)
+        if len(auxiliar_population) < self.population_size:
+            # e.g., small instances, or instances with few pre-computed alignments
+            LOGGER.warning(f'Only {len(auxiliar_population)} different solutions were created in {rounds} rounds, the '
+                           f'initial population is completed with duplicates')
+            auxiliar_population += duplicates
 
-                task_pool.add(future)
+        self.solutions = auxiliar_population
 
         LOGGER.info(f'Running main loop at {time.time() - self.start_computing_time}')
         self.init_progress()
 
+        submit_reproduction = self._get_reproduction_submitter(auxiliar_population)
+
+        task_pool = as_completed([], with_results=True)
+        for _ in range(self.number_of_cores):
+            task_pool.add(submit_reproduction(self._select_mating_population(auxiliar_population)))
+
+        batches = task_pool.batches()
+
         # perform an algorithm step to create a new solution to be evaluated
         while not self.stopping_condition_is_met():
             batch = next(batches)
 
-            for _, received_solution in batch:
+            for future, received_solution in batch:
+                submit_reproduction.release(future)
                 offspring_population = [received_solution]
 
-                # replacement
-                ranking, density_estimator = FastNonDominatedRanking(self.dominance_comparator), CrowdingDistance()
-                r = RankingAndDensityEstimatorReplacement(ranking, density_estimator, RemovalPolicyType.ONE_SHOT)
-                auxiliar_population = r.replace(auxiliar_population, offspring_population)
-
-                # selection
-                mating_population = []
-                for _ in range(2):
-                    solution = self.selection_operator.execute(auxiliar_population)
-                    mating_population.append(solution)
+                # replacement (solutions already in the population are discarded)
+                if not is_duplicate(received_solution, auxiliar_population):
+                    ranking, density_estimator = FastNonDominatedRanking(self.dominance_comparator), CrowdingDistance()
+                    r = RankingAndDensityEstimatorReplacement(ranking, density_estimator, RemovalPolicyType.ONE_SHOT)
+                    auxiliar_population = r.replace(auxiliar_population, offspring_population)
 
-                # Reproduction and evaluation
-                new_task = self.client.submit(reproduction, mating_population, self.problem,
-                                              self.crossover_operator, self.mutation_operator)
-                task_pool.add(new_task)
+                # selection, reproduction and evaluation
+                task_pool.add(submit_reproduction(self._select_mating_population(auxiliar_population)))
 
                 # update progress
                 self.evaluations += 1
@@ -173,6 +196,17 @@ class DistributedNSGAII(Algorithm[S, R]):
         for future, _ in task_pool:
             future.cancel()
 
+        submit_reproduction.close()
+
+    def _select_mating_population(self, population: List[S]) -> List[S]:
+        return [self.selection_operator.execute(population) for _ in range(2)]
+
+    def _get_reproduction_submitter(self, population: List[S]) -> '_ReproductionSubmitter':
+        if self.shared_memory:
+            return _SharedReproductionSubmitter(self, population)
+
+        return _ReproductionSubmitter(self)
+
     def get_result(self) -> R:
         ranking = FastNonDominatedRanking(self.dominance_comparator)
         ranking.compute_ranking(self.solutions)
@@ -186,3 +220,68 @@ class DistributedNSGAII(Algorithm[S, R]):
 
     def get_name(self) -> str:
         return 'dNSGA-II'
+
+
+class _ReproductionSubmitter:
+    """ Submits the reproduction tasks of a :class:`DistributedNSGAII`, shipping the parents. The problem is scattered
+    to every worker once, so each worker keeps the same copy of it (and of its cache, if any) for the whole run. """
+
+    def __init__(self, algorithm: DistributedNSGAII) -> None:
+        self.algorithm = algorithm
+        self.problem = algorithm.client.scatter(algorithm.problem, broadcast=True)
+
+    def __call__(self, mating_population: List[MSASolution]):
+        algorithm = self.algorithm
+
+        return algorithm.client.submit(reproduction, mating_population, self.problem,
+                                       algorithm.crossover_operator, algorithm.mutation_operator, pure=False)
+
+    def release(self, future) -> None:
+        pass
+
+    def close(self) -> None:
+        # the copies of the problem in the workers are dropped, along with their caches
+        self.problem.release()
+
+
+class _SharedReproductionSubmitter(_ReproductionSubmitter):
+    """ Submits reproduction tasks whose parents are written in a pair of slots of a shared population, which are
+    released when the task is done. """
+
+    def __init__(self, algorithm: DistributedNSGAII, population: List[MSASolution]) -> None:
+        super(_SharedReproductionSubmitter, self).__init__(algorithm)
+
+        # there are never more tasks running than cores, plus one being submitted
+        number_of_tasks = algorithm.number_of_cores + 1
+        self.shared_population = SharedPopulation.for_solutions(population, capacity=2 * number_of_tasks)
+        self.free_slots = list(range(0, 2 * number_of_tasks, 2))
+        self.slots_of_tasks = {}
+
+    def __call__(self, mating_population: List[MSASolution]):
+        algorithm = self.algorithm
+
+        if not self.shared_population.fits(mating_population):
+            return super(_SharedReproductionSubmitter, self).__call__(mating_population)
+
+        start = self.free_slots.pop()
+        self.shared_population.put_all(mating_population, start)
+
+        future = algorithm.client.submit(shared_reproduction, self.shared_population, start, self.problem,
+                                         algorithm.crossover_operator, algorithm.mutation_operator,
+                                         type(mating_population[0]), pure=False)
+        self.slots_of_tasks[future.key] = start
+
+        return future
+
+    def release(self, future) -> None:
+        start = self.slots_of_tasks.pop(future.key, None)
+
+        if start is not None:
+            self.free_slots.append(start)
+
+    def close(self) -> None:
+        super(_SharedReproductionSubmitter, self).close()
+
+        # workers keep the population attached until told
+        self.algorithm.client.run(release_attached_population, self.shared_population.gaps_name)
+        self.shared_population.unlink()
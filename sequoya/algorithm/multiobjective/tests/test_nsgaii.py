@@ -0,0 +1,62 @@
+import os
+import unittest
+from unittest import mock
+
+from distributed import Client
+from jmetal.util.termination_criterion import StoppingByEvaluations
+from pymsa.core.score import SumOfPairs
+
+from sequoya.algorithm.multiobjective.nsgaii import DistributedNSGAII
+from sequoya.operator import SPXMSA, ShiftClosedGapGroups
+from sequoya.problem import BAliBASE
+
+RESOURCES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'resources')
+
+
+class DistributedNSGAIITestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(processes=False, n_workers=1, threads_per_worker=2, dashboard_address=None)
+        self.problem = BAliBASE(instance='BB11020', path=RESOURCES_PATH, score_list=[SumOfPairs()])
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_should_evaluate_the_initial_population_in_batches(self):
+        # setup
+        algorithm = DistributedNSGAII(problem=self.problem, population_size=10,
+                                      mutation=ShiftClosedGapGroups(probability=0.4),
+                                      crossover=SPXMSA(probability=0.7),
+                                      termination_criterion=StoppingByEvaluations(20), number_of_cores=2,
+                                      client=self.client)
+
+        # run
+        with mock.patch.object(BAliBASE, 'evaluate_batch', autospec=True,
+                               side_effect=BAliBASE.evaluate_batch) as evaluate_batch:
+            algorithm.run()
+
+        # check
+        batch_sizes = [len(call.args[1]) for call in evaluate_batch.call_args_list]
+        self.assertIn(5, batch_sizes)
+        self.assertEqual(10, len(algorithm.solutions))
+
+    def test_should_complete_the_initial_population_with_duplicates(self):
+        # setup
+        algorithm = DistributedNSGAII(problem=self.problem, population_size=4,
+                                      mutation=ShiftClosedGapGroups(probability=0.4),
+                                      crossover=SPXMSA(probability=0.7),
+                                      termination_criterion=StoppingByEvaluations(6), number_of_cores=2,
+                                      client=self.client)
+
+        # run
+        with mock.patch.object(BAliBASE, 'create_solution', autospec=True,
+                               side_effect=lambda problem: problem.sequences[0].clone()) as create_solution:
+            algorithm.run()
+
+        # check
+        self.assertEqual(4 + 3 * (DistributedNSGAII.MAX_INITIAL_ROUNDS - 1), create_solution.call_count)
+        self.assertEqual(4, len(algorithm.solutions))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,389 @@
+import sys
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
+class AlignmentView:
+    """
+    Read-only view of the alignment encoded by a solution, decoded at most once in each representation:
+
+    * `sequences`: aligned sequences as a list of str (the input of pyMSA scores).
+    * `matrix`: N x L matrix of ASCII codes (`uint8`) stored column-major, so every column of the alignment is a
+      contiguous block of memory.
+    * `columns`: the transposed L x N (C-contiguous) matrix, i.e., one row per column of the alignment.
+    * `data`: a `memoryview` of `columns`, for consumers using the buffer protocol.
+    * `counts`: number of occurrences of each symbol in every column (see :class:`ColumnCounts`), which is the column
+      profile of the solution if it keeps one (see :class:`ColumnProfile`).
+
+    Evaluators may also leave in `column_scores` the per-column contributions to the scores they compute.
+
+    `columns` and `data` share the memory of `matrix`. Representations are decoded lazily, so a view must not be used
+    after the solution changes; it is meant to be created once per evaluation and passed to every score.
+    """
+
+    __slots__ = ('solution', 'column_scores', '_sequences', '_matrix', '_counts')
+
+    def __init__(self, solution) -> None:
+        self.solution = solution
+        self.column_scores = None
+        self._sequences = None
+        self._matrix = None
+        self._counts = None
+
+    @property
+    def sequences(self) -> list:
+        if self._sequences is None:
+            self._sequences = self.solution.decode_alignment_as_list_of_sequences()
+
+        return self._sequences
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = self.solution.decode_alignment_as_array(order='F')
+            self._matrix.setflags(write=False)
+
+        return self._matrix
+
+    @property
+    def columns(self) -> np.ndarray:
+        return self.matrix.T
+
+    @property
+    def data(self) -> memoryview:
+        return memoryview(self.columns)
+
+    @property
+    def counts(self) -> 'ColumnCounts':
+        if self._counts is None:
+            if self.solution.has_column_profile():
+                self._counts = self.solution.get_column_profile()
+            else:
+                self._counts = ColumnCounts(self.columns)
+
+        return self._counts
+
+    def get_column_counts(self, columns: np.ndarray) -> 'ColumnCounts':
+        """ Returns the counts of some columns, taken from the ones of the whole alignment if they are available. """
+        if self._counts is None and not self.solution.has_column_profile():
+            return ColumnCounts(self.columns[columns])
+
+        return self.counts.take(columns)
+
+    def get_column(self, column: int) -> np.ndarray:
+        return self.matrix[:, column]
+
+    @property
+    def number_of_sequences(self) -> int:
+        return self.solution.number_of_variables
+
+    @property
+    def length(self) -> int:
+        return self.solution.get_length_of_alignment()
+
+
+class ColumnCounts:
+    """
+    Composition of every column of an alignment, computed in a single pass over its symbols: `counts[k, i]` is the
+    number of sequences having `symbols[i]` (an ASCII code) at column k. There is a slot for every symbol present in
+    the alignment, gaps included.
+    """
+
+    __slots__ = ('columns', 'symbols', 'counts')
+
+    def __init__(self, columns: np.ndarray, symbols: np.ndarray = None) -> None:
+        """
+        :param columns: L x N matrix of ASCII codes, one row per column of the alignment.
+        :param symbols: Sorted ASCII codes to count (by default, the ones present in the alignment). It must include
+        every symbol of the alignment.
+        """
+        length = len(columns)
+
+        if symbols is None:
+            symbols = np.flatnonzero(np.bincount(columns.ravel(), minlength=256)).astype(np.uint8)
+
+        self.columns = columns
+        self.symbols = symbols
+
+        slots = np.zeros(256, dtype=np.intp)
+        slots[self.symbols] = np.arange(len(self.symbols))
+        offsets = (np.arange(length) * len(self.symbols))[:, np.newaxis]
+
+        self.counts = np.bincount((slots[columns] + offsets).ravel(),
+                                  minlength=length * len(self.symbols)).reshape(length, len(self.symbols))
+
+    @property
+    def length(self) -> int:
+        return len(self.counts)
+
+    @property
+    def number_of_sequences(self) -> int:
+        return self.columns.shape[1]
+
+    def get_column(self, column: int) -> np.ndarray:
+        """ Returns the symbols of a column. """
+        return self.columns[column]
+
+    def get_counts_of(self, symbol: str) -> np.ndarray:
+        """ Returns the number of occurrences of a symbol in every column. """
+        slot = np.flatnonzero(self.symbols == ord(symbol))
+
+        if len(slot) == 0:
+            return np.zeros(self.length, dtype=self.counts.dtype)
+
+        return self.counts[:, slot[0]]
+
+    def get_gap_columns(self, gap: str = '-') -> np.ndarray:
+        """ Returns the indexes of the columns full of gaps. """
+        return np.flatnonzero(self.get_counts_of(gap) == self.number_of_sequences)
+
+    def take(self, columns: np.ndarray) -> 'ColumnCounts':
+        """ Returns the counts of some columns, given by their indexes. """
+        return ColumnCounts(self.columns[columns])
+
+
+class ColumnProfile(ColumnCounts):
+    """
+    Composition of every column of the alignment of a solution (see :class:`ColumnCounts`), over the symbols of its
+    sequences plus the gap. The profile is kept by the solution and updated as its gaps groups change (see
+    :meth:`BaseMSASolution.get_column_profile`), recounting only the columns changed since.
+
+    Profiles are immutable, so clones of a solution share them. The columns themselves are not kept (they are rebuilt
+    from the counts if needed) and counts are pickled as the smallest unsigned ints holding the number of sequences
+    (8-bit ones below 256 sequences, 16-bit ones below 65536 and 32-bit ones above).
+    """
+
+    __slots__ = ('_number_of_sequences',)
+
+    def __init__(self, symbols: np.ndarray, counts: np.ndarray, number_of_sequences: int) -> None:
+        self.columns = None
+        self.symbols = symbols
+        self.counts = counts
+        self._number_of_sequences = number_of_sequences
+
+        self.counts.setflags(write=False)
+
+    @classmethod
+    def from_columns(cls, columns: np.ndarray, symbols: np.ndarray) -> 'ColumnProfile':
+        """
+        :param columns: L x N matrix of ASCII codes, one row per column of the alignment.
+        :param symbols: Sorted ASCII codes of the symbols of the sequences and the gap.
+        """
+        return cls(symbols, ColumnCounts(columns, symbols).counts, columns.shape[1])
+
+    @property
+    def number_of_sequences(self) -> int:
+        return self._number_of_sequences
+
+    def get_column(self, column: int) -> np.ndarray:
+        return np.repeat(self.symbols, self.counts[column])
+
+    def take(self, columns: np.ndarray) -> 'ColumnProfile':
+        return ColumnProfile(self.symbols, self.counts[columns], self.number_of_sequences)
+
+    def update(self, dirty_columns: 'DirtyColumns', columns: np.ndarray, changed_columns: np.ndarray,
+               length_of_alignment: int) -> 'ColumnProfile':
+        """
+        Returns the profile of the alignment after the changes recorded (since this profile was built) in some dirty
+        columns.
+
+        :param columns: Indexes of the columns to count again (see :meth:`DirtyColumns.get_columns`).
+        :param changed_columns: Symbols of those columns in the alignment, one row per column.
+        """
+        previous_counts = dirty_columns.apply_removals(self.counts)
+        kept = min(length_of_alignment, len(previous_counts))
+
+        counts = np.empty((length_of_alignment, len(self.symbols)), dtype=self.counts.dtype)
+        counts[:kept] = previous_counts[:kept]
+        counts[columns] = ColumnCounts(changed_columns, self.symbols).counts
+
+        return ColumnProfile(self.symbols, counts, self.number_of_sequences)
+
+    def __reduce__(self):
+        # the smallest unsigned ints holding the number of sequences (uint8, uint16, uint32...), so counts never wrap
+        dtype = np.min_scalar_type(self.number_of_sequences)
+        state = (self.symbols.tobytes(), self.counts.shape, self.counts.astype(dtype).tobytes(),
+                 np.dtype(dtype).str, self.number_of_sequences)
+
+        return _restore_profile, state
+
+
+def _restore_profile(symbols: bytes, shape: tuple, counts: bytes, dtype: str,
+                     number_of_sequences: int) -> ColumnProfile:
+    counts = np.frombuffer(counts, dtype=dtype).reshape(shape).astype(np.intp)
+
+    return ColumnProfile(np.frombuffer(symbols, dtype=np.uint8), counts, number_of_sequences)
+
+
+class AlignmentBatch:
+    """
+    Alignments of several solutions of the same problem which are scored together. Each alignment is accessible as
+    an :class:`AlignmentView` (by index or iteration), and the whole batch is decoded, lazily, as:
+
+    * `matrix`: B x N x L stacked matrix of ASCII codes (`uint8`), L being the length of the longest alignment.
+      Shorter alignments are padded with `PADDING`, which is not a valid symbol.
+    * `lengths`: length of each alignment.
+
+    As with views, a batch must not be used after any of its solutions changes.
+    """
+
+    __slots__ = ('views', '_matrix', '_lengths')
+
+    PADDING = 0
+
+    def __init__(self, solutions: list) -> None:
+        self.views = [AlignmentView(solution) for solution in solutions]
+        self._matrix = None
+        self._lengths = None
+
+    @property
+    def sequences(self) -> list:
+        return [view.sequences for view in self.views]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        if self._lengths is None:
+            self._lengths = np.array([view.length for view in self.views], dtype=np.intp)
+            self._lengths.setflags(write=False)
+
+        return self._lengths
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            number_of_sequences = self.views[0].number_of_sequences if self.views else 0
+            length = int(self.lengths.max()) if self.views else 0
+
+            self._matrix = np.full((len(self.views), number_of_sequences, length), self.PADDING, dtype=np.uint8)
+            for k, view in enumerate(self.views):
+                self._matrix[k, :, :view.length] = view.matrix
+
+            self._matrix.setflags(write=False)
+
+        return self._matrix
+
+    def __len__(self) -> int:
+        return len(self.views)
+
+    def __getitem__(self, index: int) -> AlignmentView:
+        return self.views[index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+
+class DirtyColumns:
+    """
+    Set of columns of an alignment changed since the last time it was reset, kept as sorted and disjoint ranges of
+    inclusive (start, end) positions. A range may be open (reaching the end of the alignment, whatever its length is),
+    which is the case of changes displacing the rest of a sequence.
+
+    Columns removed without changing the rest (e.g., columns full of gaps) are not marked: the ranges are displaced
+    instead, and the removed columns are recorded, so per-column data kept since the last reset can be realigned
+    with :meth:`apply_removals`.
+    """
+
+    __slots__ = ('_starts', '_ends', '_removed')
+
+    END = sys.maxsize
+
+    def __init__(self, ranges=()) -> None:
+        self._starts, self._ends = [], []
+        self._removed = []
+
+        for start, end in ranges:
+            self.add(start, end)
+
+    def add(self, start: int, end: int = END) -> None:
+        """ Adds the columns from `start` to `end` (both included), merging the range with the ones it overlaps or
+        touches. """
+        start = max(start, 0)
+
+        if end < start:
+            return
+
+        # ranges [first, last) are merged with the new one
+        first = bisect_left(self._ends, start - 1)
+        last = bisect_right(self._starts, end + 1)
+
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def add_all(self) -> None:
+        self._starts, self._ends = [0], [self.END]
+        self._removed = []
+
+    def remove_columns(self, columns) -> None:
+        """ Records the removal of some columns (given sorted), which displaces the following ones to the left. """
+        columns = np.asarray(columns, dtype=np.int64)
+
+        if len(columns) == 0 or self.is_all():
+            return
+
+        starts, ends = np.array(self._starts, dtype=np.int64), np.array(self._ends, dtype=np.int64)
+        starts -= np.searchsorted(columns, starts, side='left')
+        ends = np.where(ends == self.END, self.END, ends - np.searchsorted(columns, ends, side='right'))
+
+        self._starts, self._ends = [], []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            self.add(start, end)
+
+        self._removed.append(columns)
+
+    def apply_removals(self, values: np.ndarray) -> np.ndarray:
+        """ Returns per-column values (one per column or one row per column) of the alignment, as it was at the last
+        reset, without the removed columns. """
+        for columns in self._removed:
+            values = np.delete(values, columns[columns < len(values)], axis=0)
+
+        return values
+
+    def clear(self) -> None:
+        self._starts, self._ends = [], []
+        self._removed = []
+
+    def is_all(self) -> bool:
+        return self._starts == [0] and self._ends == [self.END]
+
+    def get_ranges(self, length_of_alignment: int = None) -> list:
+        """ Returns the ranges as a list of (start, end) pairs. If the alignment length is given, the ranges are
+        clipped to it. """
+        if length_of_alignment is None:
+            return list(zip(self._starts, self._ends))
+
+        return [(start, min(end, length_of_alignment - 1)) for start, end in zip(self._starts, self._ends)
+                if start < length_of_alignment]
+
+    def get_columns(self, length_of_alignment: int, known_length: int = None) -> np.ndarray:
+        """ Returns the indexes of the dirty columns of an alignment. If `known_length` is given, the columns from that
+        position on (e.g., the ones added since per-column data was computed) are returned as dirty too. """
+        if known_length is None:
+            known_length = length_of_alignment
+
+        return np.concatenate([np.arange(start, end + 1) for start, end in self.get_ranges(known_length)] +
+                              [np.arange(known_length, length_of_alignment)]).astype(np.intp)
+
+    def copy(self) -> 'DirtyColumns':
+        dirty_columns = self.__class__()
+        dirty_columns._starts, dirty_columns._ends = self._starts[:], self._ends[:]
+        dirty_columns._removed = self._removed[:]
+
+        return dirty_columns
+
+    def __contains__(self, column: int) -> bool:
+        k = bisect_right(self._starts, column) - 1
+        return k >= 0 and column <= self._ends[k]
+
+    def __bool__(self) -> bool:
+        return len(self._starts) > 0 or len(self._removed) > 0
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __repr__(self):
+        return 'DirtyColumns({0})'.format(self.get_ranges())
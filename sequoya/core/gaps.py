@@ -0,0 +1,418 @@
+from array import array
+from bisect import bisect_right
+from functools import wraps
+from itertools import accumulate
+
+import numpy as np
+
+
+def _notifies_change(method):
+    """ Wraps a mutator so the container owning the gaps group is told before the change happens. """
+
+    @wraps(method)
+    def wrapper(self, *args):
+        if self._owner is not None:
+            self._owner.gaps_group_changed(self._index)
+        return method(self, *args)
+
+    return wrapper
+
+
+class BaseGapsGroup:
+    """
+    Operations shared by all the gaps group storages. Gaps groups are stored flattened, e.g. [1, 2, 5, 6] means there
+    are two gaps groups: the first one from (1,2) and the second one from (5,6).
+    """
+
+    __slots__ = ()
+
+    def get_number_of_gaps(self) -> int:
+        return sum(self[1::2]) - sum(self[0::2]) + len(self) // 2
+
+    def is_gap(self, position: int) -> bool:
+        return any(start <= position <= end for start, end in zip(self[0::2], self[1::2]))
+
+    def shift(self, start: int, delta: int) -> None:
+        """ Adds `delta` to every position from index `start` onwards. """
+        raise NotImplementedError()
+
+    @_notifies_change
+    def shift_groups_after(self, position: int, delta: int) -> None:
+        """ Adds `delta` to the start and the end of every gaps group starting after `position`. """
+        set_position = self._set_position
+
+        for j in range(0, len(self) - 1, 2):
+            if self[j] > position:
+                set_position(j, self[j] + delta)
+                set_position(j + 1, self[j + 1] + delta)
+
+    def __reduce_ex__(self, protocol):
+        # copies are not bound to any container
+        return self.__class__, (list(self),)
+
+
+class GapsGroup(BaseGapsGroup, list):
+    """ Default storage: a Python list of ints. """
+
+    __slots__ = ('_owner', '_index')
+
+    def __init__(self, values=()):
+        super(GapsGroup, self).__init__(values)
+        self._owner = None
+        self._index = None
+
+    def shift(self, start: int, delta: int) -> None:
+        self[start:] = [x + delta for x in self[start:]]
+
+    def tolist(self) -> list:
+        """ Returns a copy of the positions as a plain list, as `array.tolist` does for :class:`CompactGapsGroup`. """
+        return list(self)
+
+    # assignments of the operations which tell the container once
+    _set_position = list.__setitem__
+
+    __setitem__ = _notifies_change(list.__setitem__)
+    __delitem__ = _notifies_change(list.__delitem__)
+    __iadd__ = _notifies_change(list.__iadd__)
+    __imul__ = _notifies_change(list.__imul__)
+    append = _notifies_change(list.append)
+    extend = _notifies_change(list.extend)
+    insert = _notifies_change(list.insert)
+    pop = _notifies_change(list.pop)
+    remove = _notifies_change(list.remove)
+    clear = _notifies_change(list.clear)
+    reverse = _notifies_change(list.reverse)
+    sort = _notifies_change(list.sort)
+
+
+class CompactGapsGroup(BaseGapsGroup, array):
+    """ Compact storage: a contiguous buffer of 32-bit ints (4 bytes per position instead of a pointer to a boxed
+    int). Supports the same sequence protocol as :class:`GapsGroup`; positions are shifted in place on the buffer.
+
+    It only saves memory: operators are usually slower than with lists, as every position read is boxed again (see
+    `benchmarks/gaps_storage.py`). """
+
+    __slots__ = ('_owner', '_index')
+
+    TYPECODE = 'i'
+
+    # tails at least this long are shifted with a NumPy view of the buffer, shorter ones position by position
+    MIN_VECTORIZED_SHIFT = 32
+
+    _set_position = array.__setitem__
+
+    def __new__(cls, values=()):
+        gaps_group = super(CompactGapsGroup, cls).__new__(cls, cls.TYPECODE, values)
+        gaps_group._owner = None
+        gaps_group._index = None
+        return gaps_group
+
+    @_notifies_change
+    def shift(self, start: int, delta: int) -> None:
+        indexes = range(len(self))[start:]
+
+        if len(indexes) >= self.MIN_VECTORIZED_SHIFT:
+            # the view is dropped right away, as arrays cannot be resized while their buffer is exported
+            np.frombuffer(self, dtype=np.intc)[indexes.start:] += delta
+        else:
+            for j in indexes:
+                array.__setitem__(self, j, self[j] + delta)
+
+    @_notifies_change
+    def sort(self) -> None:
+        array.__setitem__(self, slice(None), array(self.TYPECODE, sorted(self)))
+
+    __setitem__ = _notifies_change(array.__setitem__)
+    __delitem__ = _notifies_change(array.__delitem__)
+    __iadd__ = _notifies_change(array.__iadd__)
+    __imul__ = _notifies_change(array.__imul__)
+    append = _notifies_change(array.append)
+    extend = _notifies_change(array.extend)
+    insert = _notifies_change(array.insert)
+    pop = _notifies_change(array.pop)
+    remove = _notifies_change(array.remove)
+    reverse = _notifies_change(array.reverse)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return super(CompactGapsGroup, self).__eq__(other)
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self.__class__(self)
+
+    def __deepcopy__(self, memo):
+        return self.__class__(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class GapsIndex:
+    """
+    Index of the gaps groups of one sequence, so positions can be translated between the aligned and the original
+    sequence with a bisection. Queries give the same answers as scanning the groups as they are:
+
+    * Gap columns (and so the column of every symbol) are the union of the columns covered by the groups, from column 0
+      on: sorted gap starts and ends, with overlapping or touching groups merged, plus the cumulative number of gaps
+      before each one.
+    * The number of gaps until a position adds up the lengths of the groups ending at or before it, as given (so
+      overlapping groups count twice): their sorted ends plus the cumulative lengths.
+    * The group containing a position is the last one given, so it is only bisected if the groups are in canonical
+      form (sorted, not empty and neither touching nor overlapping); otherwise they are kept to be scanned.
+    """
+
+    __slots__ = ('starts', 'ends', 'gaps_before', 'chars_before', 'group_ends', 'group_gaps_before', '_groups',
+                 '_aligned_positions')
+
+    def __init__(self, gaps_group) -> None:
+        starts, ends = list(gaps_group[0::2]), list(gaps_group[1::2])
+
+        if all(0 <= start <= end for start, end in zip(starts, ends)) and \
+                all(end + 1 < start for end, start in zip(ends, starts[1:])):
+            self.starts, self.ends = starts, ends
+            self._groups = None
+        else:
+            self.starts, self.ends = [], []
+
+            for start, end in sorted((max(start, 0), end) for start, end in zip(starts, ends) if max(start, 0) <= end):
+                if self.ends and start <= self.ends[-1] + 1:
+                    self.ends[-1] = max(self.ends[-1], end)
+                else:
+                    self.starts.append(start)
+                    self.ends.append(end)
+
+            self._groups = list(zip(starts, ends))
+
+        # gaps_before[k] is the number of gap columns before the k-th union of groups
+        self.gaps_before = list(accumulate((end - start + 1 for start, end in zip(self.starts, self.ends)), initial=0))
+        # chars_before[k] is the number of symbols placed before the k-th union of groups
+        self.chars_before = [start - gaps for start, gaps in zip(self.starts, self.gaps_before)]
+
+        if self._groups is None:
+            self.group_ends, self.group_gaps_before = self.ends, self.gaps_before
+        else:
+            groups_by_end = sorted(zip(ends, starts))
+            self.group_ends = [end for end, _ in groups_by_end]
+            # group_gaps_before[k] is the length of the k groups with the lowest ends
+            self.group_gaps_before = list(accumulate((end - start + 1 for end, start in groups_by_end), initial=0))
+
+        self._aligned_positions = None
+
+    def is_gap(self, position: int) -> bool:
+        k = bisect_right(self.starts, position) - 1
+        return k >= 0 and position <= self.ends[k]
+
+    def get_gaps_group_containing(self, position: int) -> tuple:
+        """ Returns the (start, end) of the last gaps group covering the position, or None if it is not a gap. """
+        if self._groups is not None:
+            containing_group = None
+            for start, end in self._groups:
+                if start <= position <= end:
+                    containing_group = start, end
+            return containing_group
+
+        k = bisect_right(self.starts, position) - 1
+        if k >= 0 and position <= self.ends[k]:
+            return self.starts[k], self.ends[k]
+        return None
+
+    def get_number_of_gaps_until(self, position: int) -> int:
+        """ Number of gaps in the groups ending at or before the position. """
+        return self.group_gaps_before[bisect_right(self.group_ends, position)]
+
+    def get_aligned_position(self, char_position: int) -> int:
+        """ Column of the `char_position`-th symbol of the original sequence. """
+        if self._aligned_positions is not None and char_position < len(self._aligned_positions):
+            return self._aligned_positions[char_position]
+        return char_position + self.gaps_before[bisect_right(self.chars_before, char_position)]
+
+    def get_aligned_positions(self, number_of_chars: int) -> list:
+        """ Materializes (once) the column of every symbol of the original sequence, making lookups O(1). """
+        if self._aligned_positions is None or len(self._aligned_positions) != number_of_chars:
+            aligned_positions = []
+            k, gaps = 0, 0
+
+            for char_position in range(number_of_chars):
+                while k < len(self.chars_before) and self.chars_before[k] <= char_position:
+                    k += 1
+                    gaps = self.gaps_before[k]
+                aligned_positions.append(char_position + gaps)
+
+            self._aligned_positions = aligned_positions
+
+        return self._aligned_positions
+
+
+class GapsGroups(list):
+    """
+    Gaps groups of every sequence of an alignment. Any gaps group assigned to it is converted to the selected storage
+    type, so operators can keep building plain lists. Gaps groups tell their container whenever they are modified
+    (either in place or by assignment), so derived data such as :class:`GapsIndex` or the number of gaps are
+    dropped; inserting, removing or moving gaps groups drops the data of all of them.
+    """
+
+    def __init__(self, gaps_groups=(), compact: bool = False):
+        self.compact = compact
+        self._indexes = {}
+        self._number_of_gaps = {}
+        self._fingerprints = {}
+        super(GapsGroups, self).__init__(
+            self._convert(gaps_group, index) for index, gaps_group in enumerate(gaps_groups))
+
+    @property
+    def gaps_group_type(self) -> type:
+        return CompactGapsGroup if self.compact else GapsGroup
+
+    def _convert(self, gaps_group, index: int) -> BaseGapsGroup:
+        if type(gaps_group) is not self.gaps_group_type or \
+                not (gaps_group._owner is None or (gaps_group._owner is self and gaps_group._index == index)):
+            # groups are never shared among containers
+            gaps_group = self.gaps_group_type(gaps_group)
+
+        gaps_group._owner = self
+        gaps_group._index = index
+
+        return gaps_group
+
+    def gaps_group_changed(self, index: int) -> None:
+        self._indexes.pop(index, None)
+        self._number_of_gaps.pop(index, None)
+        self._fingerprints.pop(index, None)
+
+    def get_number_of_gaps(self, index: int) -> int:
+        number_of_gaps = self._number_of_gaps.get(index)
+
+        if number_of_gaps is None:
+            number_of_gaps = self._number_of_gaps[index] = self[index].get_number_of_gaps()
+
+        return number_of_gaps
+
+    def set_number_of_gaps(self, index: int, number_of_gaps: int) -> None:
+        """ Stores the number of gaps of a gaps group after a change whose effect is known, so it is not counted
+        again. """
+        self._number_of_gaps[index] = number_of_gaps
+
+    def get_fingerprint(self, index: int) -> bytes:
+        """ Returns the fingerprint stored for a gaps group, or None if it has changed since then. """
+        return self._fingerprints.get(index)
+
+    def set_fingerprint(self, index: int, fingerprint: bytes) -> None:
+        self._fingerprints[index] = fingerprint
+
+    def get_index(self, index: int, build: bool = True) -> GapsIndex:
+        """ Returns the index of a gaps group, building it if needed (unless `build` is False, in which case None is
+        returned if there is no index yet). """
+        gaps_index = self._indexes.get(index)
+
+        if gaps_index is None and build:
+            gaps_index = self._indexes[index] = GapsIndex(self[index])
+
+        return gaps_index
+
+    def _reindex(self, removed_gaps_groups=()) -> None:
+        """ Binds the gaps groups to their positions again after they are inserted, removed or moved, dropping the
+        cached data (which is kept by position). """
+        for gaps_group in removed_gaps_groups:
+            gaps_group._owner = None
+
+        for index, gaps_group in enumerate(self):
+            gaps_group._owner = self
+            gaps_group._index = index
+
+        self._indexes.clear()
+        self._number_of_gaps.clear()
+        self._fingerprints.clear()
+
+    def __setitem__(self, index, gaps_group) -> None:
+        if isinstance(index, slice):
+            removed_gaps_groups = super(GapsGroups, self).__getitem__(index)
+            super(GapsGroups, self).__setitem__(index, [self._convert(x, None) for x in gaps_group])
+            self._reindex(removed_gaps_groups)
+            return
+
+        index = range(len(self))[index]
+        self.gaps_group_changed(index)
+
+        removed_gaps_group = super(GapsGroups, self).__getitem__(index)
+        gaps_group = self._convert(gaps_group, index)
+
+        if removed_gaps_group is not gaps_group:
+            removed_gaps_group._owner = None
+
+        super(GapsGroups, self).__setitem__(index, gaps_group)
+
+    def __delitem__(self, index) -> None:
+        removed_gaps_groups = super(GapsGroups, self).__getitem__(index)
+        super(GapsGroups, self).__delitem__(index)
+        self._reindex(removed_gaps_groups if isinstance(index, slice) else [removed_gaps_groups])
+
+    def append(self, gaps_group) -> None:
+        super(GapsGroups, self).append(self._convert(gaps_group, len(self)))
+
+    def extend(self, gaps_groups) -> None:
+        for gaps_group in list(gaps_groups):
+            self.append(gaps_group)
+
+    def __iadd__(self, gaps_groups) -> 'GapsGroups':
+        self.extend(gaps_groups)
+        return self
+
+    def __imul__(self, times: int) -> 'GapsGroups':
+        if times <= 0:
+            self.clear()
+        else:
+            # repeated gaps groups are appended as copies
+            self.extend(list(self) * (times - 1))
+        return self
+
+    def insert(self, index: int, gaps_group) -> None:
+        super(GapsGroups, self).insert(index, self._convert(gaps_group, None))
+        self._reindex()
+
+    def pop(self, index: int = -1) -> BaseGapsGroup:
+        gaps_group = super(GapsGroups, self).pop(index)
+        self._reindex([gaps_group])
+        return gaps_group
+
+    def remove(self, gaps_group) -> None:
+        del self[self.index(gaps_group)]
+
+    def clear(self) -> None:
+        removed_gaps_groups = list(self)
+        super(GapsGroups, self).clear()
+        self._reindex(removed_gaps_groups)
+
+    def reverse(self) -> None:
+        super(GapsGroups, self).reverse()
+        self._reindex()
+
+    def sort(self, *args, **kwargs) -> None:
+        super(GapsGroups, self).sort(*args, **kwargs)
+        self._reindex()
+
+    def copy(self) -> 'GapsGroups':
+        """ Returns a container with copies of the gaps groups. Cached data is carried over, as it describes groups
+        with the same content. """
+        gaps_groups = self.__class__(self, compact=self.compact)
+        gaps_groups._indexes.update(self._indexes)
+        gaps_groups._number_of_gaps.update(self._number_of_gaps)
+        gaps_groups._fingerprints.update(self._fingerprints)
+
+        return gaps_groups
+
+    def __reduce_ex__(self, protocol):
+        return self.__class__, (list(self), self.compact)
+
+    def get_size_in_bytes(self) -> int:
+        """ Approximated memory footprint of the stored positions (containers plus boxed ints, if any). """
+        size = 0
+
+        for gaps_group in self:
+            size += gaps_group.__sizeof__()
+            if not self.compact:
+                size += sum(x.__sizeof__() for x in gaps_group if not -5 <= x <= 256)
+
+        return size
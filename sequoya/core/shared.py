@@ -0,0 +1,234 @@
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from sequoya.core.solution import BaseMSASolution, MSASolution, restore_solution
+from sequoya.core.store import SequencesStore
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # before Python 3.13, attaching to a block registers it in the resource tracker, which unlinks it when the
+    # processes using the tracker exit; worker processes started with multiprocessing share the tracker of their
+    # parent, so the block lives as long as the process creating it (bpo-39959)
+    return SharedMemory(name=name)
+
+
+class SharedPopulation:
+    """
+    Population of solutions of an instance kept in shared memory (`multiprocessing.shared_memory`), so the processes
+    of a host read its individuals by index instead of receiving them pickled. It is made of two blocks:
+
+    * residues: the identifiers and original sequences of the instance. The block is named after the key of the store,
+      so it is written once per host and shared by every population of the instance.
+    * gaps: `capacity` slots of `slot_size` 32-bit ints, each one holding the gaps groups of a solution as the number
+      of positions of every sequence followed by all the positions.
+
+    Individuals are read by index, with no pickling, but :meth:`get` copies the gaps groups of a slot into a new
+    solution (which operators may then change); :meth:`get_gaps_groups` returns read-only views instead.
+
+    A shared population is pickled as the names of its blocks, and attaches to them when unpickled (registering the
+    store of the instance in that process). Processes keep every population attached until it is released with
+    :func:`release_attached_population`, or until a population of the same `owner` arrives: the populations of an
+    owner replace one another (e.g., as the ones of an evaluator grow), and each one is unlinked before the next one is
+    created. The process creating it must release the blocks with :meth:`unlink`.
+    """
+
+    def __init__(self, store: SequencesStore, capacity: int, slot_size: int = None, owner: str = None) -> None:
+        """
+        Creates a population in new shared memory blocks (the residues one is reused if it exists).
+
+        :param store: Store of the instance.
+        :param capacity: Number of slots.
+        :param slot_size: Number of ints of each slot (by default, room for 64 gaps groups per sequence).
+        :param owner: Owner of the population, if it replaces others (the `owner` of the first one); by default, it is
+        owned by itself.
+        """
+        self.store = store
+        self.capacity = capacity
+        self.slot_size = slot_size or len(store) * (1 + 2 * 64)
+
+        self._residues, self._owns_residues = self._create_residues(store)
+        self._gaps = SharedMemory(create=True, size=max(capacity * self.slot_size * 4, 1))
+        self._owns_gaps = True
+        self.owner = owner or self.gaps_name
+        self._set_slots()
+
+    @classmethod
+    def for_solutions(cls, solutions: list, capacity: int = None, owner: str = None) -> 'SharedPopulation':
+        """ Creates a population with room for some solutions (which must share the store of their instance), whose
+        slots are twice as large as needed by the largest one. """
+        store = solutions[0]._get_shared_store()
+        slot_size = max(len(store) + sum(map(len, solution.gaps_groups)) for solution in solutions)
+
+        return cls(store, capacity=max(capacity or 0, len(solutions)), slot_size=2 * slot_size, owner=owner)
+
+    def fits(self, solutions: list) -> bool:
+        """ Returns True if the solutions fit in the population. """
+        return len(solutions) <= self.capacity and all(
+            solution._get_shared_store() is self.store and
+            len(self.store) + sum(map(len, solution.gaps_groups)) <= self.slot_size for solution in solutions)
+
+    @classmethod
+    def attach(cls, residues_name: str, gaps_name: str, capacity: int, slot_size: int,
+               owner: str = None) -> 'SharedPopulation':
+        """ Returns a population attached to existing blocks, given their names. """
+        population = cls.__new__(cls)
+        population.capacity = capacity
+        population.slot_size = slot_size
+
+        population._residues, population._owns_residues = _attach(residues_name), False
+        population._gaps, population._owns_gaps = _attach(gaps_name), False
+        population.owner = owner or gaps_name
+        population.store = population._read_store()
+        population._set_slots()
+
+        return population
+
+    @property
+    def gaps_name(self) -> str:
+        return self._gaps.name
+
+    @staticmethod
+    def get_residues_name(store: SequencesStore) -> str:
+        # short names, as some systems limit them to 31 characters
+        return 'sequoya_' + store.key[:20]
+
+    def _create_residues(self, store: SequencesStore) -> tuple:
+        identifiers = '\n'.join(store.identifiers).encode()
+        sequences = '\n'.join(store.sequences).encode()
+        size = 16 + len(identifiers) + len(sequences)
+
+        try:
+            residues = SharedMemory(name=self.get_residues_name(store), create=True, size=size)
+        except FileExistsError:
+            return _attach(self.get_residues_name(store)), False
+
+        np.ndarray(2, dtype=np.int64, buffer=residues.buf)[:] = (len(identifiers), len(sequences))
+        residues.buf[16:size] = identifiers + sequences
+
+        return residues, True
+
+    def _read_store(self) -> SequencesStore:
+        identifiers_size, sequences_size = np.ndarray(2, dtype=np.int64, buffer=self._residues.buf).tolist()
+        data = bytes(self._residues.buf[16:16 + identifiers_size + sequences_size]).decode()
+
+        return SequencesStore.register(data[:identifiers_size].split('\n'), data[identifiers_size:].split('\n'))
+
+    def _set_slots(self) -> None:
+        self._slots = np.ndarray((self.capacity, self.slot_size), dtype=np.int32, buffer=self._gaps.buf)
+
+    def put(self, index: int, solution: BaseMSASolution) -> None:
+        """ Writes the gaps groups of a solution (of the instance) in a slot. """
+        gaps_groups = solution.gaps_groups
+        lengths = [len(gaps_group) for gaps_group in gaps_groups]
+        number_of_sequences = len(lengths)
+
+        if number_of_sequences + sum(lengths) > self.slot_size:
+            raise Exception('The gaps groups of the solution ({0} positions) do not fit in a slot of {1} ints'.format(
+                sum(lengths), self.slot_size - number_of_sequences))
+
+        slot = self._slots[index]
+        slot[:number_of_sequences] = lengths
+
+        start = number_of_sequences
+        for gaps_group, length in zip(gaps_groups, lengths):
+            slot[start:start + length] = gaps_group
+            start += length
+
+    def put_all(self, solutions: list, start: int = 0) -> None:
+        for index, solution in enumerate(solutions, start):
+            self.put(index, solution)
+
+    def get_gaps_groups(self, index: int) -> list:
+        """ Returns the gaps groups of a slot as read-only views of the shared memory, one array per sequence. """
+        slot = self._slots[index]
+        number_of_sequences = len(self.store)
+        bounds = np.cumsum(np.concatenate(([number_of_sequences], slot[:number_of_sequences])))
+
+        gaps_groups = [slot[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        for gaps_group in gaps_groups:
+            gaps_group.setflags(write=False)
+
+        return gaps_groups
+
+    def get(self, index: int, solution_class: type = MSASolution) -> BaseMSASolution:
+        """ Returns the solution of a slot, without objectives and with all its columns dirty. """
+        slot = self._slots[index]
+        number_of_sequences = len(self.store)
+        number_of_positions = int(slot[:number_of_sequences].sum())
+
+        packed_gaps_groups = (False, slot[:number_of_sequences].tobytes(), 'i',
+                              slot[number_of_sequences:number_of_sequences + number_of_positions].tobytes())
+
+        return restore_solution(solution_class, self.store.key, packed_gaps_groups)
+
+    def close(self) -> None:
+        """ Detaches the process from the blocks. """
+        self._slots = None
+        self._gaps.close()
+        self._residues.close()
+
+    def unlink(self) -> None:
+        """ Closes and releases the blocks created by this population. """
+        self.close()
+
+        if self._owns_gaps:
+            self._gaps.unlink()
+
+        if self._owns_residues:
+            self._residues.unlink()
+
+    def __len__(self) -> int:
+        return self.capacity
+
+    def __enter__(self) -> 'SharedPopulation':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.unlink()
+
+    def __reduce__(self):
+        return _get_attached_population, (self._residues.name, self.gaps_name, self.capacity, self.slot_size,
+                                          self.owner)
+
+
+# populations unpickled in this process, by the name of their gaps block, so each one is attached only once
+_attached_populations = {}
+
+
+def _get_attached_population(residues_name: str, gaps_name: str, capacity: int, slot_size: int,
+                             owner: str = None) -> SharedPopulation:
+    population = _attached_populations.get(gaps_name)
+
+    if population is None:
+        population = SharedPopulation.attach(residues_name, gaps_name, capacity, slot_size, owner)
+
+        # the populations it replaces are already unlinked by their owner (but not the ones of other owners, which may
+        # be in use, e.g., by another run of the instance)
+        for other_population in list(_attached_populations.values()):
+            if other_population.owner == population.owner:
+                release_attached_population(other_population.gaps_name)
+
+        _attached_populations[gaps_name] = population
+
+    return population
+
+
+def release_attached_population(gaps_name: str) -> None:
+    """ Closes the population attached to a gaps block in this process, if any (e.g., in the workers of a Dask client,
+    once the owner of the population unlinks it). """
+    population = _attached_populations.pop(gaps_name, None)
+
+    if population is not None:
+        population.close()
+
+
+def compute_objectives_of_slots(problem, population: SharedPopulation, start: int, stop: int,
+                                solution_class: type = MSASolution) -> list:
+    """ Returns the objectives of the solutions in some slots of a shared population (see
+    :meth:`MSA.compute_objectives`). """
+    return problem.compute_objectives([population.get(index, solution_class) for index in range(start, stop)])
@@ -1,38 +1,214 @@
+import re
+from abc import ABCMeta, abstractmethod
+from array import array
+from hashlib import blake2b
+from itertools import chain
+
+import numpy as np
 from jmetal.core.solution import Solution
 
+from sequoya.core.alignment import AlignmentView, ColumnProfile, DirtyColumns
+from sequoya.core.gaps import GapsGroups
+from sequoya.core.store import SequencesStore
+
 
-class MSASolution(Solution[str]):
+class BaseMSASolution(metaclass=ABCMeta):
     """
-    Class representing MSA solutions.
+    Operations shared by the MSA solution classes. Subclasses provide `variables` (the original sequences),
+    `sequences_names`, `number_of_variables`, `objectives` and `attributes`.
+
+    Solutions record the columns changed since their dirty columns were last reset (see :class:`DirtyColumns`), so
+    evaluators can limit their work to them (and so does the column profile, see :meth:`get_column_profile`). Methods
+    changing the gaps groups record the columns they affect; code editing the gaps groups directly must report them
+    with :meth:`mark_dirty_columns`.
     """
 
+    __slots__ = ()
+
     GAP_IDENTIFIER = '-'
 
-    def __init__(self, problem, msa: list) -> None:
-        super(MSASolution, self).__init__(number_of_variables=problem.number_of_variables,
-                                          number_of_objectives=problem.number_of_objectives)
+    @property
+    def gaps_groups(self) -> GapsGroups:
+        return self._gaps_groups
+
+    @gaps_groups.setter
+    def gaps_groups(self, gaps_groups: list) -> None:
+        if not isinstance(gaps_groups, GapsGroups):
+            compact = self._gaps_groups.compact if hasattr(self, '_gaps_groups') else False
+            gaps_groups = GapsGroups(gaps_groups, compact=compact)
 
-        self.sequences_names = problem.identifiers
-        self.gaps_groups = [[] for _ in range(self.number_of_variables)]
+        self._gaps_groups = gaps_groups
+        self.mark_all_columns_dirty()
+
+    @property
+    def dirty_columns(self) -> DirtyColumns:
+        return self._dirty_columns
+
+    def mark_dirty_columns(self, start: int, end: int = DirtyColumns.END) -> None:
+        """ Records that columns from `start` to `end` (both included; by default, up to the end of the alignment)
+        have changed. """
+        self._dirty_columns.add(start, end)
 
-        self.encode_alignment(list(pair[1] for pair in msa))
+        if self._profile_dirty_columns is not None:
+            self._profile_dirty_columns.add(start, end)
+
+    def mark_all_columns_dirty(self) -> None:
+        self._dirty_columns.add_all()
+
+        if self._profile_dirty_columns is not None:
+            self._profile_dirty_columns.add_all()
+
+    def has_dirty_columns(self) -> bool:
+        return bool(self._dirty_columns)
+
+    def consume_dirty_columns(self) -> list:
+        """ Returns the dirty columns as (start, end) ranges within the alignment, and resets them. """
+        ranges = self._dirty_columns.get_ranges(self.get_length_of_alignment())
+        self.reset_dirty_columns()
+
+        return ranges
+
+    def reset_dirty_columns(self) -> None:
+        if self._dirty_columns:
+            # the column scores describe the alignment as it was at the previous reset
+            self._column_scores = None
+
+        self._dirty_columns.clear()
+
+    def get_column_scores(self) -> dict:
+        """ Returns the per-column contributions to the scores stored by the last evaluation, or None. They describe
+        the alignment as it was when the dirty columns were last reset, so only the dirty columns have to be scored
+        again (after realigning the contributions with :meth:`DirtyColumns.apply_removals`). """
+        return self._column_scores
+
+    def set_column_scores(self, column_scores: dict) -> None:
+        """ Stores the per-column contributions to the scores of the current alignment, whose dirty columns must have
+        been reset. """
+        self._column_scores = column_scores
+
+    def has_column_profile(self) -> bool:
+        return self._column_profile is not None
+
+    def get_column_profile(self) -> ColumnProfile:
+        """ Returns the composition of every column of the alignment (see :class:`ColumnProfile`). The profile is built
+        on the first call and kept up to date from then on: the columns changed since the previous call are tracked
+        apart from the dirty columns (which evaluators reset), and only those are decoded and counted again. """
+        dirty_columns = self._profile_dirty_columns
+
+        if self._column_profile is None or dirty_columns.is_all():
+            symbols = np.unique(np.frombuffer((''.join(self.variables) + self.GAP_IDENTIFIER).encode(),
+                                              dtype=np.uint8))
+            self._column_profile = ColumnProfile.from_columns(self.decode_alignment_as_array(order='F').T, symbols)
+            self._profile_dirty_columns = DirtyColumns()
+        elif dirty_columns:
+            length_of_alignment = self.get_length_of_alignment()
+            columns = dirty_columns.get_columns(length_of_alignment,
+                                                min(length_of_alignment, len(self._column_profile.counts)))
+
+            self._column_profile = self._column_profile.update(dirty_columns, columns, self.decode_columns(columns),
+                                                               length_of_alignment)
+            dirty_columns.clear()
+
+        return self._column_profile
+
+    @abstractmethod
+    def clone(self) -> 'BaseMSASolution':
+        pass
+
+    def __reduce_ex__(self, protocol):
+        """ Solutions sharing the store of their instance are serialized as the key of the store plus their own data:
+        gaps groups packed as arrays of 16 or 32-bit ints, objectives, constraints, attributes, dirty columns and the
+        column profile, if any, brought up to date (but not the column scores, which are computed again if needed). """
+        store = self._get_shared_store()
+
+        if store is None:
+            return super(BaseMSASolution, self).__reduce_ex__(protocol)
+
+        column_profile = self.get_column_profile() if self.has_column_profile() else None
+
+        state = self.pack_gaps_groups() + (list(self.objectives),
+                                           list(self.constraints),
+                                           self.attributes,
+                                           self.dirty_columns.get_ranges(),
+                                           column_profile)
+
+        return _restore_solution, (self.__class__, store.key, state)
+
+    def pack_gaps_groups(self) -> tuple:
+        """ Returns the gaps groups packed as (compact, lengths, typecode, positions): the number of positions of each
+        sequence and all the positions, as the bytes of arrays of 32-bit ints (or 16-bit ones for the positions, if
+        they fit). See :func:`restore_solution`. """
+        gaps_groups = self.gaps_groups
+        positions = array('i', chain.from_iterable(gaps_groups))
+
+        if positions and -2 ** 15 <= min(positions) and max(positions) < 2 ** 15:
+            # 16-bit ints are enough for most alignments
+            positions = array('h', positions)
+
+        return gaps_groups.compact, array('i', map(len, gaps_groups)).tobytes(), positions.typecode, positions.tobytes()
+
+    def __getattr__(self, name: str):
+        # solutions unpickled before the store of their instance resolve it on first use
+        if name in ('store', 'variables', 'sequences_names'):
+            try:
+                key = object.__getattribute__(self, '_store_key')
+            except AttributeError:
+                key = None
+
+            if key is not None:
+                self._set_store(SequencesStore.get(key))
+                return getattr(self, name)
+
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name))
+
+    @abstractmethod
+    def _get_shared_store(self) -> SequencesStore:
+        """ Returns the store holding the original sequences of the solution, if any. """
+        pass
+
+    @abstractmethod
+    def _set_store(self, store: SequencesStore) -> None:
+        pass
+
+    @abstractmethod
+    def _set_state(self, key: str, number_of_variables: int, objectives: list, constraints: list,
+                   attributes: dict) -> None:
+        pass
 
     def encode_alignment(self, aligned_sequences: list):
+        self.mark_all_columns_dirty()
+
         # for each bb3_aligned sequence
         for index, seq in enumerate(aligned_sequences):
             # get gaps groups
             self.gaps_groups[index] = self.__get_gaps_group_of_sequence(seq)
             # get encoded sequence
-            self.variables[index] = seq.replace(self.GAP_IDENTIFIER, "")
+            self._set_original_sequence(index, seq.replace(self.GAP_IDENTIFIER, ""))
+            self.gaps_groups.set_number_of_gaps(index, len(seq) - len(self.variables[index]))
+
+    def encode_gaps_groups(self, encoded_sequences: list) -> None:
+        """ Sets the alignment from the original sequences and the gaps groups of its sequences, as pairs (sequence,
+        gaps group), e.g., as read by :func:`read_encoded_fasta_file`. """
+        self.mark_all_columns_dirty()
+
+        for index, (sequence, gaps_group) in enumerate(encoded_sequences):
+            self.gaps_groups[index] = gaps_group
+            self._set_original_sequence(index, sequence)
+            self.gaps_groups.set_number_of_gaps(index, sum(gaps_group[1::2]) - sum(gaps_group[0::2]) +
+                                                len(gaps_group) // 2)
+
+    @abstractmethod
+    def _set_original_sequence(self, seq_index: int, sequence: str) -> None:
+        pass
 
     def decode_sequence_at_index(self, seq_index: int):
-        return self.__decode(self.variables[seq_index], self.gaps_groups[seq_index])
+        return self.__decode(seq_index)
 
     def decode_alignment_as_list_of_sequences(self) -> list:
         aligned_sequences = []
 
         for i in range(self.number_of_variables):
-            aligned_sequences.append(self.__decode(self.variables[i], self.gaps_groups[i]))
+            aligned_sequences.append(self.__decode(i))
 
         return aligned_sequences
 
@@ -40,12 +216,183 @@ class MSASolution(Solution[str]):
         list_of_pairs = []
 
         for i in range(self.number_of_variables):
-            sequence = self.__decode(self.variables[i], self.gaps_groups[i])
+            sequence = self.__decode(i)
             list_of_pairs.append((self.sequences_names[i], sequence))
 
         return list_of_pairs
 
-    def __decode(self, encoded_sequence: str, gaps_group: list) -> str:
+    def decode_alignment_as_array(self, order: str = 'C') -> np.ndarray:
+        """ Returns the alignment as a N x L matrix of ASCII codes (`uint8`), with one row per sequence. Symbols are
+        placed straight into their columns, so no intermediate str is built.
+
+        :param order: Memory layout of the matrix, either 'C' (row-major) or 'F' (column-major, i.e., the symbols of
+        every column are contiguous).
+        """
+        length_of_alignment = self.get_length_of_alignment()
+        alignment = np.full((self.number_of_variables, length_of_alignment), ord(self.GAP_IDENTIFIER), dtype=np.uint8,
+                            order=order)
+
+        for i in range(self.number_of_variables):
+            if self.get_length_of_sequence(i) != length_of_alignment:
+                raise Exception("Sequence {0} has length {1} but the alignment length is {2}".format(
+                    i, self.get_length_of_sequence(i), length_of_alignment))
+
+            symbols = np.frombuffer(self.variables[i].encode(), dtype=np.uint8)
+            gaps_runs = self.__get_gaps_runs(i)
+
+            if gaps_runs is None:
+                alignment[i] = np.frombuffer(self.__decode(i).encode(), dtype=np.uint8)
+            else:
+                symbols_before, lengths = gaps_runs
+                gaps_before = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+                positions = np.arange(len(symbols))
+                columns = positions + gaps_before[np.searchsorted(symbols_before, positions, side='right')]
+                alignment[i, columns] = symbols
+
+        return alignment
+
+    def decode_columns(self, columns: np.ndarray) -> np.ndarray:
+        """ Returns some columns of the alignment as a matrix of ASCII codes (`uint8`), with one row per column. Only
+        the symbols placed at those columns are looked up, so the cost depends on the number of columns and gaps
+        groups rather than on the length of the alignment. """
+        columns = np.asarray(columns, dtype=np.int64)
+        alignment = np.full((len(columns), self.number_of_variables), ord(self.GAP_IDENTIFIER), dtype=np.uint8)
+
+        for i in range(self.number_of_variables):
+            symbols = np.frombuffer(self.variables[i].encode(), dtype=np.uint8)
+            gaps_runs = self.__get_gaps_runs(i)
+
+            if gaps_runs is None:
+                alignment[:, i] = np.frombuffer(self.__decode(i).encode(), dtype=np.uint8)[columns]
+                continue
+
+            if not gaps_runs[0]:
+                alignment[:, i] = symbols[columns]
+                continue
+
+            symbols_before, lengths = np.array(gaps_runs[0], dtype=np.int64), np.array(gaps_runs[1], dtype=np.int64)
+            gaps_before = np.concatenate(([0], np.cumsum(lengths)))
+            run_starts = symbols_before + gaps_before[:-1]
+
+            # the last run starting at or before each column, if any
+            runs = np.searchsorted(run_starts, columns, side='right') - 1
+            in_gaps = (runs >= 0) & (columns < (run_starts + lengths)[runs])
+            positions = columns - gaps_before[runs + 1]
+
+            alignment[~in_gaps, i] = symbols[positions[~in_gaps]]
+
+        return alignment
+
+    def get_alignment_view(self) -> AlignmentView:
+        """ Returns a view of the alignment to be shared by several scores (see :class:`AlignmentView`). """
+        return AlignmentView(self)
+
+    def __decode(self, seq_index: int) -> str:
+        encoded_sequence = self.variables[seq_index]
+        gaps_runs = self.__get_gaps_runs(seq_index)
+
+        if gaps_runs is None:
+            return self.__decode_by_insertion(encoded_sequence, self.gaps_groups[seq_index])
+
+        pieces = []
+        previous = 0
+
+        for symbols_before, length in zip(*gaps_runs):
+            pieces.append(encoded_sequence[previous:symbols_before])
+            pieces.append(self.GAP_IDENTIFIER * length)
+            previous = symbols_before
+
+        pieces.append(encoded_sequence[previous:])
+
+        return ''.join(pieces)
+
+    def get_fingerprint(self) -> int:
+        """ Returns a 64-bit hash of the aligned sequences, stable across processes. Solutions of an instance with the
+        same alignment have the same fingerprint, whatever the layout of their gaps groups. The hash of each sequence
+        is kept until its gaps groups change, so only the sequences changed since the last call are hashed again. """
+        digest = blake2b(digest_size=8)
+
+        for i in range(self.number_of_variables):
+            digest.update(self.__get_sequence_fingerprint(i))
+
+        return int.from_bytes(digest.digest(), 'little')
+
+    def get_instance_key(self) -> str:
+        """ Returns the key of the instance of the solution: the one of its store (see :class:`SequencesStore`) or,
+        for solutions without one, a digest of their identifiers and original sequences. Alignments of different
+        instances may have the same fingerprint, so both are needed to tell an alignment. """
+        store = self._get_shared_store()
+
+        if store is not None:
+            return store.key
+
+        return SequencesStore.compute_key(tuple(self.sequences_names), tuple(self.variables))
+
+    def __get_sequence_fingerprint(self, seq_index: int) -> bytes:
+        fingerprint = self.gaps_groups.get_fingerprint(seq_index)
+
+        if fingerprint is None:
+            # canonical runs of gaps: (number of symbols before the run, length of the run)
+            canonical_runs = array('q', chain.from_iterable(self.get_gaps_blocks(seq_index)))
+
+            fingerprint = blake2b(canonical_runs.tobytes(), digest_size=8).digest()
+            self.gaps_groups.set_fingerprint(seq_index, fingerprint)
+
+        return fingerprint
+
+    def get_gaps_blocks(self, seq_index: int) -> list:
+        """ Returns the maximal runs of gaps of an aligned sequence as (number of symbols before the run, length of the
+        run) pairs, whatever the layout of its gaps groups. They are computed from the gaps groups in time linear in
+        their number, so the sequence is only decoded if its groups are not sorted. """
+        gaps_runs = self.__get_gaps_runs(seq_index)
+
+        if gaps_runs is None:
+            gaps_runs = ([], [])
+            for match in re.finditer(self.GAP_IDENTIFIER + '+', self.__decode(seq_index)):
+                gaps_runs[0].append(match.start() - sum(gaps_runs[1]))
+                gaps_runs[1].append(match.end() - match.start())
+
+        gaps_blocks = []
+        for symbols_before, length in zip(*gaps_runs):
+            if length == 0:
+                continue
+
+            if gaps_blocks and gaps_blocks[-1][0] == symbols_before:
+                gaps_blocks[-1] = (symbols_before, gaps_blocks[-1][1] + length)
+            else:
+                gaps_blocks.append((symbols_before, length))
+
+        return gaps_blocks
+
+    def __get_gaps_runs(self, seq_index: int):
+        """ Translates the gaps groups of a sequence into runs of gaps, given as the number of symbols placed before
+        each run and the run length. This is the outcome of inserting the groups one after another (overlapping groups
+        add up), computed in linear time. Returns None if the groups are not sorted by their start. """
+        number_of_symbols = len(self.variables[seq_index])
+        gaps_group = self.gaps_groups[seq_index]
+
+        symbols_before, lengths = [], []
+        aligned_length, symbols, last_start = 0, 0, 0
+
+        for start, end in zip(gaps_group[0::2], gaps_group[1::2]):
+            if start < last_start:
+                return None
+
+            if start > aligned_length:
+                # a group starting in the middle of a previous run is appended to it
+                placed = min(start - aligned_length, number_of_symbols - symbols)
+                symbols += placed
+                aligned_length += placed
+
+            length = max(end - start + 1, 0)
+            symbols_before.append(symbols)
+            lengths.append(length)
+            aligned_length += length
+            last_start = start
+
+        return symbols_before, lengths
+
+    def __decode_by_insertion(self, encoded_sequence: str, gaps_group: list) -> str:
         aligned_sequence = list(encoded_sequence)
 
         # insert gap groups
@@ -56,87 +403,149 @@ class MSASolution(Solution[str]):
         return ''.join(aligned_sequence)
 
     def merge_gaps_groups(self) -> None:
+        """ Merges touching and overlapping gaps groups (see :meth:`normalize_gaps_groups`). """
+        self.normalize_gaps_groups()
+
+    def normalize_gaps_groups(self) -> None:
+        """ Rewrites the gaps groups of every sequence in canonical form: sorted, without empty groups and with
+        touching or overlapping groups merged (e.g., [5, 6, 2, 4, 4, 4] -> [2, 6]). Each sequence is processed in a
+        single pass (plus sorting, only if its groups are not sorted), and sequences already in canonical form are left
+        untouched. """
         for i in range(self.number_of_variables):
             gaps_group = self.gaps_groups[i]
+            starts, ends = gaps_group[0::2], gaps_group[1::2]
+
+            if all(start <= end for start, end in zip(starts, ends)) and \
+                    all(end + 1 < start for end, start in zip(ends, starts[1:])):
+                continue
+
+            pairs = zip(starts, ends)
+            first_changed_column = None
+
+            if any(start < previous_start for previous_start, start in zip(starts, starts[1:])):
+                pairs = sorted(pairs)
+                # the groups were inserted out of order, so the symbols may be anywhere
+                self.mark_all_columns_dirty()
+
+            new_gaps_group = []
+            number_of_gaps = 0
+
+            for start, end in pairs:
+                if end < start:
+                    continue
+
+                if new_gaps_group and start <= new_gaps_group[-1] + 1:
+                    if start <= new_gaps_group[-1] and first_changed_column is None:
+                        # overlapping positions are counted once: the rest of the sequence is displaced
+                        first_changed_column = start
+                    if end > new_gaps_group[-1]:
+                        number_of_gaps += end - new_gaps_group[-1]
+                        new_gaps_group[-1] = end
+                else:
+                    new_gaps_group.append(start)
+                    new_gaps_group.append(end)
+                    number_of_gaps += end - start + 1
 
-            # for each gap on the gaps group
-            j = 1
-            while j <= len(gaps_group) - 2:
-                if gaps_group[j] == gaps_group[j + 1]:
-                    gaps_group[j] = gaps_group[j + 2]
-                    del gaps_group[j + 1]
-                    del gaps_group[j + 1]
-                    j -= 2
-                elif gaps_group[j] + 1 == gaps_group[j + 1]:
-                    gaps_group[j] = gaps_group[j + 2]
-                    del gaps_group[j + 1]
-                    del gaps_group[j + 1]
-                    j -= 2
-                j += 2
+            if first_changed_column is not None:
+                self.mark_dirty_columns(first_changed_column)
+
+            self.gaps_groups[i] = new_gaps_group
+            self.gaps_groups.set_number_of_gaps(i, number_of_gaps)
 
     def add_gap_to_sequence_at_index(self, seq_index: int, gap_position: int):
         new_gaps_group = self.gaps_groups[seq_index]
         length_of_alignment = self.get_length_of_alignment()
+        number_of_gaps = self.gaps_groups.get_number_of_gaps(seq_index)
+
+        if gap_position == length_of_alignment and self.is_gap_char_at_sequence(seq_index, gap_position - 1):
+            # increments the size of the gaps group ending the sequence
+            gap_position -= 1
+
+        self.mark_dirty_columns(min(gap_position, length_of_alignment))
 
         if gap_position == length_of_alignment:
-            if self.is_gap_char_at_sequence(seq_index, gap_position - 1):
-                new_gaps_group[gap_position - 1] += 1
-            else:
-                new_gaps_group.append(gap_position)
-                new_gaps_group.append(gap_position)
+            new_gaps_group.append(gap_position)
+            new_gaps_group.append(gap_position)
+            number_of_gaps += 1
         elif gap_position >= length_of_alignment:
             new_gaps_group.append(length_of_alignment)
             new_gaps_group.append(length_of_alignment)
+            number_of_gaps += 1
         elif self.is_gap_char_at_sequence(seq_index, gap_position):
-            # increments gaps group size
-            gap_added = False
-            for j in range(0, len(new_gaps_group) - 1, 2):
-                if gap_added:
-                    new_gaps_group[j] += 1
-                    new_gaps_group[j + 1] += 1
+            # increments gaps group size, shifting the groups after it at once (so the positions are read from a copy,
+            # `shift` being added to the ones after the first group changed)
+            positions = new_gaps_group.tolist()
+            shift = 0
+            for j in range(0, len(positions) - 1, 2):
+                start, end = positions[j] + shift, positions[j + 1] + shift
+
+                if start == gap_position or end == gap_position or start < gap_position < end:
+                    if not shift:
+                        new_gaps_group.shift(j + 2, 1)
+                        shift = 1
 
-                if new_gaps_group[j] == gap_position or new_gaps_group[j + 1] == gap_position:
-                    new_gaps_group[j + 1] += 1
-                    gap_added = True
-                elif new_gaps_group[j] < gap_position < new_gaps_group[j + 1]:
                     new_gaps_group[j + 1] += 1
-                    gap_added = True
+                    number_of_gaps += 1
         else:
             # add new group at position
-            for j in range(0, len(new_gaps_group) - 1, 2):
-                if new_gaps_group[j] > gap_position:
-                    new_gaps_group[j] += 1
-                    new_gaps_group[j + 1] += 1
+            new_gaps_group.shift_groups_after(gap_position, 1)
 
             new_gaps_group.append(gap_position)
             new_gaps_group.append(gap_position)
             new_gaps_group.sort()
+            number_of_gaps += 1
 
-        self.gaps_groups[seq_index] = new_gaps_group
+        self.gaps_groups.set_number_of_gaps(seq_index, number_of_gaps)
 
     def split_gap_column(self, column: int) -> None:
+        # the aligned sequences do not change, so there are no dirty columns
         # for each sequence
         for i in range(self.number_of_variables):
-            # get gaps group
+            # get gaps group (splitting a group does not change the number of gaps)
             gaps_group = self.gaps_groups[i]
+            number_of_gaps = self.gaps_groups.get_number_of_gaps(i)
             # for each gap on the gaps group
             for j in range(0, len(gaps_group) - 1, 2):
                 if gaps_group[j] <= column < gaps_group[j + 1]:
                     gaps_group.insert(j + 1, column + 1)
                     gaps_group.insert(j + 1, column)
 
+            self.gaps_groups.set_number_of_gaps(i, number_of_gaps)
+
     def remove_full_of_gaps_columns(self) -> None:
-        gap_columns = self.get_gap_columns_from_alignment()
-        gap_columns.sort(reverse=True)
+        rows, starts, ends = self.__get_gaps_groups_as_arrays()
+        gap_columns = self.__find_gap_columns(rows, starts, ends)
+
+        if len(gap_columns) == 0:
+            return
+
+        # the other columns do not change
+        self._dirty_columns.remove_columns(gap_columns)
+
+        if self._profile_dirty_columns is not None:
+            self._profile_dirty_columns.remove_columns(gap_columns)
+
+        # every gap column lies inside one gaps group of each sequence, so each group loses the gap columns it covers
+        # and is displaced to the left as many positions as gap columns are before it
+        starts = starts - np.searchsorted(gap_columns, starts, side='left')
+        ends = ends - np.searchsorted(gap_columns, ends, side='right')
+        keep = ends >= starts
 
-        for col in gap_columns:
-            for seq_index in range(self.number_of_variables):
-                self.remove_gap_from_sequence(seq_index, col)
+        rows, starts, ends = rows[keep], starts[keep], ends[keep]
+        new_gaps_groups = np.column_stack((starts, ends)).ravel().tolist()
+        boundaries = 2 * np.searchsorted(rows, np.arange(self.number_of_variables + 1))
+        numbers_of_gaps = np.bincount(rows, weights=ends - starts + 1, minlength=self.number_of_variables)
+
+        for seq_index in range(self.number_of_variables):
+            self.gaps_groups[seq_index] = new_gaps_groups[boundaries[seq_index]:boundaries[seq_index + 1]]
+            self.gaps_groups.set_number_of_gaps(seq_index, int(numbers_of_gaps[seq_index]))
 
     def remove_gap_column(self, column: int) -> None:
         if not self.is_gap_column(column):
             raise Exception("No gap group in position {0}".format(column))
         else:
+            self.mark_dirty_columns(column)
+
             for i in range(self.number_of_variables):
                 gaps_group = self.gaps_groups[i]
 
@@ -157,36 +566,44 @@ class MSASolution(Solution[str]):
             raise Exception("No gap group in position {0} at sequence {1}".format(column_index, seq_index))
         else:
             gaps_group = self.gaps_groups[seq_index]
+            number_of_gaps = self.gaps_groups.get_number_of_gaps(seq_index)
 
             for j in range(0, len(gaps_group) - 1, 2):
                 if gaps_group[j] == column_index or gaps_group[j + 1] == column_index \
                         or gaps_group[j] < column_index < gaps_group[j + 1]:
+                    number_of_gaps -= gaps_group[j + 1] - gaps_group[j] + 1
+                    self.mark_dirty_columns(gaps_group[j])
                     del gaps_group[j]
                     del gaps_group[j]
 
                     break
 
+            self.gaps_groups.set_number_of_gaps(seq_index, number_of_gaps)
+
     def remove_gap_from_sequence(self, seq_index: int, position: int):
         new_gaps_group = self.gaps_groups[seq_index]
 
         if self.is_gap_char_at_sequence(seq_index, position):
+            number_of_gaps = self.gaps_groups.get_number_of_gaps(seq_index)
+            self.mark_dirty_columns(position)
+
             for j in range(0, len(new_gaps_group) - 1, 2):
                 if new_gaps_group[j] == position or new_gaps_group[j + 1] == position:
                     if new_gaps_group[j] == new_gaps_group[j + 1]:
-                        new_gaps_group[j + 2:] = [x - 1 for x in new_gaps_group[j + 2:]]
+                        new_gaps_group.shift(j + 2, -1)
                         del new_gaps_group[j]
                         del new_gaps_group[j]
                         break
                     else:
                         new_gaps_group[j + 1] -= 1
-                        new_gaps_group[j + 2:] = [x - 1 for x in new_gaps_group[j + 2:]]
+                        new_gaps_group.shift(j + 2, -1)
                         break
                 elif new_gaps_group[j] < position < new_gaps_group[j + 1]:
                     new_gaps_group[j + 1] -= 1
-                    new_gaps_group[j + 2:] = [x - 1 for x in new_gaps_group[j + 2:]]
+                    new_gaps_group.shift(j + 2, -1)
                     break
 
-        self.gaps_groups[seq_index] = new_gaps_group
+            self.gaps_groups.set_number_of_gaps(seq_index, number_of_gaps - 1)
 
     def is_gap_column(self, column: int) -> bool:
         # check if the column index is in all gaps groups
@@ -216,41 +633,23 @@ class MSASolution(Solution[str]):
                 "Index out of sequence: index {0}, alignment length: {1}, sequence length: {2}".format(
                     index, self.get_length_of_alignment(), self.get_length_of_sequence(seq_index)))
 
-        gaps_group = self.gaps_groups[seq_index]
+        # the index is only used when already built, as mutators usually check a position right before changing it
+        gaps_index = self.gaps_groups.get_index(seq_index, build=False)
 
-        for a, b in zip(*[iter(gaps_group)] * 2):
-            if a <= index <= b:
-                return True
+        if gaps_index is not None:
+            return gaps_index.is_gap(index)
 
-        return False
+        return self.gaps_groups[seq_index].is_gap(index)
 
     def get_char_position_in_original_sequence(self, seq_index: int, position: int):
-        gaps_group = self.gaps_groups[seq_index]
-        gaps_on_the_left = []
-
-        for j in range(0, len(gaps_group) - 1, 2):
-            if gaps_group[j + 1] <= position:
-                gaps_on_the_left.append(gaps_group[j])
-                gaps_on_the_left.append(gaps_group[j + 1])
-
-        if len(gaps_on_the_left) > 0:
-            length_of_gaps = \
-                sum([gaps_on_the_left[j + 1] - gaps_on_the_left[j] + 1 for j in range(0, len(gaps_on_the_left) - 1, 2)])
-
-            position -= length_of_gaps
-
-        return position
+        return position - self.gaps_groups.get_index(seq_index).get_number_of_gaps_until(position)
 
     def get_next_char_position_after_gap(self, seq_index: int, gap_position: int):
         if not self.is_gap_char_at_sequence(seq_index, gap_position):
             raise Exception("Symbol in position {0} is not a gap!".format(gap_position))
 
-        position = -1
-        gaps_group = self.gaps_groups[seq_index]
-
-        for j in range(0, len(gaps_group) - 1, 2):
-            if gaps_group[j] <= gap_position <= gaps_group[j + 1]:
-                position = gaps_group[j + 1] + 1
+        _, end = self.gaps_groups.get_index(seq_index).get_gaps_group_containing(gap_position)
+        position = end + 1
 
         if position == self.get_length_of_sequence(seq_index):
             position = -1
@@ -258,37 +657,20 @@ class MSASolution(Solution[str]):
         return position
 
     def get_original_char_position_in_aligned_sequence(self, seq_index: int, position: int):
-        symbol_position = 0
-        found_symbols = 0
-
         if position < 0:
-            symbol_position = -1
-        else:
-            found = False
-            while symbol_position < self.get_length_of_alignment() and not found:
-                if self.is_gap_char_at_sequence(seq_index, symbol_position):
-                    symbol_position += 1
-                else:
-                    if found_symbols == position:
-                        found = True
-                    else:
-                        found_symbols += 1
-                        symbol_position += 1
+            return -1
 
-        return symbol_position
-
-    def get_length_of_gaps(self, seq_index: int) -> int:
-        if not self.gaps_groups[seq_index]:
-            length_of_gaps = 0
-        else:
-            length_of_gaps = 0
+        symbol_position = self.gaps_groups.get_index(seq_index).get_aligned_position(position)
 
-            gaps_group = self.gaps_groups[seq_index]
+        return min(symbol_position, self.get_length_of_alignment())
 
-            for a, b in zip(*[iter(gaps_group)] * 2):
-                length_of_gaps += b - a + 1
+    def get_aligned_positions_of_original_chars(self, seq_index: int) -> list:
+        """ Returns the column of every symbol of the original sequence. The map is kept until the gaps group of the
+        sequence changes, so `get_original_char_position_in_aligned_sequence` becomes O(1) for that sequence. """
+        return self.gaps_groups.get_index(seq_index).get_aligned_positions(len(self.variables[seq_index]))
 
-        return length_of_gaps
+    def get_length_of_gaps(self, seq_index: int) -> int:
+        return self.gaps_groups.get_number_of_gaps(seq_index)
 
     def __get_gaps_group_of_sequence(self, sequence: str) -> list:
         gaps_group = []
@@ -296,7 +678,7 @@ class MSASolution(Solution[str]):
         start = 0
 
         for i in range(len(sequence)):
-            if sequence[i] is '-':
+            if sequence[i] == self.GAP_IDENTIFIER:
                 if not gap_open:
                     gap_open = True
                     start = i
@@ -319,14 +701,32 @@ class MSASolution(Solution[str]):
         return len(self.gaps_groups[seq_index]) / 2
 
     def get_gap_columns_from_alignment(self) -> list:
-        gap_columns_index = []
+        return self.__find_gap_columns(*self.__get_gaps_groups_as_arrays()).tolist()
+
+    def __get_gaps_groups_as_arrays(self) -> tuple:
+        """ Returns the gaps groups of all the sequences as three flat arrays: sequence index, start and end. """
+        rows, starts, ends = [], [], []
+
+        for seq_index, gaps_group in enumerate(self.gaps_groups):
+            starts.extend(gaps_group[0::2])
+            ends.extend(gaps_group[1::2])
+            rows.extend([seq_index] * (len(gaps_group) // 2))
+
+        return np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+    def __find_gap_columns(self, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """ Sweep line over the gaps groups: each sequence gets +1 at the start of a group and -1 after its end, so
+        the cumulative sum is positive in the columns covered by a gap. Gap columns are covered in every sequence. """
         alignment_length = self.get_length_of_alignment()
+        width = alignment_length + 1
+
+        coverage = np.zeros(self.number_of_variables * width, dtype=np.int32)
+        np.add.at(coverage, rows * width + np.clip(starts, 0, alignment_length), 1)
+        np.add.at(coverage, rows * width + np.clip(ends + 1, 0, alignment_length), -1)
 
-        for j in range(alignment_length):
-            if self.is_gap_column(j):
-                gap_columns_index.append(j)
+        is_gap = np.cumsum(coverage.reshape(self.number_of_variables, width), axis=1)[:, :-1] > 0
 
-        return gap_columns_index
+        return np.flatnonzero(is_gap.all(axis=0))
 
     def get_total_number_of_gaps(self) -> int:
         number_of_gaps = 0
@@ -337,13 +737,7 @@ class MSASolution(Solution[str]):
         return number_of_gaps
 
     def get_number_of_gaps_of_sequence_at_index(self, seq_index: int):
-        number_of_gaps = 0
-        gaps_group = self.gaps_groups[seq_index]
-
-        for i in range(0, len(gaps_group) - 1, 2):
-            number_of_gaps += gaps_group[i + 1] - gaps_group[i] + 1
-
-        return number_of_gaps
+        return self.gaps_groups.get_number_of_gaps(seq_index)
 
     def get_length_of_alignment(self) -> int:
         return len(self.variables[0]) + self.get_length_of_gaps(0)
@@ -373,3 +767,213 @@ class MSASolution(Solution[str]):
         fasta += "\n"
 
         return fasta
+
+
+class MSASolution(BaseMSASolution, Solution[str]):
+    """
+    Class representing MSA solutions.
+    """
+
+    def __init__(self, problem, msa: list, compact: bool = False, encoded: bool = False) -> None:
+        """
+        :param problem: MSA problem. If it has a store, the original sequences of `msa` must be the ones in it.
+        :param msa: Aligned sequences as a list of pairs (identifier, sequence).
+        :param compact: If True, gaps groups are stored as arrays of 32-bit ints instead of Python lists (which takes
+        less memory but is slower, see :class:`CompactGapsGroup`).
+        :param encoded: If True, `msa` is a list of triples (identifier, sequence, gaps group) instead, with the
+        original sequences and their gaps groups (see :func:`read_encoded_fasta_file`).
+        """
+        super(MSASolution, self).__init__(number_of_variables=problem.number_of_variables,
+                                          number_of_objectives=problem.number_of_objectives)
+
+        self.sequences_names = problem.identifiers
+        self.store = getattr(problem, 'store', None)
+        self._dirty_columns = DirtyColumns()
+        self._column_scores = None
+        self._column_profile = None
+        self._profile_dirty_columns = None
+        self.gaps_groups = GapsGroups([[] for _ in range(self.number_of_variables)], compact=compact)
+
+        if encoded:
+            self.encode_gaps_groups(list(record[1:] for record in msa))
+        else:
+            self.encode_alignment(list(pair[1] for pair in msa))
+
+    def clone(self) -> 'MSASolution':
+        """ Returns a copy of the solution, cheaper than `copy.deepcopy`. Immutable data (the original sequences,
+        their identifiers, the column scores and the column profile) is shared; gaps groups, dirty columns,
+        objectives, constraints and attributes are copied. """
+        solution = self.__class__.__new__(self.__class__)
+        solution.__dict__.update(self.__dict__)
+
+        solution.variables = self.variables[:]
+        solution.objectives = self.objectives[:]
+        solution.constraints = self.constraints[:]
+        solution.attributes = self.attributes.copy()
+        solution._gaps_groups = self.gaps_groups.copy()
+        solution._dirty_columns = self.dirty_columns.copy()
+        solution._profile_dirty_columns = self._profile_dirty_columns.copy() \
+            if self._profile_dirty_columns is not None else None
+
+        return solution
+
+    def _set_original_sequence(self, seq_index: int, sequence: str) -> None:
+        if self.store is not None:
+            if sequence != self.store.sequences[seq_index]:
+                raise Exception('Sequence {0} does not match the original sequence of the instance'.format(
+                    self.store.identifiers[seq_index]))
+
+            sequence = self.store.sequences[seq_index]
+
+        self.variables[seq_index] = sequence
+
+    def _get_shared_store(self) -> SequencesStore:
+        if self.store is None or tuple(self.sequences_names) != self.store.identifiers:
+            return None
+
+        return self.store
+
+    def _set_store(self, store: SequencesStore) -> None:
+        self.variables = list(store.sequences)
+        self.sequences_names = list(store.identifiers)
+        self.store = store
+        self._store_key = None
+
+    def _set_state(self, key: str, number_of_variables: int, objectives: list, constraints: list,
+                   attributes: dict) -> None:
+        self.number_of_variables = number_of_variables
+        self.number_of_objectives = len(objectives)
+        self.number_of_constrains = len(constraints)
+        self.objectives = objectives
+        self.constraints = constraints
+        self.attributes = attributes
+        self._store_key = key
+
+
+class SlottedMSASolution(BaseMSASolution):
+    """
+    MSA solution keeping only its gaps groups, objectives, constraints and attributes (in slots, without a per-instance
+    `__dict__`). The original sequences and their identifiers are read from the :class:`SequencesStore` of the
+    problem, which is shared by all the solutions of an instance.
+    """
+
+    __slots__ = ('store', '_store_key', '_gaps_groups', '_dirty_columns', '_column_scores', '_column_profile',
+                 '_profile_dirty_columns', 'objectives', 'constraints', 'attributes')
+
+    def __init__(self, problem, msa: list, compact: bool = False, encoded: bool = False) -> None:
+        """
+        :param problem: MSA problem. If it has no store yet, one is created from `msa`.
+        :param msa: Aligned sequences as a list of pairs (identifier, sequence).
+        :param compact: If True, gaps groups are stored as arrays of 32-bit ints instead of Python lists (which takes
+        less memory but is slower, see :class:`CompactGapsGroup`).
+        :param encoded: If True, `msa` is a list of triples (identifier, sequence, gaps group) instead (see
+        :class:`MSASolution`).
+        """
+        if problem.store is None:
+            problem.store = SequencesStore.register(problem.identifiers, [record[1] for record in msa]) if encoded \
+                else SequencesStore.from_alignment(problem.identifiers, msa)
+
+        self.store = problem.store
+        self.objectives = [0.0 for _ in range(problem.number_of_objectives)]
+        self.constraints = []
+        self.attributes = {}
+        self._dirty_columns = DirtyColumns()
+        self._column_scores = None
+        self._column_profile = None
+        self._profile_dirty_columns = None
+        self.gaps_groups = GapsGroups([[] for _ in range(self.number_of_variables)], compact=compact)
+
+        if encoded:
+            self.encode_gaps_groups(list(record[1:] for record in msa))
+        else:
+            self.encode_alignment(list(pair[1] for pair in msa))
+
+    @property
+    def variables(self) -> tuple:
+        return self.store.sequences
+
+    @property
+    def sequences_names(self) -> tuple:
+        return self.store.identifiers
+
+    @property
+    def number_of_variables(self) -> int:
+        return len(self.store.sequences)
+
+    @property
+    def number_of_objectives(self) -> int:
+        return len(self.objectives)
+
+    @property
+    def number_of_constrains(self) -> int:
+        return len(self.constraints)
+
+    def clone(self) -> 'SlottedMSASolution':
+        """ Returns a copy of the solution sharing the store (and the column scores and profile); gaps groups, dirty
+        columns, objectives, constraints and attributes are copied. """
+        solution = self.__class__.__new__(self.__class__)
+        solution.store = self.store
+        solution.objectives = self.objectives[:]
+        solution.constraints = self.constraints[:]
+        solution.attributes = self.attributes.copy()
+        solution._gaps_groups = self.gaps_groups.copy()
+        solution._dirty_columns = self.dirty_columns.copy()
+        solution._column_scores = self._column_scores
+        solution._column_profile = self._column_profile
+        solution._profile_dirty_columns = self._profile_dirty_columns.copy() \
+            if self._profile_dirty_columns is not None else None
+
+        return solution
+
+    def _set_original_sequence(self, seq_index: int, sequence: str) -> None:
+        if sequence != self.store.sequences[seq_index]:
+            raise Exception('Sequence {0} does not match the original sequence of the instance'.format(
+                self.store.identifiers[seq_index]))
+
+    def _get_shared_store(self) -> SequencesStore:
+        return self.store
+
+    def _set_store(self, store: SequencesStore) -> None:
+        self.store = store
+        self._store_key = None
+
+    def _set_state(self, key: str, number_of_variables: int, objectives: list, constraints: list,
+                   attributes: dict) -> None:
+        self.objectives = objectives
+        self.constraints = constraints
+        self.attributes = attributes
+        self._store_key = key
+
+
+def restore_solution(cls: type, key: str, packed_gaps_groups: tuple, objectives: list = None) -> BaseMSASolution:
+    """ Returns a solution of the instance with the given store key, made of some packed gaps groups (see
+    :meth:`BaseMSASolution.pack_gaps_groups`), with all its columns dirty and the given objectives (none by
+    default). """
+    objectives = list(objectives) if objectives is not None else []
+
+    return _restore_solution(cls, key, tuple(packed_gaps_groups) + (objectives, [], {}, [(0, DirtyColumns.END)], None))
+
+
+def _restore_solution(cls: type, key: str, state: tuple) -> BaseMSASolution:
+    compact, lengths, typecode, positions, objectives, constraints, attributes, dirty_ranges, column_profile = state
+
+    lengths, positions = array('i', lengths), array(typecode, positions)
+
+    solution = cls.__new__(cls)
+    solution._set_state(key, len(lengths), objectives, constraints, attributes)
+    solution._dirty_columns = DirtyColumns(dirty_ranges)
+    solution._column_scores = None
+    solution._column_profile = column_profile
+    solution._profile_dirty_columns = DirtyColumns() if column_profile is not None else None
+
+    gaps_groups, start = [], 0
+    for length in lengths:
+        gaps_groups.append(positions[start:start + length])
+        start += length
+
+    solution._gaps_groups = GapsGroups(gaps_groups, compact=compact)
+
+    if SequencesStore.is_registered(key):
+        solution._set_store(SequencesStore.get(key))
+
+    return solution
@@ -0,0 +1,83 @@
+import hashlib
+import weakref
+
+
+class SequencesStore:
+    """
+    Original (ungapped) sequences of a problem instance and their identifiers. They are the same for every solution of
+    the instance, so they are kept once by the problem and shared by its solutions. A store is immutable: copies of it
+    are the store itself.
+
+    Stores are registered by `key`, a digest of their content, so a solution can be serialized with the key alone and
+    resolved against the store of the receiving process (which gets it when the problem is unpickled there, or by
+    calling :meth:`register`). The registry holds weak references: stores are kept alive by the problems and solutions
+    using them, and dropped along with the last one (e.g., once an instance of a batch is solved).
+    """
+
+    __slots__ = ('identifiers', 'sequences', 'key', '__weakref__')
+
+    GAP_IDENTIFIER = '-'
+
+    _registry = weakref.WeakValueDictionary()
+
+    def __init__(self, identifiers: list, sequences: list) -> None:
+        if len(identifiers) != len(sequences):
+            raise Exception('The number of identifiers ({0}) and sequences ({1}) differ'.format(
+                len(identifiers), len(sequences)))
+
+        self.identifiers = tuple(identifiers)
+        self.sequences = tuple(sequences)
+        self.key = self.compute_key(self.identifiers, self.sequences)
+
+        self._registry.setdefault(self.key, self)
+
+    @staticmethod
+    def compute_key(identifiers: tuple, sequences: tuple) -> str:
+        digest = hashlib.sha1()
+
+        for identifier, sequence in zip(identifiers, sequences):
+            digest.update(identifier.encode())
+            digest.update(b'\0')
+            digest.update(sequence.encode())
+            digest.update(b'\n')
+
+        return digest.hexdigest()
+
+    @classmethod
+    def register(cls, identifiers: list, sequences: list) -> 'SequencesStore':
+        """ Returns the registered store with the given content, creating it if needed. """
+        store = cls._registry.get(cls.compute_key(tuple(identifiers), tuple(sequences)))
+
+        if store is None:
+            store = cls(identifiers, sequences)
+
+        return store
+
+    @classmethod
+    def from_alignment(cls, identifiers: list, msa: list) -> 'SequencesStore':
+        """ Returns the store of aligned sequences, given as a list of pairs (identifier, sequence). """
+        return cls.register(identifiers, [pair[1].replace(cls.GAP_IDENTIFIER, '') for pair in msa])
+
+    @classmethod
+    def is_registered(cls, key: str) -> bool:
+        return key in cls._registry
+
+    @classmethod
+    def get(cls, key: str) -> 'SequencesStore':
+        try:
+            return cls._registry[key]
+        except KeyError:
+            raise Exception('Unknown instance {0}: its problem must be loaded (or its store registered) in this '
+                            'process before its solutions'.format(key)) from None
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.register, (self.identifiers, self.sequences)
@@ -0,0 +1,168 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from sequoya.core.alignment import AlignmentBatch, ColumnProfile, DirtyColumns
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+
+
+class AlignmentViewTestCases(unittest.TestCase):
+
+    def setUp(self):
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        self.msa = MSASolution(problem, msa=[('seq1', 'AC---TGAC'), ('seq2', 'AT--CT--C'), ('seq3', 'AAC---TGC')])
+
+    def test_should_return_aligned_sequences(self):
+        # run
+        alignment = self.msa.get_alignment_view()
+
+        # check
+        self.assertEqual(['AC---TGAC', 'AT--CT--C', 'AAC---TGC'], alignment.sequences)
+        self.assertIs(alignment.sequences, alignment.sequences)
+        self.assertEqual(3, alignment.number_of_sequences)
+        self.assertEqual(9, alignment.length)
+
+    def test_should_columns_be_contiguous(self):
+        # run
+        alignment = self.msa.get_alignment_view()
+
+        # check
+        self.assertEqual((9, 3), alignment.columns.shape)
+        self.assertTrue(alignment.columns.flags['C_CONTIGUOUS'])
+        self.assertEqual(b'AAA', alignment.columns[0].tobytes())
+        self.assertEqual(b'--C', alignment.get_column(2).tobytes())
+
+    def test_should_share_memory_among_representations(self):
+        # run
+        alignment = self.msa.get_alignment_view()
+        data = alignment.data
+
+        # check
+        self.assertIs(alignment.matrix, alignment.matrix)
+        self.assertEqual((9, 3), data.shape)
+        self.assertTrue(data.readonly)
+        self.assertEqual(b'AAACTA', data.tobytes()[:6])
+        self.assertEqual(alignment.matrix.ctypes.data, alignment.columns.ctypes.data)
+
+
+class ColumnProfileTestCases(unittest.TestCase):
+
+    def setUp(self):
+        columns = np.frombuffer(b'AAA' b'CT-' b'--C', dtype=np.uint8).reshape(3, 3)
+        self.profile = ColumnProfile.from_columns(columns, np.frombuffer(b'-ACGT', dtype=np.uint8))
+
+    def test_should_count_every_symbol_of_the_sequences(self):
+        # check
+        self.assertEqual([[0, 3, 0, 0, 0], [1, 0, 1, 0, 1], [2, 0, 1, 0, 0]], self.profile.counts.tolist())
+        self.assertEqual(b'-CT', self.profile.get_column(1).tobytes())
+        self.assertEqual([[2, 0, 1, 0, 0]], self.profile.take([2]).counts.tolist())
+
+    def test_should_pickle_counts_as_small_ints(self):
+        # run
+        data = pickle.dumps(self.profile)
+        profile = pickle.loads(data)
+
+        # check
+        self.assertLess(len(data), self.profile.counts.nbytes)
+        self.assertEqual(self.profile.counts.tolist(), profile.counts.tolist())
+        self.assertEqual(3, profile.number_of_sequences)
+
+    def test_should_pickle_counts_of_many_sequences_without_wrapping(self):
+        for number_of_sequences in (2 ** 8, 2 ** 16, 2 ** 16 + 1):
+            # setup
+            counts = np.array([[number_of_sequences, 0], [1, number_of_sequences - 1]], dtype=np.intp)
+            profile = ColumnProfile(np.frombuffer(b'-A', dtype=np.uint8), counts, number_of_sequences)
+
+            # run
+            unpickled_profile = pickle.loads(pickle.dumps(profile))
+
+            # check
+            self.assertEqual(counts.tolist(), unpickled_profile.counts.tolist())
+
+
+class AlignmentBatchTestCases(unittest.TestCase):
+
+    def setUp(self):
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        self.msa_1 = MSASolution(problem, msa=[('seq1', 'AC-TG'), ('seq2', 'A-CTG')])
+        self.msa_2 = MSASolution(problem, msa=[('seq1', 'AC--TG'), ('seq2', 'A-CT-G')])
+
+    def test_should_stack_alignments_padding_the_shorter_ones(self):
+        # run
+        batch = AlignmentBatch([self.msa_1, self.msa_2])
+
+        # check
+        self.assertEqual(2, len(batch))
+        self.assertEqual((2, 2, 6), batch.matrix.shape)
+        self.assertEqual([5, 6], batch.lengths.tolist())
+        self.assertEqual(b'AC-TG\0', batch.matrix[0, 0].tobytes())
+        self.assertEqual(b'A-CT-G', batch.matrix[1, 1].tobytes())
+        self.assertEqual([['AC-TG', 'A-CTG'], ['AC--TG', 'A-CT-G']], batch.sequences)
+
+
+class DirtyColumnsTestCases(unittest.TestCase):
+
+    def test_should_merge_overlapping_and_touching_ranges(self):
+        # setup
+        dirty_columns = DirtyColumns()
+
+        # run
+        dirty_columns.add(10, 12)
+        dirty_columns.add(2, 3)
+        dirty_columns.add(4, 5)
+        dirty_columns.add(11, 15)
+        dirty_columns.add(20, 20)
+
+        # check
+        self.assertEqual([(2, 5), (10, 15), (20, 20)], dirty_columns.get_ranges())
+        self.assertIn(4, dirty_columns)
+        self.assertNotIn(16, dirty_columns)
+
+    def test_should_clip_open_ranges_to_the_alignment(self):
+        # setup
+        dirty_columns = DirtyColumns([(2, 3), (12, 14)])
+
+        # run
+        dirty_columns.add(5)
+
+        # check
+        self.assertEqual([(2, 3), (5, 9)], dirty_columns.get_ranges(length_of_alignment=10))
+        self.assertEqual(2, len(dirty_columns))
+
+    def test_should_mark_and_clear_all_columns(self):
+        # setup
+        dirty_columns = DirtyColumns([(2, 3)])
+
+        # run
+        dirty_columns.add_all()
+
+        # check
+        self.assertTrue(dirty_columns.is_all())
+        self.assertEqual([(0, 4)], dirty_columns.get_ranges(length_of_alignment=5))
+
+        dirty_columns.clear()
+        self.assertFalse(dirty_columns)
+
+    def test_should_displace_the_ranges_when_removing_columns(self):
+        # setup
+        dirty_columns = DirtyColumns([(2, 3), (8, 9), (12, DirtyColumns.END)])
+
+        # run
+        dirty_columns.remove_columns([5, 10])
+
+        # check
+        self.assertEqual([(2, 3), (7, 8), (10, DirtyColumns.END)], dirty_columns.get_ranges())
+        self.assertEqual([0, 1, 2, 3, 4, 6, 7, 8, 9, 11], dirty_columns.apply_removals(np.arange(12)).tolist())
+
+        dirty_columns.clear()
+        self.assertEqual(5, len(dirty_columns.apply_removals(np.arange(5))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+import copy
+import pickle
+import random
+import unittest
+
+from sequoya.core.gaps import GapsGroup, CompactGapsGroup, GapsGroups, GapsIndex
+
+
+class GapsGroupsTestCases(unittest.TestCase):
+
+    def test_should_convert_assigned_gaps_groups_to_the_storage_type(self):
+        # setup
+        gaps_groups = GapsGroups([[0, 1], []], compact=True)
+
+        # run
+        gaps_groups[1] = [2, 4]
+
+        # check
+        self.assertIsInstance(gaps_groups[0], CompactGapsGroup)
+        self.assertIsInstance(gaps_groups[1], CompactGapsGroup)
+        self.assertEqual([[0, 1], [2, 4]], gaps_groups)
+
+    def test_should_compact_gaps_group_behave_as_a_list(self):
+        # setup
+        gaps_group = CompactGapsGroup([5, 6, 1, 2])
+
+        # run
+        gaps_group.sort()
+        gaps_group[0] += 1
+        gaps_group.insert(2, 3)
+        gaps_group.insert(2, 3)
+        del gaps_group[2]
+        gaps_group.shift(2, 2)
+
+        # check
+        self.assertEqual([2, 2, 5, 7, 8], gaps_group)
+        self.assertEqual(5, len(gaps_group))
+
+    def test_should_shift_positions_in_place(self):
+        for gaps_group_type in (GapsGroup, CompactGapsGroup):
+            for length in (6, 2 * CompactGapsGroup.MIN_VECTORIZED_SHIFT):
+                # setup
+                gaps_groups = GapsGroups([list(range(0, 2 * length, 2))], compact=gaps_group_type is CompactGapsGroup)
+                gaps_group = gaps_groups[0]
+                gaps_groups.get_index(0)
+
+                # run
+                gaps_group.shift(2, 1)
+                gaps_group.append(4 * length)
+
+                # check
+                self.assertIs(gaps_group, gaps_groups[0])
+                self.assertIsNone(gaps_groups.get_index(0, build=False))
+                self.assertEqual([0, 2] + list(range(5, 2 * length + 1, 2)) + [4 * length], gaps_group)
+
+    def test_should_shift_gaps_groups_after_a_position(self):
+        for gaps_group_type in (GapsGroup, CompactGapsGroup):
+            # setup
+            gaps_group = gaps_group_type([8, 9, 1, 2, 4, 4])
+
+            # run
+            gaps_group.shift_groups_after(3, 2)
+
+            # check
+            self.assertEqual([10, 11, 1, 2, 6, 6], gaps_group)
+
+    def test_should_return_number_of_gaps(self):
+        self.assertEqual(0, GapsGroup([]).get_number_of_gaps())
+        self.assertEqual(6, GapsGroup([1, 2, 5, 8]).get_number_of_gaps())
+        self.assertEqual(6, CompactGapsGroup([1, 2, 5, 8]).get_number_of_gaps())
+
+    def test_should_copies_keep_the_storage_type(self):
+        # setup
+        gaps_groups = GapsGroups([[0, 1], [2, 4]], compact=True)
+
+        # run
+        copied = copy.deepcopy(gaps_groups)
+        unpickled = pickle.loads(pickle.dumps(gaps_groups))
+
+        # check
+        for gaps_groups_copy in (copied, unpickled):
+            self.assertTrue(gaps_groups_copy.compact)
+            self.assertEqual([[0, 1], [2, 4]], gaps_groups_copy)
+            self.assertIsInstance(gaps_groups_copy[0], CompactGapsGroup)
+
+    def test_should_compact_storage_take_less_memory(self):
+        gaps_group = [x for x in range(1000, 3000)]
+
+        self.assertLess(GapsGroups([gaps_group], compact=True).get_size_in_bytes(),
+                        GapsGroups([gaps_group]).get_size_in_bytes())
+
+    def test_should_drop_index_when_a_gaps_group_changes(self):
+        # setup
+        for compact in (False, True):
+            gaps_groups = GapsGroups([[0, 1], [2, 4]], compact=compact)
+            index = gaps_groups.get_index(1)
+
+            # check
+            self.assertIs(index, gaps_groups.get_index(1))
+
+            gaps_groups[1][0] -= 1
+            self.assertIsNot(index, gaps_groups.get_index(1))
+            self.assertTrue(gaps_groups.get_index(1).is_gap(1))
+
+            index = gaps_groups.get_index(0)
+            gaps_groups[0] = [5, 5]
+            self.assertIsNot(index, gaps_groups.get_index(0))
+            self.assertFalse(gaps_groups.get_index(0).is_gap(0))
+
+    def test_should_not_share_gaps_groups_among_containers(self):
+        # setup
+        gaps_groups_a = GapsGroups([[0, 1]])
+        gaps_groups_b = GapsGroups([[]])
+
+        # run
+        gaps_groups_b[0] = gaps_groups_a[0]
+        gaps_groups_b[0].append(3)
+
+        # check
+        self.assertEqual([0, 1], gaps_groups_a[0])
+        self.assertEqual([0, 1, 3], gaps_groups_b[0])
+
+    def test_should_copy_carry_over_cached_data(self):
+        # setup
+        gaps_groups = GapsGroups([[0, 1], [2, 4]], compact=True)
+        gaps_groups.get_index(0)
+        gaps_groups.get_number_of_gaps(1)
+
+        # run
+        gaps_groups_copy = gaps_groups.copy()
+        gaps_groups_copy[1][1] = 5
+
+        # check
+        self.assertTrue(gaps_groups_copy.compact)
+        self.assertIs(gaps_groups.get_index(0, build=False), gaps_groups_copy.get_index(0, build=False))
+        self.assertEqual(3, gaps_groups.get_number_of_gaps(1))
+        self.assertEqual(4, gaps_groups_copy.get_number_of_gaps(1))
+        self.assertEqual([2, 4], gaps_groups[1])
+
+    def test_should_drop_cached_data_when_a_gaps_group_is_deleted(self):
+        # setup
+        for compact in (False, True):
+            gaps_groups = GapsGroups([[0, 1], [2, 4], [6, 6]], compact=compact)
+            removed_gaps_group = gaps_groups[0]
+            gaps_groups.get_index(1)
+            gaps_groups.set_fingerprint(1, b'1')
+
+            # run
+            del gaps_groups[0]
+
+            # check
+            self.assertEqual([[2, 4], [6, 6]], gaps_groups)
+            self.assertEqual([0, 1], [gaps_group._index for gaps_group in gaps_groups])
+            self.assertIsNone(gaps_groups.get_fingerprint(1))
+            self.assertEqual(3, gaps_groups.get_number_of_gaps(0))
+            self.assertTrue(gaps_groups.get_index(1).is_gap(6))
+            self.assertFalse(gaps_groups.get_index(1).is_gap(2))
+
+            removed_gaps_group.append(8)
+            gaps_groups[0][0] = 3
+            self.assertEqual(2, gaps_groups.get_number_of_gaps(0))
+
+    def test_should_drop_cached_data_when_a_gaps_group_is_inserted(self):
+        # setup
+        for compact in (False, True):
+            gaps_groups = GapsGroups([[0, 1], [2, 4]], compact=compact)
+            gaps_groups.get_index(0)
+            gaps_groups.set_fingerprint(0, b'0')
+
+            # run
+            gaps_groups.insert(0, [5, 5])
+            gaps_groups[2:] = [[7, 8]]
+
+            # check
+            self.assertEqual([[5, 5], [0, 1], [7, 8]], gaps_groups)
+            self.assertEqual([0, 1, 2], [gaps_group._index for gaps_group in gaps_groups])
+            self.assertIsInstance(gaps_groups[2], gaps_groups.gaps_group_type)
+            self.assertIsNone(gaps_groups.get_fingerprint(0))
+            self.assertTrue(gaps_groups.get_index(0).is_gap(5))
+            self.assertFalse(gaps_groups.get_index(0).is_gap(0))
+            self.assertTrue(gaps_groups.get_index(2).is_gap(8))
+
+
+class GapsIndexTestCases(unittest.TestCase):
+
+    def setUp(self):
+        # e.g. '---A---BC--D---'
+        self.index = GapsIndex([0, 2, 4, 6, 9, 10, 12, 14])
+
+    def test_should_find_gaps(self):
+        self.assertTrue(self.index.is_gap(0))
+        self.assertTrue(self.index.is_gap(6))
+        self.assertFalse(self.index.is_gap(7))
+        self.assertFalse(self.index.is_gap(11))
+        self.assertTrue(self.index.is_gap(14))
+
+    def test_should_return_gaps_group_containing_position(self):
+        self.assertEqual((4, 6), self.index.get_gaps_group_containing(5))
+        self.assertIsNone(self.index.get_gaps_group_containing(3))
+
+    def test_should_return_number_of_gaps_until_position(self):
+        self.assertEqual(0, self.index.get_number_of_gaps_until(1))
+        self.assertEqual(3, self.index.get_number_of_gaps_until(3))
+        self.assertEqual(8, self.index.get_number_of_gaps_until(11))
+
+    def test_should_return_aligned_positions(self):
+        self.assertEqual(3, self.index.get_aligned_position(0))
+        self.assertEqual(8, self.index.get_aligned_position(2))
+        self.assertEqual(11, self.index.get_aligned_position(3))
+        self.assertEqual([3, 7, 8, 11], self.index.get_aligned_positions(4))
+        self.assertEqual(11, self.index.get_aligned_position(3))
+
+    def test_should_add_up_touching_groups_as_given(self):
+        index = GapsIndex([2, 4, 4, 5, 9, 9])
+
+        self.assertEqual((4, 5), index.get_gaps_group_containing(5))
+        self.assertEqual(5, index.get_number_of_gaps_until(5))
+        self.assertTrue(index.is_gap(3))
+
+    def test_should_answer_as_a_linear_scan_of_the_groups(self):
+        # the scans the index replaces, with their answers on groups unsorted, touching, overlapping or starting at -1
+        def is_gap(gaps_group, position):
+            return any(start <= position <= end for start, end in zip(gaps_group[0::2], gaps_group[1::2]))
+
+        def get_gaps_group_containing(gaps_group, position):
+            containing_group = None
+            for start, end in zip(gaps_group[0::2], gaps_group[1::2]):
+                if start <= position <= end:
+                    containing_group = start, end
+            return containing_group
+
+        def get_number_of_gaps_until(gaps_group, position):
+            return sum(end - start + 1 for start, end in zip(gaps_group[0::2], gaps_group[1::2]) if end <= position)
+
+        def get_aligned_position(gaps_group, char_position, length):
+            symbols = 0
+            for column in range(length):
+                if not is_gap(gaps_group, column):
+                    if symbols == char_position:
+                        return column
+                    symbols += 1
+            return length
+
+        random_generator = random.Random(1)
+        length = 30
+
+        for _ in range(300):
+            # setup
+            gaps_group = []
+            for _ in range(random_generator.randint(0, 5)):
+                start = random_generator.randint(-1, length - 1)
+                gaps_group += [start, min(start + random_generator.randint(0, 4), length - 1)]
+
+            # run
+            index = GapsIndex(gaps_group)
+
+            # check
+            for position in range(length):
+                self.assertEqual(is_gap(gaps_group, position), index.is_gap(position))
+                self.assertEqual(get_gaps_group_containing(gaps_group, position),
+                                 index.get_gaps_group_containing(position))
+                self.assertEqual(get_number_of_gaps_until(gaps_group, position),
+                                 index.get_number_of_gaps_until(position))
+
+            number_of_chars = length - sum(is_gap(gaps_group, column) for column in range(length))
+            expected_positions = [get_aligned_position(gaps_group, char_position, length)
+                                  for char_position in range(number_of_chars + 1)]
+            self.assertEqual(expected_positions,
+                             [min(index.get_aligned_position(char_position), length)
+                              for char_position in range(number_of_chars + 1)])
+            self.assertEqual(expected_positions[:number_of_chars], index.get_aligned_positions(number_of_chars))
+
+if __name__ == "__main__":
+    unittest.main()
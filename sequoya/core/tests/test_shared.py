@@ -0,0 +1,102 @@
+import pickle
+import unittest
+
+from sequoya.core.shared import SharedPopulation, release_attached_population
+from sequoya.core.solution import MSASolution, SlottedMSASolution
+from sequoya.core.store import SequencesStore
+from sequoya.problem import MSA
+
+
+class SharedPopulationTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = MSA(score_list=[])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+        self.alignments = [[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')], [('seq1', 'ACTGAC--'), ('seq2', '--ACTGAC')]]
+        self.problem.store = SequencesStore.from_alignment(self.problem.identifiers, self.alignments[0])
+        self.solutions = [MSASolution(self.problem, msa=msa) for msa in self.alignments]
+
+    def test_should_read_the_solutions_written_in_its_slots(self):
+        with SharedPopulation.for_solutions(self.solutions) as population:
+            # run
+            population.put_all(self.solutions)
+            solution = population.get(1)
+
+            # check
+            self.assertEqual(2, len(population))
+            self.assertIs(self.problem.store, solution.store)
+            self.assertEqual(['ACTGAC--', '--ACTGAC'], solution.decode_alignment_as_list_of_sequences())
+            self.assertTrue(solution.dirty_columns.is_all())
+            self.assertEqual([[6, 7], [0, 1]], [gaps_group.tolist() for gaps_group in population.get_gaps_groups(1)])
+            self.assertFalse(population.get_gaps_groups(0)[0].flags.writeable)
+
+    def test_should_attach_to_the_same_blocks_when_unpickled(self):
+        with SharedPopulation.for_solutions(self.solutions) as population:
+            # run
+            attached_population = pickle.loads(pickle.dumps(population))
+            population.put(0, self.solutions[1])
+
+            # check
+            self.assertLess(len(pickle.dumps(population)), 200)
+            self.assertIs(self.problem.store, attached_population.store)
+            self.assertEqual(['ACTGAC--', '--ACTGAC'],
+                             attached_population.get(0, SlottedMSASolution).decode_alignment_as_list_of_sequences())
+            self.assertIs(attached_population, pickle.loads(pickle.dumps(population)))
+
+            release_attached_population(population.gaps_name)
+
+    def test_should_close_the_attached_population_replaced_by_a_new_one(self):
+        # setup
+        with SharedPopulation.for_solutions(self.solutions) as population:
+            attached_population = pickle.loads(pickle.dumps(population))
+            owner = population.owner
+
+        with SharedPopulation.for_solutions(self.solutions, owner=owner) as new_population:
+            # run
+            new_attached_population = pickle.loads(pickle.dumps(new_population))
+
+            # check
+            self.assertIsNone(attached_population._slots)
+            self.assertIsNot(attached_population, new_attached_population)
+            self.assertIs(new_attached_population, pickle.loads(pickle.dumps(new_population)))
+
+            release_attached_population(new_population.gaps_name)
+            self.assertIsNone(new_attached_population._slots)
+            self.assertIsNot(new_attached_population, pickle.loads(pickle.dumps(new_population)))
+
+            release_attached_population(new_population.gaps_name)
+
+    def test_should_keep_populations_of_other_owners_attached(self):
+        with SharedPopulation.for_solutions(self.solutions) as population, \
+                SharedPopulation.for_solutions(self.solutions) as other_population:
+            # run
+            attached_population = pickle.loads(pickle.dumps(population))
+            pickle.loads(pickle.dumps(other_population))
+            population.put(0, self.solutions[1])
+
+            # check
+            self.assertIs(attached_population, pickle.loads(pickle.dumps(population)))
+            self.assertEqual(['ACTGAC--', '--ACTGAC'],
+                             attached_population.get(0).decode_alignment_as_list_of_sequences())
+
+            release_attached_population(population.gaps_name)
+            release_attached_population(other_population.gaps_name)
+
+    def test_should_not_fit_solutions_larger_than_its_slots(self):
+        # setup
+        self.solutions[1].add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+        self.solutions[1].add_gap_to_sequence_at_index(seq_index=1, gap_position=3)
+
+        with SharedPopulation(self.problem.store, capacity=2, slot_size=8) as population:
+            # check
+            self.assertTrue(population.fits(self.solutions[:1]))
+            self.assertFalse(population.fits(self.solutions))
+            self.assertFalse(population.fits(self.solutions * 2))
+
+            with self.assertRaises(Exception):
+                population.put(1, self.solutions[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
+import copy
+import pickle
 import unittest
 
-from sequoya.core.solution import MSASolution
+import numpy as np
+
+from sequoya.core.solution import MSASolution, SlottedMSASolution, restore_solution
+from sequoya.core.store import SequencesStore
 from sequoya.problem import MSA
 
 
@@ -16,6 +21,24 @@ class MSASolutionTestCases(unittest.TestCase):
         # check
         self.assertEqual(['AC---TGAC', 'AT--CT--C', 'AAC---TGC'], msa.decode_alignment_as_list_of_sequences())
 
+    def test_should_create_solution_from_encoded_sequences(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        msa = MSASolution(problem, msa=[('seq1', 'AC---TGAC'), ('seq2', 'AT--CT--C'), ('seq3', 'AAC---TGC')])
+
+        # run
+        encoded_msa = MSASolution(problem, msa=[('seq1', 'ACTGAC', [2, 4]), ('seq2', 'ATCTC', [2, 3, 6, 7]),
+                                                ('seq3', 'AACTGC', [3, 5])], encoded=True)
+
+        # check
+        self.assertEqual(msa.decode_alignment_as_list_of_sequences(),
+                         encoded_msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual(msa.variables, encoded_msa.variables)
+        self.assertEqual([3, 4, 3], [encoded_msa.get_length_of_gaps(i) for i in range(3)])
+        self.assertTrue(encoded_msa.dirty_columns.is_all())
+
     def test_should_return_original_alignment_size(self):
         # setup
         problem = MSA(score_list=[])
@@ -140,6 +163,28 @@ class MSASolutionTestCases(unittest.TestCase):
         # check
         self.assertEqual([2, 10], msa.gaps_groups[0])
 
+    def test_should_normalize_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        msa = MSASolution(problem, msa=[('seq1', 'ACTGAC'), ('seq2', 'ATCTC'), ('seq3', 'A-C-T')])
+        msa.gaps_groups[0] = [7, 8, 2, 3, 4, 5]
+        msa.gaps_groups[1] = [1, 1, 3, 2, 2, 6, 4, 9]
+        gaps_group_3 = msa.gaps_groups[2]
+        msa.reset_dirty_columns()
+
+        # run
+        msa.normalize_gaps_groups()
+
+        # check
+        self.assertEqual([2, 5, 7, 8], msa.gaps_groups[0])
+        self.assertEqual([1, 9], msa.gaps_groups[1])
+        self.assertIs(gaps_group_3, msa.gaps_groups[2])
+        self.assertEqual(["AC----T--GAC", "A---------TCTC", "A-C-T"], msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual([6, 9, 2], [msa.get_length_of_gaps(i) for i in range(3)])
+        self.assertTrue(msa.dirty_columns.is_all())
+
     def test_should_return_is_gap_column(self):
         # setup
         problem = MSA(score_list=[])
@@ -281,6 +326,19 @@ class MSASolutionTestCases(unittest.TestCase):
         # check
         self.assertEqual(['ABCDE-', 'ABCD-E'], msa.decode_alignment_as_list_of_sequences())
 
+    def test_should_remove_all_gap_columns_case_e(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        msa = MSASolution(problem, msa=[('seq1', '-A----B--C-'), ('seq2', '--A--B-C---'), ('seq3', '-A---B-C--D')])
+
+        msa.remove_full_of_gaps_columns()
+
+        # check
+        self.assertEqual(['A--B-C-', '-AB-C--', 'A-B-C-D'], msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual([[1, 2, 4, 4, 6, 6], [0, 0, 3, 3, 5, 6], [1, 1, 3, 3, 5, 5]], msa.gaps_groups)
+
     def test_should_return_gap_columns(self):
         # setup
         problem = MSA(score_list=[])
@@ -434,6 +492,452 @@ class MSASolutionTestCases(unittest.TestCase):
         self.assertEqual([('seq1', 'A-C-')], msa_3.decode_alignment_as_list_of_pairs())
         self.assertEqual([('seq1', 'A-AA')], msa_4.decode_alignment_as_list_of_pairs())
 
+    def test_should_compact_solution_behave_as_the_default_one(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        aln_seq = [('seq1', 'AC--T--GC'), ('seq2', 'AC-----AC'), ('seq3', 'A---C--AC')]
+
+        msa = MSASolution(problem, msa=aln_seq)
+        msa_compact = MSASolution(problem, msa=aln_seq, compact=True)
+
+        # run
+        for solution in (msa, msa_compact):
+            solution.add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+            solution.add_gap_to_sequence_at_index(seq_index=1, gap_position=9)
+            solution.add_gap_to_sequence_at_index(seq_index=2, gap_position=4)
+            solution.merge_gaps_groups()
+            solution.remove_full_of_gaps_columns()
+
+        # check
+        self.assertEqual(msa.gaps_groups, msa_compact.gaps_groups)
+        self.assertEqual(msa.decode_alignment_as_list_of_sequences(),
+                         msa_compact.decode_alignment_as_list_of_sequences())
+        self.assertTrue(msa_compact.is_valid_msa())
+
+    def test_should_position_queries_see_direct_changes_on_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1']
+        problem.number_of_variables = 1
+        msa = MSASolution(problem, msa=[('seq1', 'A--BC-D')])
+
+        self.assertTrue(msa.is_gap_char_at_sequence(0, 1))
+        self.assertEqual(3, msa.get_original_char_position_in_aligned_sequence(0, 1))
+
+        # run
+        msa.gaps_groups[0][0] += 1
+        msa.gaps_groups[0][1] += 1
+
+        # check
+        self.assertEqual(['AB--C-D'], msa.decode_alignment_as_list_of_sequences())
+        self.assertFalse(msa.is_gap_char_at_sequence(0, 1))
+        self.assertEqual(1, msa.get_original_char_position_in_aligned_sequence(0, 1))
+        self.assertEqual(1, msa.get_char_position_in_original_sequence(0, 1))
+        self.assertEqual(4, msa.get_next_char_position_after_gap(0, 2))
+
+    def test_should_lengths_follow_changes_on_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'A--BC-D'), ('seq2', 'AB-C--D')])
+
+        def check():
+            for seq_index, sequence in enumerate(msa.decode_alignment_as_list_of_sequences()):
+                self.assertEqual(len(sequence), msa.get_length_of_sequence(seq_index))
+                self.assertEqual(sequence.count('-'), msa.get_length_of_gaps(seq_index))
+
+        check()
+
+        # run
+        msa.add_gap_to_sequence_at_index(seq_index=0, gap_position=2)
+        msa.add_gap_to_sequence_at_index(seq_index=1, gap_position=0)
+        check()
+
+        msa.remove_gap_from_sequence(seq_index=0, position=1)
+        check()
+
+        msa.gaps_groups[1][1] += 2
+        msa.gaps_groups[0] = [1, 1, 3, 5]
+        check()
+
+        msa.merge_gaps_groups()
+        msa.split_gap_column(4)
+        check()
+
+        msa.remove_gap_group_from_sequence_at_column(seq_index=1, column_index=0)
+        msa.remove_full_of_gaps_columns()
+        check()
+
+    def test_should_decode_unsorted_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1']
+        problem.number_of_variables = 1
+        msa = MSASolution(problem, msa=[('seq1', 'ACTGAC')])
+
+        # run
+        msa.gaps_groups[0] = [5, 6, 1, 1]
+
+        # check
+        self.assertEqual(['A-CTGA--C'], msa.decode_alignment_as_list_of_sequences())
+
+    def test_should_return_alignment_as_array(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        msa = MSASolution(problem, msa=[('seq1', 'AC---TGAC'), ('seq2', 'AT--CT--C'), ('seq3', '---AACTGC')])
+
+        # run
+        alignment = msa.decode_alignment_as_array()
+
+        # check
+        self.assertEqual((3, 9), alignment.shape)
+        self.assertEqual(np.uint8, alignment.dtype)
+        self.assertEqual(msa.decode_alignment_as_list_of_sequences(), [row.tobytes().decode() for row in alignment])
+
+    def test_should_return_alignment_as_array_with_overlapping_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'ACTGAC'), ('seq2', 'ATCTC')])
+        msa.gaps_groups[0] = [2, 4, 4, 5]
+        msa.gaps_groups[1] = [2, 4, 5, 7]
+
+        # run
+        alignment = msa.decode_alignment_as_array()
+
+        # check
+        self.assertEqual(["AC-----TGAC", "AT------CTC"], [row.tobytes().decode() for row in alignment])
+
+    def test_should_alignment_as_array_raise_exception_if_sequences_are_not_aligned(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--T'), ('seq2', 'ACT--')])
+
+        # run
+        msa.gaps_groups[0] = [2, 4]
+
+        # check
+        with self.assertRaises(Exception):
+            msa.decode_alignment_as_array()
+
+    def test_should_clone_share_sequences_and_copy_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+        msa.objectives = [1.0, 2.0]
+        msa.attributes['rank'] = 0
+
+        # run
+        clone = msa.clone()
+        clone.add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+        clone.add_gap_to_sequence_at_index(seq_index=1, gap_position=0)
+        clone.objectives[0] = 3.0
+        clone.attributes['rank'] = 1
+
+        # check
+        self.assertIs(msa.sequences_names, clone.sequences_names)
+        self.assertIs(msa.variables[0], clone.variables[0])
+        self.assertEqual(['AC--T', 'A-C-T'], msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual(['-AC--T', '-A-C-T'], clone.decode_alignment_as_list_of_sequences())
+        self.assertEqual(2, msa.get_length_of_gaps(0))
+        self.assertEqual(3, clone.get_length_of_gaps(0))
+        self.assertEqual([1.0, 2.0], msa.objectives)
+        self.assertEqual({'rank': 0}, msa.attributes)
+
+    def test_should_track_dirty_columns(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')])
+
+        # check
+        self.assertEqual([(0, 7)], msa.consume_dirty_columns())
+        self.assertFalse(msa.has_dirty_columns())
+
+        # run
+        msa.split_gap_column(2)
+        self.assertFalse(msa.has_dirty_columns())
+
+        msa.add_gap_to_sequence_at_index(seq_index=0, gap_position=6)
+        msa.add_gap_to_sequence_at_index(seq_index=1, gap_position=8)
+        self.assertEqual([(6, 8)], msa.consume_dirty_columns())
+
+        msa.remove_gap_from_sequence(seq_index=1, position=1)
+        msa.mark_dirty_columns(0, 0)
+        self.assertEqual([(0, 8)], msa.dirty_columns.get_ranges(msa.get_length_of_alignment()))
+
+    def test_should_clone_keep_its_own_dirty_columns(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1']
+        problem.number_of_variables = 1
+        msa = MSASolution(problem, msa=[('seq1', 'AC--TGAC')])
+        msa.reset_dirty_columns()
+
+        # run
+        clone = msa.clone()
+        clone.remove_gap_from_sequence(seq_index=0, position=2)
+
+        # check
+        self.assertFalse(msa.has_dirty_columns())
+        self.assertEqual([(2, 6)], clone.consume_dirty_columns())
+
+    def test_should_decode_some_columns(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        msa = MSASolution(problem, msa=[('seq1', 'AC---TGAC'), ('seq2', 'AT--CT--C'), ('seq3', '---AACTGC')])
+
+        # run
+        columns = msa.decode_columns([8, 0, 3, 4])
+
+        # check
+        self.assertEqual(['CCC', 'AA-', '--A', '-CA'], [row.tobytes().decode() for row in columns])
+
+    def test_should_keep_the_column_profile_up_to_date(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')])
+        profile = msa.get_column_profile()
+
+        # run
+        clone = msa.clone()
+        clone.add_gap_to_sequence_at_index(seq_index=0, gap_position=6)
+        clone.add_gap_to_sequence_at_index(seq_index=1, gap_position=8)
+        clone.remove_full_of_gaps_columns()
+        clone.reset_dirty_columns()
+
+        # check
+        self.assertTrue(clone.has_column_profile())
+        self.assertIs(profile, msa.get_column_profile())
+        self.assertEqual(b'-ACGT', profile.symbols.tobytes())
+        self.assertEqual([0, 1, 1, 2, 0, 0, 0, 0], profile.get_counts_of('-').tolist())
+        self.assertEqual([3], profile.get_gap_columns().tolist())
+        self.assertEqual([0, 1, 1, 0, 0, 1, 0, 1], clone.get_column_profile().get_counts_of('-').tolist())
+        self.assertEqual(['AC-TG-AC', 'A-CTGAC-'], clone.decode_alignment_as_list_of_sequences())
+
+    def test_should_pickle_solution_with_the_key_of_the_store(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        aln_seq = [('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')]
+        problem.store = SequencesStore.from_alignment(problem.identifiers, aln_seq)
+        msa = MSASolution(problem, msa=aln_seq, compact=True)
+        msa.objectives = [1, 2.5]
+        msa.attributes['rank'] = 0
+        msa.reset_dirty_columns()
+        msa.mark_dirty_columns(3, 4)
+
+        # run
+        data = pickle.dumps(msa)
+        unpickled_msa = pickle.loads(data)
+
+        # check
+        self.assertNotIn(b'TGAC', data)
+        self.assertIs(problem.store, unpickled_msa.store)
+        self.assertEqual(msa.decode_alignment_as_list_of_pairs(), unpickled_msa.decode_alignment_as_list_of_pairs())
+        self.assertEqual([1, 2.5], unpickled_msa.objectives)
+        self.assertEqual({'rank': 0}, unpickled_msa.attributes)
+        self.assertEqual([(3, 4)], unpickled_msa.dirty_columns.get_ranges())
+        self.assertTrue(unpickled_msa.gaps_groups.compact)
+        self.assertEqual(2, unpickled_msa.number_of_variables)
+
+    def test_should_pickle_the_column_profile_up_to_date(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        aln_seq = [('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')]
+        problem.store = SequencesStore.from_alignment(problem.identifiers, aln_seq)
+        msa = MSASolution(problem, msa=aln_seq)
+        msa.get_column_profile()
+        msa.add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+        msa.add_gap_to_sequence_at_index(seq_index=1, gap_position=8)
+
+        # run
+        unpickled_msa = pickle.loads(pickle.dumps(msa))
+
+        # check
+        self.assertTrue(unpickled_msa.has_column_profile())
+        self.assertEqual(msa.get_column_profile().counts.tolist(), unpickled_msa.get_column_profile().counts.tolist())
+        self.assertEqual([1, 1, 0, 2, 1, 0, 0, 0, 1], unpickled_msa.get_column_profile().get_counts_of('-').tolist())
+
+    def test_should_restore_solution_from_its_packed_gaps_groups(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        aln_seq = [('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')]
+        problem.store = SequencesStore.from_alignment(problem.identifiers, aln_seq)
+        msa = MSASolution(problem, msa=aln_seq)
+
+        # run
+        solution = restore_solution(MSASolution, problem.store.key, msa.pack_gaps_groups())
+
+        # check
+        self.assertEqual(['AC--TGAC', 'A-C-TGAC'], solution.decode_alignment_as_list_of_sequences())
+        self.assertTrue(solution.dirty_columns.is_all())
+        self.assertEqual([], solution.objectives)
+
+    def test_should_pickle_whole_solution_if_it_has_no_store(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')])
+
+        # run
+        data = pickle.dumps(msa)
+
+        # check
+        self.assertIn(b'TGAC', data)
+        self.assertEqual(['AC--TGAC', 'A-C-TGAC'], pickle.loads(data).decode_alignment_as_list_of_sequences())
+
+    def test_should_raise_exception_if_sequences_do_not_match_the_store(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        problem.store = SequencesStore.from_alignment(problem.identifiers, [('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+
+        # check
+        with self.assertRaises(Exception):
+            MSASolution(problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-G')])
+
+    def test_should_fingerprint_depend_only_on_the_alignment(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC-----TGAC'), ('seq2', 'AT-------CT')])
+        other_msa = MSASolution(problem, msa=[('seq1', 'ACTGAC'), ('seq2', 'ATCT')])
+
+        # run
+        other_msa.gaps_groups[0] = [2, 4, 4, 5]
+        other_msa.gaps_groups[1] = [2, 3, 4, 8]
+
+        # check
+        self.assertEqual(msa.decode_alignment_as_list_of_sequences(), other_msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual(msa.get_fingerprint(), other_msa.get_fingerprint())
+        self.assertEqual(msa.get_fingerprint(), msa.clone().get_fingerprint())
+        self.assertTrue(0 <= msa.get_fingerprint() < 2 ** 64)
+
+    def test_should_fingerprint_change_with_the_alignment(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')])
+        fingerprint = msa.get_fingerprint()
+
+        # run
+        msa.gaps_groups[1][0] += 1
+        msa.gaps_groups[1][1] += 1
+
+        # check
+        self.assertEqual(['AC--TGAC', 'AC--TGAC'], msa.decode_alignment_as_list_of_sequences())
+        self.assertNotEqual(fingerprint, msa.get_fingerprint())
+
+
+class SlottedMSASolutionTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = MSA(score_list=[])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+        self.problem.number_of_objectives = 2
+
+    def test_should_share_the_store_of_the_problem(self):
+        # setup
+        msa_1 = SlottedMSASolution(self.problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+        msa_2 = SlottedMSASolution(self.problem, msa=[('seq1', '-ACT'), ('seq2', 'AC-T')])
+
+        # check
+        self.assertFalse(hasattr(msa_1, '__dict__'))
+        self.assertIs(self.problem.store, msa_1.store)
+        self.assertIs(msa_1.store, msa_2.store)
+        self.assertEqual(('ACT', 'ACT'), msa_2.variables)
+        self.assertEqual(('seq1', 'seq2'), msa_2.sequences_names)
+        self.assertEqual(2, msa_2.number_of_variables)
+        self.assertEqual(2, msa_2.number_of_objectives)
+
+    def test_should_behave_as_the_default_solution(self):
+        # setup
+        aln_seq = [('seq1', 'A--BC-D'), ('seq2', 'AB-C--D')]
+        msa = MSASolution(self.problem, msa=aln_seq)
+        slotted_msa = SlottedMSASolution(self.problem, msa=aln_seq)
+
+        # run
+        for solution in (msa, slotted_msa):
+            solution.add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+            solution.add_gap_to_sequence_at_index(seq_index=1, gap_position=7)
+            solution.remove_full_of_gaps_columns()
+
+        # check
+        self.assertEqual(msa.decode_alignment_as_list_of_pairs(), slotted_msa.decode_alignment_as_list_of_pairs())
+        self.assertEqual(msa.get_total_number_of_gaps(), slotted_msa.get_total_number_of_gaps())
+        self.assertEqual(str(msa), str(slotted_msa))
+
+    def test_should_copies_share_the_store(self):
+        # setup
+        msa = SlottedMSASolution(self.problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+        msa.objectives = [1.0, 2.0]
+
+        # run
+        clone = msa.clone()
+        deep_copy = copy.deepcopy(msa)
+        clone.add_gap_to_sequence_at_index(seq_index=0, gap_position=0)
+        clone.add_gap_to_sequence_at_index(seq_index=1, gap_position=0)
+        clone.objectives[0] = 3.0
+
+        # check
+        self.assertIs(msa.store, clone.store)
+        self.assertIs(msa.store, deep_copy.store)
+        self.assertEqual(['AC--T', 'A-C-T'], msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual(['AC--T', 'A-C-T'], deep_copy.decode_alignment_as_list_of_sequences())
+        self.assertEqual(['-AC--T', '-A-C-T'], clone.decode_alignment_as_list_of_sequences())
+        self.assertEqual([1.0, 2.0], msa.objectives)
+
+    def test_should_raise_exception_if_sequences_do_not_match_the_store(self):
+        # setup
+        SlottedMSASolution(self.problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+
+        # check
+        with self.assertRaises(Exception):
+            SlottedMSASolution(self.problem, msa=[('seq1', 'AC--T'), ('seq2', 'A-C-G')])
+
+    def test_should_resolve_the_store_once_it_is_registered(self):
+        # setup
+        msa = SlottedMSASolution(self.problem, msa=[('seq1', 'AC--TTGA'), ('seq2', 'A-C-TTGA')])
+        store = msa.store
+        data = pickle.dumps(msa)
+
+        # run
+        del SequencesStore._registry[store.key]
+        unpickled_msa = pickle.loads(data)
+        # the registry keeps stores while they are used
+        registered_store = SequencesStore.register(store.identifiers, store.sequences)
+
+        # check
+        self.assertEqual(['AC--TTGA', 'A-C-TTGA'], unpickled_msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual(('seq1', 'seq2'), unpickled_msa.sequences_names)
+        self.assertIs(registered_store, unpickled_msa.store)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+import copy
+import gc
+import pickle
+import unittest
+
+from sequoya.core.store import SequencesStore
+
+
+class SequencesStoreTestCases(unittest.TestCase):
+
+    def test_should_create_store_from_alignment(self):
+        # run
+        store = SequencesStore.from_alignment(['seq1', 'seq2'], [('seq1', 'AC--T'), ('seq2', 'A-C-T')])
+
+        # check
+        self.assertEqual(('seq1', 'seq2'), store.identifiers)
+        self.assertEqual(('ACT', 'ACT'), store.sequences)
+        self.assertEqual(2, len(store))
+
+    def test_should_register_one_store_per_content(self):
+        # setup
+        store = SequencesStore(['seq1', 'seq2'], ['ACTG', 'AG'])
+
+        # run
+        same_store = SequencesStore.register(['seq1', 'seq2'], ['ACTG', 'AG'])
+        other_store = SequencesStore.register(['seq1', 'seq2'], ['ACTG', 'AGG'])
+
+        # check
+        self.assertIs(store, same_store)
+        self.assertIsNot(store, other_store)
+        self.assertIs(store, SequencesStore.get(store.key))
+        self.assertNotEqual(store.key, other_store.key)
+
+    def test_should_copies_be_the_store_itself(self):
+        # setup
+        store = SequencesStore(['seq1'], ['ACTGA'])
+
+        # check
+        self.assertIs(store, copy.copy(store))
+        self.assertIs(store, copy.deepcopy(store))
+        self.assertIs(store, pickle.loads(pickle.dumps(store)))
+
+    def test_should_drop_stores_no_longer_used(self):
+        # setup
+        store = SequencesStore(['seq1'], ['ACTGAC'])
+        key = store.key
+
+        # run
+        del store
+        gc.collect()
+
+        # check
+        self.assertFalse(SequencesStore.is_registered(key))
+
+    def test_should_raise_exception_if_key_is_unknown(self):
+        # check
+        with self.assertRaises(Exception):
+            SequencesStore.get('unknown')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,3 @@
-import copy
 import random
 from typing import List
 
@@ -38,22 +37,22 @@ class SPXMSA(Crossover[List[MSASolution], MSASolution]):
 
             self.has_solution_been_crossed = True
 
-            offspring[0].merge_gaps_groups()
-            offspring[1].merge_gaps_groups()
+            offspring[0].normalize_gaps_groups()
+            offspring[1].normalize_gaps_groups()
 
             if self.remove_full_of_gap_columns:
                 offspring[0].remove_full_of_gaps_columns()
                 offspring[1].remove_full_of_gaps_columns()
         else:
-            offspring = copy.deepcopy(parents)
+            offspring = [parents[0].clone(), parents[1].clone()]
             self.has_solution_been_crossed = False
 
         return offspring
 
     def cross_parents(self, cx_point: int, parents: List[MSASolution], cutting_points_in_first_parent: list,
                       column_positions_in_second_parent: list) -> List[MSASolution]:
-        offspring_1 = copy.deepcopy(parents[0])
-        offspring_2 = copy.deepcopy(parents[1])
+        offspring_1 = parents[0].clone()
+        offspring_2 = parents[1].clone()
 
         for i in range(offspring_1.number_of_variables):
             new_gap_group_list = []
@@ -110,6 +109,9 @@ class SPXMSA(Crossover[List[MSASolution], MSASolution]):
 
                 offspring_2.gaps_groups[i] = new_gap_group_list
 
+        offspring_1.mark_all_columns_dirty()
+        offspring_2.mark_all_columns_dirty()
+
         max_sequence_length = self.find_length_of_the_largest_sequence(offspring_1)
         self.fill_sequences_with_gaps_to_reach_the_max_sequence_length(
             offspring_1, max_sequence_length, cutting_points_in_first_parent)
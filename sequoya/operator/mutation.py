@@ -56,10 +56,18 @@ class ShiftGapGroup(Mutation[S]):
                     random_gaps_group = random.randrange(0, len(gaps_group) - 2, 2)
                     shift_to = -1 if random.randint(0, 1) == 0 else 1
 
+                    first_column = gaps_group[random_gaps_group] + min(shift_to, 0)
+                    last_column = gaps_group[random_gaps_group + 1] + max(shift_to, 0)
+
+                    if first_column < 0:
+                        # a gaps group starting before the sequence displaces all the symbols
+                        solution.mark_all_columns_dirty()
+                    else:
+                        solution.mark_dirty_columns(first_column, last_column)
                     gaps_group[random_gaps_group] += shift_to
                     gaps_group[random_gaps_group + 1] += shift_to
 
-            solution.merge_gaps_groups()
+            solution.normalize_gaps_groups()
 
             if self.remove_full_of_gap_columns:
                 solution.remove_full_of_gaps_columns()
@@ -98,6 +106,13 @@ class ShiftClosedGapGroups(Mutation[S]):
                     right_is_closest = False
 
                     if not right_is_closest:
+                        if gaps_group[random_gaps_group] < 0:
+                            # a gaps group starting before the sequence displaces all the symbols
+                            solution.mark_all_columns_dirty()
+                        else:
+                            solution.mark_dirty_columns(gaps_group[random_gaps_group],
+                                                        gaps_group[random_gaps_group + 3])
+
                         diff = (gaps_group[random_gaps_group + 3] - gaps_group[random_gaps_group + 2]) - \
                                (gaps_group[random_gaps_group + 1] - gaps_group[random_gaps_group])
 
@@ -164,13 +179,20 @@ class TwoRandomAdjacentGapGroup(Mutation[S]):
                 right_is_closest = False
 
                 if not right_is_closest:
+                    if gaps_group[random_gaps_group] < 0:
+                        # a gaps group starting before the sequence displaces all the symbols
+                        solution.mark_all_columns_dirty()
+                    else:
+                        solution.mark_dirty_columns(gaps_group[random_gaps_group + 1] + 1,
+                                                    gaps_group[random_gaps_group + 3])
+
                     to_add = gaps_group[random_gaps_group + 3] - gaps_group[random_gaps_group + 2] + 1
                     gaps_group[random_gaps_group + 1] += to_add
 
                     del gaps_group[random_gaps_group + 3]
                     del gaps_group[random_gaps_group + 2]
 
-            solution.merge_gaps_groups()
+            solution.normalize_gaps_groups()
 
             if self.remove_full_of_gap_columns:
                 solution.remove_full_of_gaps_columns()
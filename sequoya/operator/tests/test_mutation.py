@@ -123,6 +123,23 @@ class ShiftGapGroupTestCases(unittest.TestCase):
         self.assertEqual([[0, 1, 5, 6, 8, 9]], solution.gaps_groups)
         self.assertEqual([('seq1', '--ABC--D--')], solution.decode_alignment_as_list_of_pairs())
 
+    @mock.patch('random.randrange')
+    @mock.patch('random.randint')
+    def test_should_mark_the_shifted_columns_as_dirty(self, random_shift, random_group):
+        # setup
+        msa = MSASolution(self.problem, msa=[('seq1', '--AB--CD--')])
+        msa.reset_dirty_columns()
+        mutation = ShiftGapGroup(probability=1.0, remove_gap_columns=False)
+
+        # run
+        random_group.return_value = 2
+        random_shift.return_value = 0
+        solution = mutation.execute(msa)
+
+        # check
+        self.assertEqual([('seq1', '--A--BCD--')], solution.decode_alignment_as_list_of_pairs())
+        self.assertEqual([(3, 5)], solution.consume_dirty_columns())
+
     @mock.patch('random.randrange')
     @mock.patch('random.randint')
     def test_should_execute_mutation_case_c(self, random_shift, random_group):
@@ -1,15 +1,17 @@
 import logging
 import os
 import random
-from os import listdir
 from typing import List
 
 from pymsa.core.score import Score
-from pymsa.util.fasta import read_fasta_file_as_list_of_pairs
 
-from sequoya.core.solution import MSASolution
+from sequoya.core.solution import MSASolution, SlottedMSASolution, restore_solution
+from sequoya.core.store import SequencesStore
 from sequoya.operator import SPXMSA, TwoRandomAdjacentGapGroup
 from sequoya.problem.MSA import MSA
+from sequoya.util.cache import EvaluationCache, InstanceCache
+from sequoya.util.fasta import read_encoded_fasta_file, read_fasta_file
+from sequoya.util.resources import ResourceIndex
 
 LOGGER = logging.getLogger('Sequoya')
 
@@ -18,7 +20,10 @@ class BAliBASE(MSA):
     DATA_FILES = ['tfa_clu', 'tfa_muscle', 'tfa_kalign', 'tfa_retalign', 'fasta_aln', 'tfa_probcons', 'tfa_mafft',
                   'tfa_fsa']
 
-    def __init__(self, instance: str, path: str, score_list: List[Score], auto_import: bool = True) -> None:
+    def __init__(self, instance: str, path: str, score_list: List[Score], auto_import: bool = True,
+                 compact: bool = False, slotted: bool = False, cache: EvaluationCache = None,
+                 fused: bool = False, incremental: bool = False, column_profile: bool = False,
+                 instance_cache: InstanceCache = None) -> None:
         """
         Creates a new problem based on an instance of BAliBASE.
 
@@ -26,10 +31,24 @@ class BAliBASE(MSA):
         :param path: Path containing two directories: `bb3_aligned`, with the pre-computed alignments and
         `bb3_release`, with the original sequences.
         :param score_list: List of score functions.
+        :param compact: If True, solutions store their gaps groups as arrays of 32-bit ints, which takes less memory
+        but is slower (see :class:`CompactGapsGroup`).
+        :param slotted: If True, solutions are instances of :class:`SlottedMSASolution`, which share the original
+        sequences of the instance instead of keeping their own copy.
+        :param cache: If given, the objectives of evaluated alignments are kept there (see :class:`EvaluationCache`).
+        :param fused: If True, supported scores are computed in a single sweep (see :class:`FusedEvaluator`).
+        :param incremental: If True, scores are fused and only the dirty columns of solutions are scored again.
+        :param column_profile: If True, solutions keep a column profile, from which column counts are taken.
+        :param instance_cache: If given, the parsed instance (along with the objectives of its pre-computed
+        alignments) is kept there, and loaded from it while its files are left unchanged (see :class:`InstanceCache`).
         """
-        super(BAliBASE, self).__init__(score_list)
+        super(BAliBASE, self).__init__(score_list, cache=cache, fused=fused, incremental=incremental,
+                                       column_profile=column_profile)
         self.instance = instance
         self.path = path
+        self.compact = compact
+        self.slotted = slotted
+        self.instance_cache = instance_cache
 
         if auto_import:
             self.import_instance()
@@ -50,44 +69,90 @@ class BAliBASE(MSA):
         return offspring[0]
 
     def import_instance(self) -> List[MSASolution]:
-        bb3_release_path = self._compute_path('bb3_release')
-        assert os.path.isdir(bb3_release_path), 'Instance not found'
+        resources = ResourceIndex.get(self.path)
+        assert self.instance in resources, 'Instance not found'
 
-        msa = read_fasta_file_as_list_of_pairs(f'{bb3_release_path}/{self.instance}.tfa')
-        self.identifiers = list(pair[0] for pair in msa)
-        self.number_of_variables = len(self.identifiers)
-
-        bb3_aligned_path = self._compute_path('bb3_aligned')
+        bb3_aligned_path = os.path.join(self.path, 'bb3_aligned', resources.get_reference_set(self.instance))
         assert os.path.isdir(bb3_aligned_path), 'Instance not found'
 
-        multiple_alignments = []
-        for file in listdir(bb3_aligned_path):
-            name, fmt = file.split('.')
+        # the directory is a source too, so files added to or removed from it invalidate the cached instance
+        sources = [resources.get_release_file(self.instance), bb3_aligned_path]
+        population = self._load_instance(sources) if self.instance_cache is not None else None
+
+        if population is None:
+            population = self._parse_instance(sources, resources.get_aligned_files(self.instance, self.DATA_FILES))
+
+        for index, individual in enumerate(population):
+            LOGGER.info(f'ALN {index}, LEN: {individual.get_length_of_alignment()}, OBJ: {individual.objectives}')
+
+        self.sequences = population
+
+        return population
 
-            if name == self.instance and fmt in self.DATA_FILES:
-                msa = read_fasta_file_as_list_of_pairs(f'{bb3_aligned_path}/{file}')
-                multiple_alignments.append(msa)
+    def _parse_instance(self, sources: list, aligned_files: list) -> List[MSASolution]:
+        release_file, _ = sources
+
+        self.identifiers = list(pair[0] for pair in read_fasta_file(release_file))
+        self.number_of_variables = len(self.identifiers)
+
+        # aligned sequences are encoded while read, so they are never built
+        multiple_alignments = [list(read_encoded_fasta_file(file)) for file in aligned_files]
 
         if len(multiple_alignments) < 2:
             raise Exception('More than one pre-computed MSA is required')
 
+        self.store = SequencesStore.register(self.identifiers, [record[1] for record in multiple_alignments[0]])
+        solution_class = SlottedMSASolution if self.slotted else MSASolution
+
         population = []
         for msa in multiple_alignments:
-            new_individual = MSASolution(self, msa)
+            new_individual = solution_class(self, msa, compact=self.compact, encoded=True)
             population.append(new_individual)
 
         LOGGER.info('Instance imported')
 
-        for index, individual in enumerate(population):
-            self.evaluate(individual)
-            LOGGER.info(f'ALN {index}, LEN: {individual.get_length_of_alignment()}, OBJ: {individual.objectives}')
+        self.evaluate_batch(population)
 
-        self.sequences = population
+        if self.instance_cache is not None:
+            self._save_instance(sources + aligned_files, population)
+
+        return population
+
+    def _load_instance(self, sources: list) -> List[MSASolution]:
+        """ Returns the pre-computed alignments of the instance from the instance cache, or None if it is not there. """
+        entry = self.instance_cache.load(self.instance, sources, InstanceCache.get_scores_key(self.score_list))
+
+        if entry is None:
+            return None
+
+        self.identifiers = entry['identifiers']
+        self.number_of_variables = len(self.identifiers)
+        self.store = SequencesStore.register(self.identifiers, entry['sequences'])
+        solution_class = SlottedMSASolution if self.slotted else MSASolution
+
+        population = [restore_solution(solution_class, self.store.key, (self.compact,) + tuple(packed[1:]),
+                                       [0.0] * self.number_of_objectives) for packed in entry['gaps_groups']]
+
+        LOGGER.info('Instance loaded from cache')
+
+        if entry['objectives'] is None:
+            # the cached objectives were computed with other scores
+            self.evaluate_batch(population)
+            self._save_instance(entry['files'], population)
+        else:
+            for solution, objectives in zip(population, entry['objectives']):
+                fingerprint = solution.get_fingerprint()
+
+                if self.cache is not None:
+                    self.cache.put(self._get_cache_key(solution, fingerprint), objectives)
+
+                self._set_objectives(solution, fingerprint, objectives)
 
         return population
 
-    def _compute_path(self, directory: str) -> str:
-        return os.path.join(self.path, directory, 'RV' + self.instance[2:4] + '/')
+    def _save_instance(self, files: list, population: List[MSASolution]) -> None:
+        self.instance_cache.save(self.instance, files, self.identifiers, list(self.store.sequences), population,
+                                 InstanceCache.get_scores_key(self.score_list))
 
     def get_name(self) -> str:
         return 'BAliBASE v3.0'
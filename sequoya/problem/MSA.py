@@ -1,39 +1,151 @@
-from typing import List
+from typing import Callable, List
 
 from pymsa.core.score import Score
 
+from sequoya.core.alignment import AlignmentBatch
 from sequoya.core.problem import MSAProblem
 from sequoya.core.solution import MSASolution
+from sequoya.core.store import SequencesStore
+from sequoya.score.fused import FusedEvaluator, compute_score_batch
+from sequoya.score.gaps import GapScore
+from sequoya.util.cache import EvaluationCache
 
 
 class MSA(MSAProblem):
 
-    def __init__(self, score_list: List[Score]) -> None:
+    def __init__(self, score_list: List[Score], cache: EvaluationCache = None, fused: bool = False,
+                 incremental: bool = False, column_profile: bool = False) -> None:
         """
         Creates a new MSA problem.
+
+        :param score_list: List of score functions.
+        :param cache: If given, the objectives of evaluated alignments are kept there, so alignments already evaluated
+        are not scored again.
+        :param fused: If True, the scores supported by :class:`FusedEvaluator` are computed in a single sweep over the
+        columns of each alignment.
+        :param incremental: If True, scores are fused and, when a solution is evaluated again, only its dirty columns
+        are scored (see :class:`FusedEvaluator`).
+        :param column_profile: If True, evaluated solutions keep a column profile (see :class:`ColumnProfile`), from
+        which the scores working on column counts are computed.
         """
         super(MSA, self).__init__()
         self.score_list = score_list
+        self.cache = cache
+        # scores depending only on the gaps are computed from the gaps groups, so alignments are not decoded at all
+        self.gaps_only = len(score_list) > 0 and all(isinstance(score, GapScore) for score in score_list)
+
+        self.fused_evaluator = FusedEvaluator(score_list, incremental=incremental) \
+            if (fused or incremental) and not self.gaps_only else None
+        self.column_profile = column_profile and not self.gaps_only
         self.number_of_objectives = len(self.score_list)
 
         self.sequences = []
         self.identifiers: list = []
         self.number_of_sequences = []
+        self.store: SequencesStore = None
 
     def create_solution(self) -> List[MSASolution]:
         raise NotImplementedError()
 
     def evaluate(self, solution: MSASolution) -> MSASolution:
-        solution.remove_full_of_gaps_columns()
-        sequences = solution.decode_alignment_as_list_of_sequences()
+        return self.evaluate_batch([solution])[0]
+
+    def evaluate_batch(self, solutions: List[MSASolution], compute_objectives: Callable = None) -> List[MSASolution]:
+        """
+        Evaluates a list of solutions (e.g., a whole population) at once. Alignments already evaluated (either the
+        solution itself or an alignment in the cache) are not scored again, and identical alignments in the list are
+        scored only once. The remaining ones are decoded together, and each score is computed for all of them in a
+        single call: scores providing `compute_batch(batch)` get an :class:`AlignmentBatch`, returning one value per
+        alignment; otherwise, `compute(sequences)` is called for each alignment. If the problem is fused, the
+        supported scores are computed together instead (see :class:`FusedEvaluator`). Column counts are taken from the
+        column profiles of the solutions, if they keep one. If all the scores are gap scores (see :class:`GapScore`),
+        they are computed from the gaps groups of the solutions, which are not decoded.
+
+        :param compute_objectives: Function returning the objectives of a list of solutions, replacing
+        :meth:`compute_objectives` (e.g., to compute them in other processes, see :class:`ProcessPoolEvaluator`).
+        :return: The list of (evaluated) solutions.
+        """
+        pending = {}
+
+        for solution in solutions:
+            solution.remove_full_of_gaps_columns()
+            fingerprint = solution.get_fingerprint()
+
+            if solution.attributes.get('fingerprint') == fingerprint:
+                # the objectives were computed for this very alignment (e.g., it was copied from an evaluated
+                # solution and left unchanged)
+                solution.reset_dirty_columns()
+                continue
+
+            if fingerprint in pending:
+                pending[fingerprint].append(solution)
+                continue
+
+            objectives = self.cache.get(self._get_cache_key(solution, fingerprint)) if self.cache is not None else None
+
+            if objectives is not None:
+                self._set_objectives(solution, fingerprint, objectives)
+            else:
+                pending[fingerprint] = [solution]
+
+        if pending:
+            if compute_objectives is None:
+                compute_objectives = self.compute_objectives
+
+            objectives_list = compute_objectives([group[0] for group in pending.values()])
+
+            for (fingerprint, group), objectives in zip(pending.items(), objectives_list):
+                if self.cache is not None:
+                    self.cache.put(self._get_cache_key(group[0], fingerprint), objectives)
+
+                for solution in group:
+                    self._set_objectives(solution, fingerprint, objectives)
+
+                    if solution is not group[0] and group[0].get_column_scores() is not None:
+                        solution.set_column_scores(group[0].get_column_scores())
+
+        return solutions
+
+    def compute_objectives(self, solutions: List[MSASolution]) -> list:
+        """ Scores a list of solutions together (see :meth:`evaluate_batch`), without looking them up in the cache nor
+        setting their objectives.
+
+        :return: The objectives of every solution, as tuples.
+        """
+        if self.column_profile:
+            for solution in solutions:
+                solution.get_column_profile()
+
+        batch = AlignmentBatch(solutions)
+        objectives_list = list(zip(*self._compute_scores(batch)))
+
+        for alignment in batch:
+            if alignment.column_scores is not None:
+                # the column scores describe the current alignment
+                alignment.solution.reset_dirty_columns()
+                alignment.solution.set_column_scores(alignment.column_scores)
+
+        return objectives_list
+
+    def _compute_scores(self, batch: AlignmentBatch) -> list:
+        if self.fused_evaluator is not None:
+            values = self.fused_evaluator.compute_batch(batch)
+        else:
+            values = [compute_score_batch(score, batch) for score in self.score_list]
 
-        for i, score in enumerate(self.score_list):
-            solution.objectives[i] = score.compute(sequences)
+        return [values_of_score if score.is_minimization() else [-value for value in values_of_score]
+                for score, values_of_score in zip(self.score_list, values)]
 
-            if not score.is_minimization():
-                solution.objectives[i] = -solution.objectives[i]
+    @staticmethod
+    def _get_cache_key(solution: MSASolution, fingerprint: int) -> tuple:
+        # fingerprints only tell the layout of the gaps, which may be the same in alignments of other instances
+        return solution.get_instance_key(), fingerprint
 
-        return solution
+    @staticmethod
+    def _set_objectives(solution: MSASolution, fingerprint: int, objectives) -> None:
+        solution.objectives[:] = objectives
+        solution.attributes['fingerprint'] = fingerprint
+        solution.reset_dirty_columns()
 
     def get_name(self) -> str:
         return 'Multiple Sequence Alignment problem'
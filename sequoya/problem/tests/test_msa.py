@@ -0,0 +1,183 @@
+import unittest
+from unittest import mock
+
+from pymsa.core.score import SumOfPairs, PercentageOfNonGaps
+
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+from sequoya.util.cache import EvaluationCache
+
+
+class MSATestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = MSA(score_list=[SumOfPairs()])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+
+    def test_should_evaluate_solution(self):
+        # setup
+        msa = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+
+        # run
+        self.problem.evaluate(msa)
+
+        # check
+        self.assertEqual([-SumOfPairs().compute(['AC-TG-AC', 'A-CTGA-C'])], msa.objectives)
+        self.assertFalse(msa.has_dirty_columns())
+
+    def test_should_not_score_again_an_unchanged_alignment(self):
+        # setup
+        msa = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        self.problem.evaluate(msa)
+        objectives = list(msa.objectives)
+
+        # run
+        with mock.patch.object(SumOfPairs, 'compute') as compute:
+            clone = self.problem.evaluate(msa.clone())
+
+        # check
+        compute.assert_not_called()
+        self.assertEqual(objectives, clone.objectives)
+
+    def test_should_score_again_a_changed_alignment(self):
+        # setup
+        msa = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        self.problem.evaluate(msa)
+
+        # run
+        msa.remove_gap_from_sequence(seq_index=1, position=1)
+        msa.add_gap_to_sequence_at_index(seq_index=1, gap_position=2)
+        self.problem.evaluate(msa)
+
+        # check
+        self.assertEqual(['ACTG-AC', 'ACTGA-C'], msa.decode_alignment_as_list_of_sequences())
+        self.assertEqual([-SumOfPairs().compute(['ACTG-AC', 'ACTGA-C'])], msa.objectives)
+
+    def test_should_evaluate_a_batch_of_solutions(self):
+        # setup
+        msa_1 = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        msa_2 = MSASolution(self.problem, msa=[('seq1', 'ACTG-AC'), ('seq2', 'ACTGA-C')])
+
+        # run
+        solutions = self.problem.evaluate_batch([msa_1, msa_2])
+
+        # check
+        self.assertEqual([msa_1, msa_2], solutions)
+        self.assertEqual([-SumOfPairs().compute(['AC-TG-AC', 'A-CTGA-C'])], msa_1.objectives)
+        self.assertEqual([-SumOfPairs().compute(['ACTG-AC', 'ACTGA-C'])], msa_2.objectives)
+
+    def test_should_score_identical_alignments_of_a_batch_once(self):
+        # setup
+        msa = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        other_msa = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+
+        # run
+        with mock.patch.object(SumOfPairs, 'compute', return_value=10) as compute:
+            self.problem.evaluate_batch([msa, other_msa])
+
+        # check
+        compute.assert_called_once()
+        self.assertEqual([-10], msa.objectives)
+        self.assertEqual([-10], other_msa.objectives)
+
+    def test_should_use_batch_scores_on_the_whole_batch(self):
+        # setup
+        score = mock.Mock()
+        score.is_minimization.return_value = True
+        score.compute_batch.side_effect = lambda batch: batch.lengths.tolist()
+        problem = MSA(score_list=[score])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa_1 = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        msa_2 = MSASolution(problem, msa=[('seq1', 'ACTG-AC'), ('seq2', 'ACTGA-C')])
+
+        # run
+        problem.evaluate_batch([msa_1, msa_2])
+
+        # check
+        score.compute_batch.assert_called_once()
+        score.compute.assert_not_called()
+        self.assertEqual([8], msa_1.objectives)
+        self.assertEqual([7], msa_2.objectives)
+
+    def test_should_evaluate_fused_scores_with_the_sign_of_maximization_scores_flipped(self):
+        # setup
+        problem = MSA(score_list=[SumOfPairs(), PercentageOfNonGaps()], fused=True)
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+
+        # run
+        problem.evaluate(msa)
+
+        # check
+        self.assertEqual([-SumOfPairs().compute(['AC-TG-AC', 'A-CTGA-C']),
+                          PercentageOfNonGaps().compute(['AC-TG-AC', 'A-CTGA-C'])], msa.objectives)
+
+    def test_should_compute_scores_from_the_column_profile_of_solutions(self):
+        # setup
+        problem = MSA(score_list=[SumOfPairs(), PercentageOfNonGaps()], fused=True, column_profile=True)
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+
+        # run
+        with mock.patch.object(MSASolution, 'decode_alignment_as_array',
+                               wraps=msa.decode_alignment_as_array) as decode_alignment_as_array:
+            problem.evaluate(msa)
+            msa.add_gap_to_sequence_at_index(seq_index=0, gap_position=8)
+            msa.add_gap_to_sequence_at_index(seq_index=1, gap_position=7)
+            problem.evaluate(msa)
+
+        # check
+        self.assertEqual(1, decode_alignment_as_array.call_count)
+        self.assertTrue(msa.has_column_profile())
+        self.assertEqual([-SumOfPairs().compute(['AC-TG-AC-', 'A-CTGA--C']),
+                          PercentageOfNonGaps().compute(['AC-TG-AC-', 'A-CTGA--C'])], msa.objectives)
+
+    def test_should_take_objectives_of_evaluated_alignments_from_the_cache(self):
+        # setup
+        problem = MSA(score_list=[SumOfPairs()], cache=EvaluationCache(max_entries=10))
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        problem.evaluate(msa)
+
+        # run
+        other_msa = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        with mock.patch.object(SumOfPairs, 'compute') as compute:
+            problem.evaluate(other_msa)
+
+        # check
+        compute.assert_not_called()
+        self.assertEqual(msa.objectives, other_msa.objectives)
+        self.assertEqual(1, problem.cache.hits)
+        self.assertEqual(1, problem.cache.misses)
+
+    def test_should_not_take_objectives_of_alignments_of_other_instances_from_the_cache(self):
+        # setup
+        cache = EvaluationCache(max_entries=10)
+        problem = MSA(score_list=[SumOfPairs()], cache=cache)
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=[('seq1', 'ACTG'), ('seq2', 'ACTG')])
+        problem.evaluate(msa)
+
+        other_problem = MSA(score_list=[SumOfPairs()], cache=cache)
+        other_problem.identifiers = ['seq1', 'seq2']
+        other_problem.number_of_variables = 2
+
+        # run
+        other_msa = MSASolution(other_problem, msa=[('seq1', 'WWWW'), ('seq2', 'WWWW')])
+        other_problem.evaluate(other_msa)
+
+        # check
+        self.assertEqual(msa.get_fingerprint(), other_msa.get_fingerprint())
+        self.assertEqual([-SumOfPairs().compute(['WWWW', 'WWWW'])], other_msa.objectives)
+        self.assertNotEqual(msa.objectives, other_msa.objectives)
+        self.assertEqual(2, cache.misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
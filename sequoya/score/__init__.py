@@ -0,0 +1,6 @@
+from .gaps import AffineGapPenalty, GapScore, NumberOfGapGroups
+from .sum_of_pairs import SumOfPairs
+
+__all__ = [
+    'AffineGapPenalty', 'GapScore', 'NumberOfGapGroups', 'SumOfPairs'
+]
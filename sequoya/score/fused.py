@@ -0,0 +1,177 @@
+from typing import List
+
+import numpy as np
+from pymsa.core import score
+from pymsa.core.score import Score
+
+from sequoya.core.alignment import AlignmentBatch, AlignmentView, ColumnCounts
+from sequoya.score.sum_of_pairs import SumOfPairs
+
+
+def compute_score_batch(score: Score, batch: AlignmentBatch) -> list:
+    """ Computes a score for every alignment of a batch, with a single call if the score provides `compute_batch`. """
+    compute_batch = getattr(score, 'compute_batch', None)
+
+    if compute_batch is not None:
+        return list(compute_batch(batch))
+
+    return [score.compute(alignment.sequences) for alignment in batch]
+
+
+class ColumnScore:
+    """ Computes a score from the column counts of an alignment, as the reduction of a contribution per column. """
+
+    def __init__(self, score: Score) -> None:
+        self.score = score
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        raise NotImplementedError()
+
+    def reduce(self, column_scores: np.ndarray, number_of_sequences: int):
+        raise NotImplementedError()
+
+    def compute(self, column_counts: ColumnCounts):
+        return self.reduce(self.get_column_scores(column_counts), column_counts.number_of_sequences)
+
+
+class SumOfPairsColumnScore(ColumnScore):
+
+    def __init__(self, score: Score) -> None:
+        super(SumOfPairsColumnScore, self).__init__(score)
+        self.sum_of_pairs = score if isinstance(score, SumOfPairs) else SumOfPairs(score.substitution_matrix)
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        return self.sum_of_pairs.get_column_scores(column_counts)
+
+    def reduce(self, column_scores: np.ndarray, number_of_sequences: int) -> int:
+        return int(column_scores.sum())
+
+
+class TotallyConservedColumnsColumnScore(ColumnScore):
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        return (column_counts.counts == column_counts.number_of_sequences).any(axis=1)
+
+    def reduce(self, column_scores: np.ndarray, number_of_sequences: int) -> float:
+        return int(column_scores.sum()) / len(column_scores) * 100
+
+
+class EntropyColumnScore(ColumnScore):
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        frequencies = column_counts.counts / column_counts.number_of_sequences
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(column_counts.counts > 0, frequencies * np.log(frequencies), 0.0).sum(axis=1)
+
+    def reduce(self, column_scores: np.ndarray, number_of_sequences: int) -> float:
+        return float(column_scores.sum())
+
+
+class NonGapsColumnScore(ColumnScore):
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        return column_counts.get_counts_of('-')
+
+    def reduce(self, column_scores: np.ndarray, number_of_sequences: int) -> float:
+        return 100 - (int(column_scores.sum()) / (len(column_scores) * number_of_sequences) * 100)
+
+
+# scores are matched by their exact type, as subclasses may compute them in a different way
+COLUMN_SCORES = {
+    score.SumOfPairs: SumOfPairsColumnScore,
+    SumOfPairs: SumOfPairsColumnScore,
+    score.PercentageOfTotallyConservedColumns: TotallyConservedColumnsColumnScore,
+    score.Entropy: EntropyColumnScore,
+    score.PercentageOfNonGaps: NonGapsColumnScore
+}
+
+
+def get_column_score(score: Score) -> ColumnScore:
+    """ Returns the column score computing a score, or None if it is not supported. """
+    column_score = COLUMN_SCORES.get(type(score))
+
+    return column_score(score) if column_score is not None else None
+
+
+class FusedEvaluator:
+    """
+    Computes a list of scores in a single sweep over the columns of each alignment: the symbols of every column are
+    counted once (see :class:`ColumnCounts`) and all the supported scores (the ones in `COLUMN_SCORES`: sum-of-pairs,
+    totally conserved columns, entropy and percentage of non-gaps) are derived from those counts. Any other score is
+    computed on its own, as :meth:`MSA.evaluate_batch` would do.
+
+    Values are the same as the ones of the pyMSA scores, except for the entropy, which may differ in the last digits
+    as its terms are added in a different order.
+
+    If `incremental` is True, the per-column contributions to the supported scores are left in the views of the
+    alignments (to be stored in their solutions), and the next evaluation of a solution only counts and scores its
+    dirty columns, taking the rest from its previous contributions. If `verify` is also True, every incremental
+    result is checked against a full computation (which is meant for debugging, as it makes the evaluation slower).
+    """
+
+    def __init__(self, score_list: List[Score], incremental: bool = False, verify: bool = False) -> None:
+        self.score_list = score_list
+        self.column_scores = [get_column_score(score) for score in score_list]
+        self.incremental = incremental
+        self.verify = verify
+
+    def is_fused(self, index: int) -> bool:
+        return self.column_scores[index] is not None
+
+    def compute_batch(self, batch: AlignmentBatch) -> list:
+        """ Returns, for each score (in the order of the list), its value for every alignment of the batch. """
+        values = [[] if self.is_fused(i) else compute_score_batch(score, batch)
+                  for i, score in enumerate(self.score_list)]
+
+        for alignment in batch:
+            column_scores = self._get_column_scores(alignment)
+
+            for i, values_of_columns in column_scores.items():
+                values[i].append(self.column_scores[i].reduce(values_of_columns, alignment.number_of_sequences))
+
+            if self.incremental:
+                alignment.column_scores = column_scores
+
+        return values
+
+    def _get_column_scores(self, alignment: AlignmentView) -> dict:
+        """ Returns the per-column contributions to the supported scores, by index of the score in the list. """
+        fused = {i: column_score for i, column_score in enumerate(self.column_scores) if column_score is not None}
+        previous = alignment.solution.get_column_scores() if self.incremental else None
+        dirty_columns = alignment.solution.dirty_columns
+
+        if not fused:
+            return {}
+
+        if previous is None or dirty_columns.is_all() or not all(i in previous for i in fused):
+            return {i: column_score.get_column_scores(alignment.counts) for i, column_score in fused.items()}
+
+        length = alignment.length
+        previous = {i: dirty_columns.apply_removals(previous[i]) for i in fused}
+        kept = min([length] + [len(values) for values in previous.values()])
+
+        # dirty columns plus the ones added since the previous evaluation
+        columns = dirty_columns.get_columns(length, kept)
+        column_counts = alignment.get_column_counts(columns)
+
+        column_scores = {}
+        for i, column_score in fused.items():
+            values = np.empty(length, dtype=previous[i].dtype)
+            values[:kept] = previous[i][:kept]
+            values[columns] = column_score.get_column_scores(column_counts)
+            column_scores[i] = values
+
+        if self.verify:
+            self._verify(alignment, column_scores)
+
+        return column_scores
+
+    def _verify(self, alignment: AlignmentView, column_scores: dict) -> None:
+        for i, values in column_scores.items():
+            expected = self.column_scores[i].get_column_scores(alignment.counts)
+
+            if len(values) != len(expected) or not np.allclose(values, expected, rtol=0, atol=1e-9):
+                columns = np.flatnonzero(values != expected) if len(values) == len(expected) else []
+                raise Exception('The incremental column scores of {0} differ from a full computation at columns '
+                                '{1}'.format(self.score_list[i].get_name(), list(columns)))
@@ -0,0 +1,87 @@
+import re
+
+from pymsa.core.score import Score
+
+from sequoya.core.alignment import AlignmentBatch
+
+
+class GapScore(Score):
+    """
+    Score depending only on the blocks of gaps (maximal runs of gaps) of the aligned sequences. It is computed straight
+    from the gaps groups of solutions (see :meth:`BaseMSASolution.get_gaps_blocks`), in time linear in their number,
+    so alignments are never decoded; `compute(sequences)` gives the same values from aligned sequences, as any pyMSA
+    score.
+
+    Blocks are scored on their own by :meth:`score_blocks`, given as (number of symbols before the block, length of
+    the block) pairs. Terminal blocks (the ones before the first symbol or after the last one of a sequence) are left
+    out if `terminal_gaps` is False.
+    """
+
+    GAP_CHARACTER = '-'
+
+    def __init__(self, terminal_gaps: bool = True) -> None:
+        super(GapScore, self).__init__()
+        self.terminal_gaps = terminal_gaps
+
+    def evaluate(self, align_sequences: list):
+        value = 0
+
+        for sequence in align_sequences:
+            gaps_blocks, gaps = [], 0
+            for match in re.finditer(self.GAP_CHARACTER + '+', sequence):
+                gaps_blocks.append((match.start() - gaps, match.end() - match.start()))
+                gaps += match.end() - match.start()
+
+            value += self.score_blocks(self._filter_blocks(gaps_blocks, len(sequence) - gaps))
+
+        return value
+
+    def compute_solution(self, solution):
+        """ Computes the score of the alignment of a solution from its gaps groups. """
+        if not solution.is_valid_msa():
+            raise Exception("All the sequences in the FASTA file must be aligned!")
+
+        value = 0
+
+        for i in range(solution.number_of_variables):
+            gaps_blocks = solution.get_gaps_blocks(i)
+            value += self.score_blocks(self._filter_blocks(gaps_blocks, len(solution.variables[i])))
+
+        return value
+
+    def compute_batch(self, batch: AlignmentBatch) -> list:
+        """ Scores every alignment of a batch (see :meth:`MSA.evaluate_batch`) without decoding them. """
+        return [self.compute_solution(alignment.solution) for alignment in batch]
+
+    def score_blocks(self, gaps_blocks: list):
+        raise NotImplementedError()
+
+    def _filter_blocks(self, gaps_blocks: list, number_of_symbols: int) -> list:
+        if self.terminal_gaps:
+            return gaps_blocks
+
+        return [(symbols_before, length) for symbols_before, length in gaps_blocks
+                if 0 < symbols_before < number_of_symbols]
+
+    @staticmethod
+    def is_minimization() -> bool:
+        return True
+
+
+class AffineGapPenalty(GapScore):
+    """ Sum over all the blocks of gaps of `gap_open` plus `gap_extension` for every gap after the first one. """
+
+    def __init__(self, gap_open: int = 10, gap_extension: int = 1, terminal_gaps: bool = True) -> None:
+        super(AffineGapPenalty, self).__init__(terminal_gaps)
+        self.gap_open = gap_open
+        self.gap_extension = gap_extension
+
+    def score_blocks(self, gaps_blocks: list):
+        return sum(self.gap_open + self.gap_extension * (length - 1) for _, length in gaps_blocks)
+
+
+class NumberOfGapGroups(GapScore):
+    """ Number of blocks of gaps of the alignment. """
+
+    def score_blocks(self, gaps_blocks: list) -> int:
+        return len(gaps_blocks)
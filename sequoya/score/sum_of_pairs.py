@@ -0,0 +1,93 @@
+from itertools import combinations
+
+import numpy as np
+from pymsa.core.score import Score
+from pymsa.core.substitution_matrix import SubstitutionMatrix, PAM250
+
+from sequoya.core.alignment import AlignmentBatch, ColumnCounts
+
+
+class SumOfPairs(Score):
+    """
+    Sum-of-pairs score computed from the residue counts of each column instead of comparing every pair of sequences.
+    Given the counts `c` of the symbols of a column and the matrix `S` of their substitution scores, the score of the
+    column is (c·S·c - c·diag(S)) / 2, so an alignment is scored in O(L·N + L·|Σ|²) rather than O(L·N²).
+
+    Values are identical to those of pyMSA's `SumOfPairs` with the same substitution matrix (including the score of
+    pairs of gaps, 1, and of a gap and a symbol, the gap penalty), and so are the errors raised for pairs of symbols
+    not found in the matrix.
+    """
+
+    def __init__(self, substitution_matrix: SubstitutionMatrix = PAM250()):
+        super(SumOfPairs, self).__init__()
+        self.substitution_matrix = substitution_matrix
+
+        gap_character = substitution_matrix.gap_character
+        symbols = sorted({char for pair in substitution_matrix.get_distance_matrix() for char in pair} |
+                         {gap_character})
+
+        # slots 0..k-1 are the symbols of the matrix and slot k is shared by any other symbol
+        size = len(symbols) + 1
+        self._slots = np.full(256, size - 1, dtype=np.intp)
+        self._scores = np.zeros((size, size), dtype=np.int64)
+        self._valid = np.ones((size, size), dtype=bool)
+
+        for i, char_a in enumerate(symbols):
+            self._slots[ord(char_a)] = i
+
+            for j, char_b in enumerate(symbols):
+                try:
+                    self._scores[i, j] = self.get_score_of_two_chars(substitution_matrix, char_a, char_b)
+                except Exception:
+                    self._valid[i, j] = False
+
+        # other symbols are only scored against gaps
+        gap, other = self._slots[ord(gap_character)], size - 1
+        self._valid[other, :] = self._valid[:, other] = False
+        self._valid[other, gap] = self._valid[gap, other] = True
+        self._scores[other, gap] = self._scores[gap, other] = int(substitution_matrix.gap_penalty)
+
+    def evaluate(self, align_sequences: list) -> int:
+        matrix = np.frombuffer(''.join(align_sequences).encode('ascii'), dtype=np.uint8)
+
+        return self.compute_columns(matrix.reshape(len(align_sequences), -1).T)
+
+    def compute_batch(self, batch: AlignmentBatch) -> list:
+        """ Scores every alignment of a batch, see :meth:`MSA.evaluate_batch`. """
+        return [self.compute_counts(alignment.counts) for alignment in batch]
+
+    def compute_columns(self, columns: np.ndarray) -> int:
+        """ Scores an alignment given as a L x N matrix of ASCII codes, one row per column. """
+        return self.compute_counts(ColumnCounts(columns))
+
+    def compute_counts(self, column_counts: ColumnCounts) -> int:
+        return int(self.get_column_scores(column_counts).sum())
+
+    def get_column_scores(self, column_counts: ColumnCounts) -> np.ndarray:
+        """ Returns the score of every column of an alignment. """
+        slots = self._slots[column_counts.symbols]
+        scores = self._scores[np.ix_(slots, slots)]
+        counts = column_counts.counts
+
+        self._check_pairs(column_counts, ~self._valid[np.ix_(slots, slots)])
+
+        return (((counts @ scores) * counts).sum(axis=1) - counts @ scores.diagonal()) // 2
+
+    def _check_pairs(self, column_counts: ColumnCounts, invalid: np.ndarray) -> None:
+        if not invalid.any():
+            return
+
+        counts = column_counts.counts
+        present = counts > 0
+        pairs = present[:, :, np.newaxis] & present[:, np.newaxis, :]
+        diagonal = np.arange(len(invalid))
+        pairs[:, diagonal, diagonal] = counts > 1
+
+        for column in np.flatnonzero((pairs & invalid).any(axis=(1, 2)))[:1]:
+            # scoring the pairs of symbols of the column raises the error
+            for char_a, char_b in combinations(column_counts.get_column(column).tobytes().decode('ascii'), 2):
+                self.get_score_of_two_chars(self.substitution_matrix, char_a, char_b)
+
+    @staticmethod
+    def is_minimization() -> bool:
+        return False
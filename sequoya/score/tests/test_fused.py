@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+
+from pymsa.core import score
+
+from sequoya.core.alignment import AlignmentBatch, ColumnCounts
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+from sequoya.score import SumOfPairs
+from sequoya.score.fused import FusedEvaluator, get_column_score
+
+
+class FusedEvaluatorTestCases(unittest.TestCase):
+
+    def setUp(self):
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2', 'seq3']
+        problem.number_of_variables = 3
+        self.sequences = ['AC--TGAC', 'AT-CT--C', 'AACT--GC']
+        self.msa = MSASolution(problem, msa=list(zip(problem.identifiers, self.sequences)))
+
+    def test_should_count_the_symbols_of_every_column(self):
+        # run
+        column_counts = self.msa.get_alignment_view().counts
+
+        # check
+        self.assertEqual(b'-ACGT', column_counts.symbols.tobytes())
+        self.assertEqual([0, 3, 0, 0, 0], column_counts.counts[0].tolist())
+        self.assertEqual([0, 1, 1, 0, 1], column_counts.counts[1].tolist())
+        self.assertEqual([0, 0, 2, 1, 1, 2, 1, 0], column_counts.get_counts_of('-').tolist())
+        self.assertEqual([0] * 8, column_counts.get_counts_of('W').tolist())
+
+    def test_should_compute_supported_scores_as_pymsa(self):
+        # setup
+        score_list = [score.SumOfPairs(), score.PercentageOfTotallyConservedColumns(), score.PercentageOfNonGaps()]
+        fused_evaluator = FusedEvaluator(score_list)
+
+        # run
+        values = fused_evaluator.compute_batch(AlignmentBatch([self.msa]))
+
+        # check
+        self.assertEqual([[score_function.compute(self.sequences)] for score_function in score_list], values)
+
+    def test_should_compute_the_entropy_as_pymsa(self):
+        # run
+        value = get_column_score(score.Entropy()).compute(ColumnCounts(self.msa.get_alignment_view().columns))
+
+        # check
+        self.assertAlmostEqual(score.Entropy().compute(self.sequences), value)
+
+    def test_should_compute_unsupported_scores_on_their_own(self):
+        # setup
+        fused_evaluator = FusedEvaluator([score.Star(), score.SumOfPairs()])
+
+        # run
+        with mock.patch.object(score.SumOfPairs, 'compute') as compute:
+            values = fused_evaluator.compute_batch(AlignmentBatch([self.msa]))
+
+        # check
+        compute.assert_not_called()
+        self.assertFalse(fused_evaluator.is_fused(0))
+        self.assertTrue(fused_evaluator.is_fused(1))
+        self.assertEqual([[score.Star().compute(self.sequences)], [score.SumOfPairs().compute(self.sequences)]],
+                         values)
+
+    def test_should_only_score_the_dirty_columns_of_evaluated_solutions(self):
+        # setup
+        problem = MSA(score_list=[score.SumOfPairs(), score.PercentageOfNonGaps()], incremental=True)
+        problem.fused_evaluator.verify = True
+        problem.evaluate(self.msa)
+
+        for seq_index, gap_position in enumerate([6, 7, 8]):
+            self.msa.add_gap_to_sequence_at_index(seq_index, gap_position)
+
+        # run
+        with mock.patch.object(SumOfPairs, 'get_column_scores', autospec=True,
+                               side_effect=SumOfPairs.get_column_scores) as get_column_scores:
+            problem.evaluate(self.msa)
+
+        # check
+        sequences = self.msa.decode_alignment_as_list_of_sequences()
+        self.assertEqual(3, get_column_scores.call_args_list[0][0][1].length)
+        self.assertEqual([-score.SumOfPairs().compute(sequences), score.PercentageOfNonGaps().compute(sequences)],
+                         self.msa.objectives)
+        self.assertEqual(9, len(self.msa.get_column_scores()[0]))
+
+    def test_should_not_fuse_subclasses_of_supported_scores(self):
+        # setup
+        class OtherScore(score.SumOfPairs):
+            pass
+
+        # run
+        column_score = get_column_score(OtherScore())
+
+        # check
+        self.assertIsNone(column_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+from sequoya.score import AffineGapPenalty, NumberOfGapGroups
+
+
+class GapScoreTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = MSA(score_list=[])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+        self.sequences = ['AC--TG-AC', '-ACT-GAC-']
+        self.msa = MSASolution(self.problem, msa=list(zip(self.problem.identifiers, self.sequences)))
+
+    def test_should_compute_the_number_of_gap_groups(self):
+        # check
+        self.assertEqual(5, NumberOfGapGroups().compute(self.sequences))
+        self.assertEqual(5, NumberOfGapGroups().compute_solution(self.msa))
+        self.assertEqual(3, NumberOfGapGroups(terminal_gaps=False).compute(self.sequences))
+        self.assertEqual(3, NumberOfGapGroups(terminal_gaps=False).compute_solution(self.msa))
+
+    def test_should_compute_the_affine_gap_penalty(self):
+        # check
+        self.assertEqual(51, AffineGapPenalty(gap_open=10, gap_extension=1).compute(self.sequences))
+        self.assertEqual(51, AffineGapPenalty(gap_open=10, gap_extension=1).compute_solution(self.msa))
+        self.assertEqual(31, AffineGapPenalty(terminal_gaps=False).compute(self.sequences))
+        self.assertEqual(31, AffineGapPenalty(terminal_gaps=False).compute_solution(self.msa))
+
+    def test_should_merge_touching_gaps_groups_into_one_block(self):
+        # setup
+        self.msa.gaps_groups[0] = [2, 2, 3, 3, 6, 6]
+
+        # run
+        value = AffineGapPenalty(gap_open=10, gap_extension=1).compute_solution(self.msa)
+
+        # check
+        self.assertEqual(51, value)
+
+    def test_should_raise_exception_if_sequences_are_not_aligned(self):
+        # setup
+        self.msa.gaps_groups[0] = [2, 3]
+
+        # check
+        with self.assertRaises(Exception):
+            NumberOfGapGroups().compute_solution(self.msa)
+
+    def test_should_not_decode_alignments_if_all_scores_are_gap_scores(self):
+        # setup
+        problem = MSA(score_list=[AffineGapPenalty(), NumberOfGapGroups(terminal_gaps=False)], fused=True,
+                      column_profile=True)
+        problem.identifiers = self.problem.identifiers
+        problem.number_of_variables = 2
+        msa = MSASolution(problem, msa=list(zip(problem.identifiers, self.sequences)))
+
+        # run
+        with mock.patch.object(MSASolution, 'decode_alignment_as_list_of_sequences') as decode_as_sequences, \
+                mock.patch.object(MSASolution, 'decode_alignment_as_array') as decode_as_array:
+            problem.evaluate(msa)
+
+        # check
+        decode_as_sequences.assert_not_called()
+        decode_as_array.assert_not_called()
+        self.assertEqual([51, 3], msa.objectives)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from pymsa.core import score
+from pymsa.core.substitution_matrix import Blosum62
+
+from sequoya.core.alignment import AlignmentBatch
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+from sequoya.score import SumOfPairs
+
+
+class SumOfPairsTestCases(unittest.TestCase):
+
+    def test_should_score_gaps_as_pymsa(self):
+        # setup
+        sum_of_pairs = SumOfPairs()
+
+        # run
+        value = sum_of_pairs.compute(['A-', 'A-', '--'])
+
+        # check
+        self.assertEqual(2 - 8 * 2 + 1 * 3, value)
+        self.assertFalse(sum_of_pairs.is_minimization())
+
+    def test_should_return_the_same_values_as_pymsa(self):
+        # setup
+        random.seed(1)
+        alignments = [[''.join(random.choice('ACDEWXY---') for _ in range(length)) for _ in range(size)]
+                      for size, length in zip(range(1, 30), range(0, 60, 2))]
+
+        for substitution_matrix in [Blosum62(), None]:
+            if substitution_matrix is None:
+                expected_score, native_score = score.SumOfPairs(), SumOfPairs()
+            else:
+                expected_score, native_score = score.SumOfPairs(substitution_matrix), SumOfPairs(substitution_matrix)
+
+            for sequences in alignments:
+                # run
+                value = native_score.compute(sequences)
+
+                # check
+                self.assertEqual(expected_score.compute(sequences), value)
+
+    def test_should_score_every_alignment_of_a_batch(self):
+        # setup
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+        msa_1 = MSASolution(problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        msa_2 = MSASolution(problem, msa=[('seq1', 'ACTG-AC'), ('seq2', 'ACTGA-C')])
+
+        # run
+        values = SumOfPairs().compute_batch(AlignmentBatch([msa_1, msa_2]))
+
+        # check
+        self.assertEqual([score.SumOfPairs().compute(['AC-TG-AC', 'A-CTGA-C']),
+                          score.SumOfPairs().compute(['ACTG-AC', 'ACTGA-C'])], values)
+
+    def test_should_raise_an_exception_if_a_pair_of_symbols_is_not_in_the_matrix(self):
+        # run
+        with self.assertRaises(Exception) as context:
+            SumOfPairs().compute(['AJ', 'AJ'])
+
+        # check
+        self.assertEqual('The pair (J,J) couldn\'t be found in the substitution matrix', str(context.exception))
+
+    def test_should_score_symbols_not_in_the_matrix_against_gaps(self):
+        # run
+        value = SumOfPairs().compute(['J-', '-J'])
+
+        # check
+        self.assertEqual(-16, value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import hashlib
+import os
+import pickle
+import sys
+import uuid
+import weakref
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EvaluationCache:
+    """
+    Objectives of already evaluated alignments, keyed by the key of their instance and their fingerprint (see
+    `MSASolution.get_instance_key` and `MSASolution.get_fingerprint`), so a cache may be shared by problems of
+    different instances. The cache is bounded by a number of entries and, optionally, by an (approximated) size in
+    bytes; when full, the least recently used entries are evicted.
+
+    Caches are local to each process: when a cache is unpickled (e.g., in a Dask worker, along with the problem
+    holding it), the cache with the same identifier in that process is returned, or a new empty one is created. Thus
+    every worker keeps its own cache from one task to the next, as long as something there (e.g., a problem scattered
+    to the workers) holds it: the caches of a process are only tracked by weak references, so they are released with
+    the problems using them.
+    """
+
+    # approximated overhead of an entry in the underlying ordered dict
+    ENTRY_OVERHEAD = 100
+
+    _caches = weakref.WeakValueDictionary()
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = None, cache_id: str = None) -> None:
+        """
+        :param max_entries: Maximum number of entries.
+        :param max_bytes: Maximum size in bytes (approximated) of the entries, if any.
+        :param cache_id: Identifier shared by the copies of this cache in other processes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_id = cache_id if cache_id else uuid.uuid4().hex
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_in_bytes = 0
+
+        self._entries = OrderedDict()
+        self._caches.setdefault(self.cache_id, self)
+
+    @classmethod
+    def get_process_cache(cls, cache_id: str, max_entries: int, max_bytes: int) -> 'EvaluationCache':
+        """ Returns the cache of this process with the given identifier, creating it if needed. """
+        cache = cls._caches.get(cache_id)
+
+        if cache is None:
+            cache = cls(max_entries, max_bytes, cache_id)
+
+        return cache
+
+    def get(self, key) -> list:
+        """ Returns the objectives of an alignment, given its key (a pair with the key of its instance and its
+        fingerprint), or None if it is not in the cache. """
+        objectives = self._entries.get(key)
+
+        if objectives is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        return objectives
+
+    def put(self, key, objectives: list) -> None:
+        if key in self._entries:
+            self.size_in_bytes -= self._get_entry_size(key, self._entries[key])
+            self._entries.move_to_end(key)
+
+        objectives = tuple(objectives)
+        self._entries[key] = objectives
+        self.size_in_bytes += self._get_entry_size(key, objectives)
+
+        while len(self._entries) > self.max_entries or \
+                (self.max_bytes is not None and self.size_in_bytes > self.max_bytes and len(self._entries) > 1):
+            evicted_key, evicted_objectives = self._entries.popitem(last=False)
+            self.size_in_bytes -= self._get_entry_size(evicted_key, evicted_objectives)
+            self.evictions += 1
+
+    def _get_entry_size(self, key, objectives: tuple) -> int:
+        # the key of the instance is shared by all the entries of that instance, so it is not counted
+        return self.ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(objectives) + \
+               sum(sys.getsizeof(objective) for objective in objectives) + \
+               (sys.getsizeof(key[-1]) if isinstance(key, tuple) else 0)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_in_bytes = 0
+
+    def get_hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_statistics(self) -> dict:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.get_hit_rate(),
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_in_bytes': self.size_in_bytes}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(self):
+        return self.get_process_cache, (self.cache_id, self.max_entries, self.max_bytes)
+
+
+class InstanceCache:
+    """
+    Parsed instances of a problem kept on disk, so they are loaded again without reading (and scoring) their files.
+    Every instance is a `.npz` file in `directory` holding its identifiers and original sequences, the gaps groups of
+    its pre-computed alignments (see :meth:`BaseMSASolution.pack_gaps_groups`) and their objectives, along with the
+    key of the scores they were computed with (see :meth:`get_scores_key`).
+
+    An entry is valid as long as the files it was parsed from keep their modification time and size, and it was
+    written with the same :attr:`VERSION` of the format. Directories may be among those files, so adding or removing
+    a file in them invalidates the entry too.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Directory of the entries (it is created when the first one is written).
+        """
+        self.directory = directory
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, instance: str) -> str:
+        return os.path.join(self.directory, instance + '.npz')
+
+    @staticmethod
+    def get_stamps(files: list) -> np.ndarray:
+        """ Returns the modification time (in nanoseconds) and size of each file, or -1 for the missing ones. """
+        stamps = np.full((len(files), 2), -1, dtype=np.int64)
+
+        for index, file in enumerate(files):
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+
+            stamps[index] = stat.st_mtime_ns, stat.st_size
+
+        return stamps
+
+    @staticmethod
+    def get_scores_key(score_list: list) -> str:
+        """ Returns a digest of a list of scores (their types and parameters), or None if they cannot be pickled. """
+        try:
+            return hashlib.sha1(pickle.dumps(score_list, protocol=4)).hexdigest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+    def load(self, instance: str, sources: list, scores_key: str = None) -> dict:
+        """
+        Returns the entry of an instance, or None if there is no valid one.
+
+        :param sources: Files the instance is parsed from, which must be the first files of the entry (the rest of
+        them, e.g. the files found in a directory among the sources, are checked as well).
+        :param scores_key: Key of the scores of the problem. The objectives of the entry are only returned if they were
+        computed with the same scores.
+        :return: A dict with the `files` of the entry, the `identifiers` and `sequences` of the instance, the packed
+        `gaps_groups` of each alignment and their `objectives` (None if they are not known).
+        """
+        try:
+            with np.load(self.get_path(instance), allow_pickle=False) as data:
+                entry = self._read(data, list(sources), scores_key)
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            # missing, truncated or written in another format
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def _read(self, data, sources: list, scores_key: str) -> dict:
+        if int(data['version']) != self.VERSION:
+            return None
+
+        files = data['files'].tolist()
+
+        if files[:len(sources)] != sources or not np.array_equal(data['stamps'], self.get_stamps(files)):
+            return None
+
+        lengths, positions = data['lengths'], data['positions']
+        bounds = np.concatenate(([0], np.cumsum(lengths.sum(axis=1))))
+
+        gaps_groups = [(False, lengths[index].tobytes(), 'i', positions[bounds[index]:bounds[index + 1]].tobytes())
+                       for index in range(len(lengths))]
+
+        objectives = None
+        if scores_key is not None and str(data['scores_key']) == scores_key:
+            # objectives of integral scores (e.g., sum-of-pairs) are stored as floats, but given back as ints
+            integral = data['integral'].tolist()
+            objectives = [[int(value) if is_integral else value for value, is_integral in zip(row, integral)]
+                          for row in data['objectives'].tolist()]
+
+        return {'files': files,
+                'identifiers': data['identifiers'].tolist(),
+                'sequences': data['sequences'].tolist(),
+                'gaps_groups': gaps_groups,
+                'objectives': objectives}
+
+    def save(self, instance: str, files: list, identifiers: list, sequences: list, solutions: list,
+             scores_key: str = None) -> None:
+        """
+        Writes the entry of an instance, replacing the previous one.
+
+        :param files: Files the instance was parsed from (see :meth:`load`).
+        :param solutions: Pre-computed alignments of the instance, whose objectives are stored if `scores_key` is
+        given.
+        """
+        packed = [solution.pack_gaps_groups() for solution in solutions]
+        lengths = np.array([np.frombuffer(lengths, dtype=np.int32) for _, lengths, _, _ in packed], dtype=np.int32)
+        positions = np.concatenate([np.frombuffer(positions, dtype=typecode).astype(np.int32)
+                                    for _, _, typecode, positions in packed])
+
+        objectives = [list(solution.objectives) if scores_key is not None else [] for solution in solutions]
+        integral = [all(isinstance(value, (int, np.integer)) for value in column) for column in zip(*objectives)]
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(instance)
+        temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+
+        # written aside and then moved, so concurrent readers never see a partial entry
+        with open(temporary_path, 'wb') as file:
+            np.savez(file,
+                     version=np.int64(self.VERSION),
+                     files=np.array(files, dtype=str),
+                     stamps=self.get_stamps(files),
+                     identifiers=np.array(identifiers, dtype=str),
+                     sequences=np.array(sequences, dtype=str),
+                     lengths=lengths,
+                     positions=positions,
+                     scores_key=np.array(scores_key or ''),
+                     objectives=np.array(objectives, dtype=np.float64),
+                     integral=np.array(integral, dtype=bool))
+
+        os.replace(temporary_path, path)
+
+    def remove(self, instance: str) -> None:
+        try:
+            os.remove(self.get_path(instance))
+        except FileNotFoundError:
+            pass
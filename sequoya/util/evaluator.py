@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, TypeVar
+
+from jmetal.core.problem import Problem
+from jmetal.util.evaluator import Evaluator
+
+from sequoya.core.shared import SharedPopulation, compute_objectives_of_slots
+from sequoya.core.solution import restore_solution
+
+S = TypeVar('S')
+
+
+class BatchEvaluator(Evaluator[S]):
+    """
+    Population evaluator for jMetal algorithms (e.g., `NSGAII(..., population_evaluator=BatchEvaluator())`) which
+    evaluates the whole population with a single call to `problem.evaluate_batch` (see :meth:`MSA.evaluate_batch`).
+    Problems without batch evaluation are evaluated one solution at a time.
+    """
+
+    def evaluate(self, solution_list: List[S], problem: Problem) -> List[S]:
+        evaluate_batch = getattr(problem, 'evaluate_batch', None)
+
+        if evaluate_batch is None:
+            for solution in solution_list:
+                Evaluator.evaluate_solution(solution, problem)
+        else:
+            evaluate_batch(solution_list)
+
+        return solution_list
+
+
+# problem evaluated by the worker processes of a ProcessPoolEvaluator
+_worker_problem = None
+
+
+def _initialize_worker(problem: Problem) -> None:
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _compute_objectives(solution_class: type, key: str, packed_gaps_groups: list) -> list:
+    solutions = [restore_solution(solution_class, key, packed) for packed in packed_gaps_groups]
+
+    return _worker_problem.compute_objectives(solutions)
+
+
+def _compute_objectives_of_slots(population: SharedPopulation, start: int, stop: int, solution_class: type) -> list:
+    return compute_objectives_of_slots(_worker_problem, population, start, stop, solution_class)
+
+
+class ProcessPoolEvaluator(Evaluator[S]):
+    """
+    Population evaluator for jMetal algorithms which scores the population in a pool of processes of the local machine
+    (a `concurrent.futures.ProcessPoolExecutor`), e.g., `NSGAII(..., population_evaluator=ProcessPoolEvaluator())`.
+
+    The pool is started on the first evaluation, and the problem is sent once to each worker, with the original
+    sequences of its instance and its scores (substitution matrices included). Populations are evaluated with
+    :meth:`MSA.evaluate_batch`, so alignments already evaluated, found in the cache or repeated are not sent; the
+    rest go to the workers in one chunk per worker, as their packed gaps groups alone (see
+    :meth:`BaseMSASolution.pack_gaps_groups`), and only their objectives come back. The solutions must share the store
+    of the problem; the ones which do not (e.g., solutions of problems without a store) are scored in this process.
+
+    If `shared_memory` is True, solutions are written in a :class:`SharedPopulation` instead, and workers read them
+    by index.
+
+    Problems without batch evaluation are evaluated one solution at a time in this process. The pool is shut down by
+    :meth:`shutdown` (or on leaving a `with` block).
+    """
+
+    def __init__(self, max_workers: int = None, mp_context=None, shared_memory: bool = False) -> None:
+        """
+        :param max_workers: Number of worker processes (by default, the number of processors).
+        :param mp_context: Multiprocessing context used to start the workers (see `ProcessPoolExecutor`).
+        :param shared_memory: If True, solutions are sent to the workers through shared memory.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.shared_memory = shared_memory
+
+        self._executor = None
+        self._problem = None
+        self._population = None
+
+    def evaluate(self, solution_list: List[S], problem: Problem) -> List[S]:
+        if not hasattr(problem, 'compute_objectives'):
+            return BatchEvaluator().evaluate(solution_list, problem)
+
+        if problem is not self._problem:
+            self.shutdown()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                                 initializer=_initialize_worker, initargs=(problem,))
+            self._problem = problem
+
+        problem.evaluate_batch(solution_list, compute_objectives=self._compute_objectives)
+
+        return solution_list
+
+    def _compute_objectives(self, solutions: list) -> list:
+        # workers only know the store of the problem, so other solutions (e.g., the ones of an MSA problem built from
+        # plain sequences, without a store) are scored in this process
+        store = getattr(self._problem, 'store', None)
+        is_remote = [store is not None and solution._get_shared_store() is store for solution in solutions]
+
+        if all(is_remote):
+            return self._compute_remote_objectives(solutions)
+
+        remote_objectives = iter(self._compute_remote_objectives(
+            [solution for solution, remote in zip(solutions, is_remote) if remote]))
+        local_objectives = iter(self._problem.compute_objectives(
+            [solution for solution, remote in zip(solutions, is_remote) if not remote]))
+
+        return [next(remote_objectives) if remote else next(local_objectives) for remote in is_remote]
+
+    def _compute_remote_objectives(self, solutions: list) -> list:
+        if not solutions:
+            return []
+
+        chunk_size = -(-len(solutions) // self.max_workers)
+        futures = []
+
+        if self.shared_memory:
+            population = self._get_population(solutions)
+            population.put_all(solutions)
+
+            for start in range(0, len(solutions), chunk_size):
+                futures.append(self._executor.submit(_compute_objectives_of_slots, population, start,
+                                                     min(start + chunk_size, len(solutions)), type(solutions[0])))
+
+            return [objectives for future in futures for objectives in future.result()]
+
+        for start in range(0, len(solutions), chunk_size):
+            chunk = solutions[start:start + chunk_size]
+            packed_gaps_groups = [solution.pack_gaps_groups() for solution in chunk]
+
+            futures.append(self._executor.submit(_compute_objectives, type(chunk[0]),
+                                                 chunk[0]._get_shared_store().key, packed_gaps_groups))
+
+        return [objectives for future in futures for objectives in future.result()]
+
+    def _get_population(self, solutions: list) -> SharedPopulation:
+        if self._population is None or not self._population.fits(solutions):
+            owner = None
+
+            if self._population is not None:
+                # workers release the populations replaced by a new one of the same owner
+                owner = self._population.owner
+                self._population.unlink()
+
+            self._population = SharedPopulation.for_solutions(solutions, owner=owner)
+
+        return self._population
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+
+        if self._population is not None:
+            self._population.unlink()
+
+        self._executor = None
+        self._problem = None
+        self._population = None
+
+    def __enter__(self) -> 'ProcessPoolEvaluator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
@@ -0,0 +1,101 @@
+import bz2
+import gzip
+import re
+from typing import Iterator, TextIO
+
+GAP_IDENTIFIER = '-'
+
+_GAPS_PATTERN = re.compile(re.escape(GAP_IDENTIFIER) + '+')
+
+
+def open_fasta_file(filename: str) -> TextIO:
+    """ Opens a FASTA file for reading as text, decompressing it on the fly if it is compressed with gzip or bzip2
+    (which is told by its first bytes, whatever its extension). """
+    with open(filename, 'rb') as file:
+        magic = file.read(3)
+
+    if magic[:2] == b'\x1f\x8b':
+        return gzip.open(filename, 'rt')
+
+    if magic == b'BZh':
+        return bz2.open(filename, 'rt')
+
+    return open(filename, 'r')
+
+
+class _SequenceReader:
+
+    def __init__(self) -> None:
+        self.lines = []
+
+    def add(self, line: str) -> None:
+        self.lines.append(line)
+
+    def get(self) -> tuple:
+        return ''.join(self.lines),
+
+
+class _SequenceEncoder:
+    """ Encodes an aligned sequence line by line, as its original sequence and its gaps group. """
+
+    def __init__(self) -> None:
+        self.residues = []
+        self.gaps_group = []
+        self.length = 0
+
+    def add(self, line: str) -> None:
+        if GAP_IDENTIFIER in line:
+            gaps_group = self.gaps_group
+
+            for match in _GAPS_PATTERN.finditer(line):
+                start, end = self.length + match.start(), self.length + match.end() - 1
+
+                if gaps_group and gaps_group[-1] == start - 1:
+                    # the gaps continue the ones at the end of the previous line
+                    gaps_group[-1] = end
+                else:
+                    gaps_group.append(start)
+                    gaps_group.append(end)
+
+            self.residues.append(line.replace(GAP_IDENTIFIER, ''))
+        else:
+            self.residues.append(line)
+
+        self.length += len(line)
+
+    def get(self) -> tuple:
+        return ''.join(self.residues), self.gaps_group
+
+
+def _read_records(filename: str, reader_class: type) -> Iterator[tuple]:
+    with open_fasta_file(filename) as file:
+        identifier, reader = None, None
+
+        for line in file:
+            if line.startswith('>'):
+                if reader is not None:
+                    yield (identifier,) + reader.get()
+
+                identifier, reader = line[1:].rstrip(), reader_class()
+            elif reader is not None:
+                reader.add(line.rstrip())
+
+        if reader is not None:
+            yield (identifier,) + reader.get()
+
+
+def read_fasta_file(filename: str) -> Iterator[tuple]:
+    """ Reads the records of a FASTA file (plain or compressed, see :func:`open_fasta_file`) one at a time, as pairs
+    (identifier, sequence). The identifier is the whole header line. """
+    return _read_records(filename, _SequenceReader)
+
+
+def read_encoded_fasta_file(filename: str) -> Iterator[tuple]:
+    """
+    Reads the aligned sequences of a FASTA file (plain or compressed, see :func:`open_fasta_file`) one at a time, as
+    triples (identifier, sequence, gaps group): the original sequence (without gaps) and its gaps group as a list of
+    (start, end) positions, as in :class:`MSASolution`. Sequences are encoded as they are read, line by line, so the
+    aligned sequences are never built; records are given to solutions with
+    `MSASolution(problem, msa, encoded=True)`.
+    """
+    return _read_records(filename, _SequenceEncoder)
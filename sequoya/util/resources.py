@@ -0,0 +1,182 @@
+import json
+import os
+from typing import List
+
+
+class ResourceIndex:
+    """
+    Index of a tree of BAliBASE resources (see :class:`BAliBASE`), telling the files of every instance: its original
+    sequences (`bb3_release/RVxx/<instance>.tfa`), its reference alignment (`bb3_aligned/RVxx/<instance>.msf`) and
+    its pre-computed alignments (`bb3_aligned/RVxx/<instance>.<format>`), by format. File names are split at their
+    last dot, so instance names may contain dots. Files may be compressed (see :func:`open_fasta_file`), with a
+    `.gz` or `.bz2` extension after the format; if there are several copies of a file, the plain one is indexed, or
+    else the first one in the order of `COMPRESSED_EXTENSIONS`.
+
+    The tree is scanned once, and the index is written to `FILENAME` in its root, so other processes (e.g., the
+    workers of a batch, see :class:`BatchRunner`) read it instead of listing the directories again; indexes are also
+    kept by each process. An index is valid as long as the directories of the tree keep their modification time, which
+    changes whenever files are added to them, removed or renamed.
+    """
+
+    VERSION = 3
+    FILENAME = '.sequoya_index.json'
+
+    RELEASE_FORMAT = 'tfa'
+    REFERENCE_FORMAT = 'msf'
+    COMPRESSED_EXTENSIONS = ['.gz', '.bz2']
+
+    DIRECTORIES = ['bb3_release', 'bb3_aligned']
+
+    _indexes = {}
+
+    def __init__(self, path: str, instances: dict, stamps: dict) -> None:
+        """
+        :param path: Root of the tree.
+        :param instances: Files of every instance (relative to the root), as a dict with its `reference_set`, its
+        `release` and `reference` files and its `aligned` files by format.
+        :param stamps: Modification time (in nanoseconds) of every directory of the tree, by its relative path.
+        """
+        self.path = path
+        self.instances = instances
+        self.stamps = stamps
+
+    @classmethod
+    def get(cls, path: str) -> 'ResourceIndex':
+        """ Returns the index of a tree: the one of this process or the one written in the tree, if still valid, or a
+        new one (which is written in the tree). """
+        index = cls._indexes.get(path)
+
+        if index is None or not index.is_valid():
+            index = cls.read(path)
+
+            if index is None:
+                index = cls.scan(path)
+                index.write()
+
+            cls._indexes[path] = index
+
+        return index
+
+    @classmethod
+    def scan(cls, path: str) -> 'ResourceIndex':
+        """ Returns a new index of a tree, listing its directories. """
+        instances, stamps = {}, {}
+
+        for directory in cls.DIRECTORIES:
+            stamps[directory] = cls._get_stamp(os.path.join(path, directory))
+
+            if stamps[directory] < 0:
+                continue
+
+            for reference_set in sorted(os.listdir(os.path.join(path, directory))):
+                reference_set_directory = os.path.join(directory, reference_set)
+
+                if not os.path.isdir(os.path.join(path, reference_set_directory)):
+                    continue
+
+                stamps[reference_set_directory] = cls._get_stamp(os.path.join(path, reference_set_directory))
+
+                # preferred copies of a file are listed last, so they replace the others
+                for file in sorted(os.listdir(os.path.join(path, reference_set_directory)),
+                                   key=cls._get_compression_rank, reverse=True):
+                    root, extension = os.path.splitext(file)
+                    name, dot, fmt = (root if extension in cls.COMPRESSED_EXTENSIONS else file).rpartition('.')
+
+                    if not dot or not name:
+                        continue
+
+                    entry = instances.setdefault(name, {'reference_set': None, 'release': None, 'reference': None,
+                                                        'aligned': {}})
+                    relative_file = os.path.join(reference_set_directory, file)
+
+                    if directory == 'bb3_release':
+                        if fmt == cls.RELEASE_FORMAT:
+                            entry['reference_set'] = reference_set
+                            entry['release'] = relative_file
+                    elif fmt == cls.REFERENCE_FORMAT:
+                        entry['reference'] = relative_file
+                    else:
+                        entry['aligned'][fmt] = relative_file
+
+        # names of other files (e.g., the ones left in the trees by other tools) are not instances
+        instances = {name: entry for name, entry in instances.items() if entry['release'] is not None}
+
+        return cls(path, instances, stamps)
+
+    @classmethod
+    def read(cls, path: str) -> 'ResourceIndex':
+        """ Returns the index written in a tree, or None if there is no valid one. """
+        try:
+            with open(os.path.join(path, cls.FILENAME)) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != cls.VERSION:
+            return None
+
+        index = cls(path, data['instances'], data['stamps'])
+
+        return index if index.is_valid() else None
+
+    def write(self) -> None:
+        """ Writes the index in the root of its tree, if it can be written. """
+        filename = os.path.join(self.path, self.FILENAME)
+        temporary_filename = '{0}.{1}.tmp'.format(filename, os.getpid())
+
+        try:
+            with open(temporary_filename, 'w') as file:
+                json.dump({'version': self.VERSION, 'stamps': self.stamps, 'instances': self.instances}, file)
+
+            os.replace(temporary_filename, filename)
+        except OSError:
+            # e.g., read-only trees, which are listed again by every process
+            pass
+
+    def is_valid(self) -> bool:
+        return all(self._get_stamp(os.path.join(self.path, directory)) == stamp
+                   for directory, stamp in self.stamps.items())
+
+    @classmethod
+    def _get_compression_rank(cls, file: str) -> int:
+        extension = os.path.splitext(file)[1]
+
+        return cls.COMPRESSED_EXTENSIONS.index(extension) + 1 if extension in cls.COMPRESSED_EXTENSIONS else 0
+
+    @staticmethod
+    def _get_stamp(directory: str) -> int:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return -1
+
+    def get_instances(self, reference_sets: List[str] = None) -> List[str]:
+        """ Returns the names of the instances, sorted.
+
+        :param reference_sets: Reference sets to look into (e.g., `['RV11', 'RV12']`), all of them by default.
+        """
+        return sorted(name for name, entry in self.instances.items()
+                      if reference_sets is None or entry['reference_set'] in reference_sets)
+
+    def get_reference_set(self, instance: str) -> str:
+        return self.instances[instance]['reference_set']
+
+    def get_release_file(self, instance: str) -> str:
+        return os.path.join(self.path, self.instances[instance]['release'])
+
+    def get_reference_file(self, instance: str) -> str:
+        """ Returns the reference alignment of an instance, or None if there is not one. """
+        reference = self.instances[instance]['reference']
+
+        return os.path.join(self.path, reference) if reference is not None else None
+
+    def get_aligned_files(self, instance: str, formats: List[str] = None) -> List[str]:
+        """ Returns the pre-computed alignments of an instance, in the given formats (all of them by default). """
+        return [os.path.join(self.path, file) for fmt, file in self.instances[instance]['aligned'].items()
+                if formats is None or fmt in formats]
+
+    def __contains__(self, instance: str) -> bool:
+        return instance in self.instances
+
+    def __len__(self) -> int:
+        return len(self.instances)
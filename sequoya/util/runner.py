@@ -0,0 +1,262 @@
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List
+
+import numpy as np
+from distributed import Client, wait as wait_for_dask
+from jmetal.core.algorithm import Algorithm
+from jmetal.util.solution import get_non_dominated_solutions
+from pymsa.core.score import Score
+
+from sequoya.problem import BAliBASE
+from sequoya.util.resources import ResourceIndex
+from sequoya.util.solution import restore_objs
+
+LOGGER = logging.getLogger('Sequoya')
+
+
+def find_instances(path: str, reference_sets: List[str] = None) -> List[str]:
+    """ Returns the names of the BAliBASE instances in a resources tree (see :class:`ResourceIndex`), sorted by name.
+
+    :param reference_sets: Reference sets to look into (e.g., `['RV11', 'RV12']`), all of them by default.
+    """
+    return ResourceIndex.get(path).get_instances(reference_sets)
+
+
+def run_instance(instance: str, path: str, score_list: List[Score], create_algorithm: Callable[..., Algorithm],
+                 problem_options: dict = None) -> dict:
+    """
+    Solves an instance of BAliBASE, returning its result as a dict with the `instance`, the time taken to load it
+    (`load_time`) and to run the algorithm (`computing_time`), the number of `evaluations` and the objectives of the
+    non-dominated solutions found (`front`, with the values of the scores, see :func:`restore_objs`).
+
+    :param create_algorithm: Function returning the algorithm solving a problem, given as its only argument.
+    :param problem_options: Keyword arguments of the problem (e.g., `{'instance_cache': InstanceCache(...)}`).
+    """
+    start_time = time.time()
+    problem = BAliBASE(instance, path, score_list, **(problem_options or {}))
+    load_time = time.time() - start_time
+
+    algorithm = create_algorithm(problem)
+
+    try:
+        algorithm.run()
+    finally:
+        shutdown = getattr(getattr(algorithm, 'population_evaluator', None), 'shutdown', None)
+
+        if shutdown is not None:
+            shutdown()
+
+    front = restore_objs(get_non_dominated_solutions(algorithm.get_result()), problem)
+
+    return {'instance': instance,
+            'load_time': load_time,
+            'computing_time': algorithm.total_computing_time,
+            'evaluations': getattr(algorithm, 'evaluations', 0),
+            'front': [list(solution.objectives) for solution in front]}
+
+
+class BenchmarkResults:
+    """
+    Results of a batch of runs (see :func:`run_instance`), stored in columns: one array per field, with a row per
+    instance, plus the `objectives` of all the fronts one after another (`front_size` tells the rows of each one).
+    They are kept in a `.npz` file, which is written again (as a whole) when results are added.
+    """
+
+    COLUMNS = {'instance': str, 'load_time': np.float64, 'computing_time': np.float64, 'evaluations': np.int64,
+               'front_size': np.int64}
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.columns = {name: [] for name in self.COLUMNS}
+        self.fronts = []
+
+        if os.path.exists(filename):
+            self._read()
+
+    def _read(self) -> None:
+        with np.load(self.filename, allow_pickle=False) as data:
+            for name in self.COLUMNS:
+                self.columns[name] = data[name].tolist()
+
+            bounds = np.concatenate(([0], np.cumsum(data['front_size'])))
+            objectives = data['objectives']
+            self.fronts = [objectives[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def add(self, result: dict) -> None:
+        """ Adds the result of an instance (replacing the previous one, if any) and writes the file. """
+        front = np.array(result['front'], dtype=np.float64).reshape(len(result['front']), -1) \
+            if result['front'] else np.empty((0, 0))
+        row = dict(result, front_size=len(front))
+
+        if result['instance'] in self.columns['instance']:
+            index = self.columns['instance'].index(result['instance'])
+            for name in self.COLUMNS:
+                self.columns[name][index] = row[name]
+            self.fronts[index] = front
+        else:
+            for name in self.COLUMNS:
+                self.columns[name].append(row[name])
+            self.fronts.append(front)
+
+        self.save()
+
+    def save(self) -> None:
+        number_of_objectives = max([front.shape[1] for front in self.fronts] + [0])
+        objectives = np.concatenate([front.reshape(len(front), number_of_objectives) for front in self.fronts]) \
+            if number_of_objectives else np.empty((0, 0))
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        os.makedirs(directory, exist_ok=True)
+        temporary_filename = '{0}.{1}.tmp'.format(self.filename, os.getpid())
+
+        # written aside and then moved, so the file is complete even if the batch is stopped meanwhile
+        with open(temporary_filename, 'wb') as file:
+            np.savez(file, objectives=objectives,
+                     **{name: np.array(values, dtype=dtype) for (name, dtype), values in
+                        zip(self.COLUMNS.items(), self.columns.values())})
+
+        os.replace(temporary_filename, self.filename)
+
+    def get_front(self, instance: str) -> np.ndarray:
+        """ Returns the objectives of the front of an instance, a row per solution. """
+        return self.fronts[self.columns['instance'].index(instance)]
+
+    def __contains__(self, instance: str) -> bool:
+        return instance in self.columns['instance']
+
+    def __len__(self) -> int:
+        return len(self.columns['instance'])
+
+
+class BatchRunner:
+    """
+    Solves many instances of BAliBASE (e.g., whole reference sets, see :func:`find_instances`) with the same
+    algorithm, running up to `max_workers` instances at a time in a pool of processes of the local machine or in the
+    workers of a Dask client. Workers are started once and run one instance after another, so the interpreter, the
+    modules and the cluster are only set up once for the whole batch.
+
+    Results are added to a :class:`BenchmarkResults` file as soon as every run finishes, and instances already there
+    are skipped, so a batch stopped midway is resumed by running it again. Runs that fail are logged and left out of
+    the file. If a process of the local pool dies (e.g., killed for running out of memory), the pool is started again
+    and the instances it was running are resubmitted, up to `MAX_RETRIES` times each.
+    """
+
+    # times an instance is resubmitted after the death of a process of the pool before it is taken as failed
+    MAX_RETRIES = 1
+
+    def __init__(self, path: str, score_list: List[Score], create_algorithm: Callable[..., Algorithm],
+                 results_filename: str, problem_options: dict = None, max_workers: int = None,
+                 client: Client = None) -> None:
+        """
+        :param path: Path of the resources tree (see :class:`BAliBASE`).
+        :param score_list: List of score functions.
+        :param create_algorithm: Function returning the algorithm solving a problem, given as its only argument. It
+        must be picklable (e.g., a function defined at the top level of a module).
+        :param results_filename: Results file (see :class:`BenchmarkResults`).
+        :param problem_options: Keyword arguments of the problems (see :class:`BAliBASE`).
+        :param max_workers: Maximum number of instances run at a time (by default, the number of processors, or the
+        number of threads of the workers of the client).
+        :param client: Dask client running the instances. If not given, they are run in a local pool of processes.
+        """
+        self.path = path
+        self.score_list = score_list
+        self.create_algorithm = create_algorithm
+        self.results = BenchmarkResults(results_filename)
+        self.problem_options = problem_options
+        self.client = client
+
+        if max_workers is None:
+            max_workers = sum(client.nthreads().values()) if client is not None else os.cpu_count() or 1
+
+        self.max_workers = max_workers
+        self._executor = None
+
+    def run(self, instances: List[str] = None) -> BenchmarkResults:
+        """
+        Runs the instances which are not in the results yet.
+
+        :param instances: Instances to run, all the ones in the resources tree by default.
+        :return: The results of the batch.
+        """
+        if instances is None:
+            instances = find_instances(self.path)
+
+        pending_instances = [instance for instance in instances if instance not in self.results]
+        LOGGER.info('Running {0} instances ({1} already completed)'.format(
+            len(pending_instances), len(instances) - len(pending_instances)))
+
+        running = {}
+        retries = {}
+        pending_instances.reverse()
+
+        while pending_instances or running:
+            while pending_instances and len(running) < self.max_workers:
+                instance = pending_instances.pop()
+                running[self._submit(instance)] = instance
+
+            done, _ = self._wait(list(running))
+
+            for future in done:
+                instance = running.pop(future)
+
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if retries.get(instance, 0) < self.MAX_RETRIES:
+                        retries[instance] = retries.get(instance, 0) + 1
+                        pending_instances.append(instance)
+                        LOGGER.warning('A process of the pool died running instance {0}, resubmitting it'.format(
+                            instance))
+                    else:
+                        LOGGER.exception('Instance {0} failed'.format(instance))
+                    continue
+                except Exception:
+                    LOGGER.exception('Instance {0} failed'.format(instance))
+                    continue
+
+                self.results.add(result)
+                LOGGER.info('Instance {0} completed in {1:.2f} seconds, front of {2} solutions'.format(
+                    instance, result['computing_time'], len(result['front'])))
+
+        return self.results
+
+    def _submit(self, instance: str):
+        arguments = (instance, self.path, self.score_list, self.create_algorithm, self.problem_options)
+
+        if self.client is not None:
+            return self.client.submit(run_instance, *arguments, pure=False)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            return self._executor.submit(run_instance, *arguments)
+        except BrokenProcessPool:
+            # a process died, so the pool no longer takes runs: it is replaced by a new one
+            self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+            return self._executor.submit(run_instance, *arguments)
+
+    def _wait(self, futures: list) -> tuple:
+        if self.client is not None:
+            return wait_for_dask(futures, return_when='FIRST_COMPLETED')
+
+        return wait(futures, return_when=FIRST_COMPLETED)
+
+    def shutdown(self) -> None:
+        """ Shuts the local pool of processes down (a client is left as it is). """
+        if self._executor is not None:
+            self._executor.shutdown()
+
+        self._executor = None
+
+    def __enter__(self) -> 'BatchRunner':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
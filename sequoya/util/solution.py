@@ -7,6 +7,9 @@ def restore_objs(front, problem: MSA):
             if not problem.score_list[i].is_minimization():
                 solution.objectives[i] = -1.0 * solution.objectives[i]
 
+        # objectives no longer match the ones computed by the problem
+        solution.attributes.pop('fingerprint', None)
+
     return front
 
 
@@ -24,3 +27,25 @@ def get_representative_set(front):
     middle = front[len(front) // 2]
 
     return upper_extreme, middle, lower_extreme
+
+
+def is_duplicate(solution, solution_list: list) -> bool:
+    """ Returns True if a solution with the same alignment as `solution` (see `MSASolution.get_fingerprint`) is in the
+    list. """
+    fingerprint = solution.get_fingerprint()
+    return any(other.get_fingerprint() == fingerprint for other in solution_list)
+
+
+def remove_duplicates(solution_list: list) -> list:
+    """ Returns the solutions of the list with a different alignment, keeping the first of each set of duplicates. """
+    fingerprints = set()
+    unique_solutions = []
+
+    for solution in solution_list:
+        fingerprint = solution.get_fingerprint()
+
+        if fingerprint not in fingerprints:
+            fingerprints.add(fingerprint)
+            unique_solutions.append(solution)
+
+    return unique_solutions
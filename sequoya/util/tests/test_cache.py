@@ -0,0 +1,183 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from pymsa.core.score import SumOfPairs, PercentageOfNonGaps
+
+from sequoya.core.solution import MSASolution, restore_solution
+from sequoya.core.store import SequencesStore
+from sequoya.problem import MSA
+from sequoya.util.cache import EvaluationCache, InstanceCache
+
+
+class EvaluationCacheTestCases(unittest.TestCase):
+
+    def test_should_return_cached_objectives(self):
+        # setup
+        cache = EvaluationCache(max_entries=10)
+        cache.put(1, [-10.0, 0.5])
+
+        # run
+        objectives = cache.get(1)
+        missing_objectives = cache.get(2)
+
+        # check
+        self.assertEqual((-10.0, 0.5), objectives)
+        self.assertIsNone(missing_objectives)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0.5, cache.get_hit_rate())
+
+    def test_should_evict_least_recently_used_entries(self):
+        # setup
+        cache = EvaluationCache(max_entries=2)
+        cache.put(1, [1.0])
+        cache.put(2, [2.0])
+
+        # run
+        cache.get(1)
+        cache.put(3, [3.0])
+
+        # check
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertIn(3, cache)
+        self.assertEqual(1, cache.get_statistics()['evictions'])
+
+    def test_should_bound_the_size_in_bytes(self):
+        # setup
+        cache = EvaluationCache(max_entries=100)
+        cache.put(1, [1.0])
+        entry_size = cache.size_in_bytes
+        cache = EvaluationCache(max_entries=100, max_bytes=3 * entry_size)
+
+        # run
+        for fingerprint in range(10):
+            cache.put(fingerprint, [1.0])
+
+        # check
+        self.assertEqual(3, len(cache))
+        self.assertEqual(3 * entry_size, cache.get_statistics()['size_in_bytes'])
+
+    def test_should_unpickle_the_cache_of_the_process(self):
+        # setup
+        cache = EvaluationCache(max_entries=5)
+        cache.put(1, [1.0])
+        data = pickle.dumps(cache)
+
+        # run
+        unpickled_cache = pickle.loads(data)
+        del EvaluationCache._caches[cache.cache_id]
+        new_cache = pickle.loads(data)
+
+        # check
+        self.assertIs(cache, unpickled_cache)
+        self.assertIsNot(cache, new_cache)
+        self.assertEqual(cache.cache_id, new_cache.cache_id)
+        self.assertEqual(5, new_cache.max_entries)
+        self.assertEqual(0, len(new_cache))
+
+    def test_should_release_caches_no_longer_used(self):
+        # setup
+        cache = EvaluationCache(max_entries=5)
+        cache_id = cache.cache_id
+
+        # run
+        del cache
+
+        # check
+        self.assertNotIn(cache_id, EvaluationCache._caches)
+
+
+class InstanceCacheTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, 'instance.tfa')
+        with open(self.source, 'w') as file:
+            file.write('>seq1\nACTGAC\n>seq2\nACTGAC\n')
+
+        self.problem = MSA(score_list=[SumOfPairs(), PercentageOfNonGaps()])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+
+        self.solution = MSASolution(self.problem, msa=[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')])
+        self.problem.evaluate(self.solution)
+        self.scores_key = InstanceCache.get_scores_key(self.problem.score_list)
+
+        self.cache = InstanceCache(os.path.join(self.directory.name, 'cache'))
+        self.cache.save('instance', [self.source], ['seq1', 'seq2'], ['ACTGAC', 'ACTGAC'], [self.solution],
+                        self.scores_key)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_should_load_a_saved_instance(self):
+        # run
+        entry = self.cache.load('instance', [self.source], self.scores_key)
+
+        # check
+        store = SequencesStore.register(entry['identifiers'], entry['sequences'])
+        solution = restore_solution(MSASolution, store.key, entry['gaps_groups'][0])
+
+        self.assertEqual(['seq1', 'seq2'], entry['identifiers'])
+        self.assertEqual(['ACTGAC', 'ACTGAC'], entry['sequences'])
+        self.assertEqual(self.solution.decode_alignment_as_list_of_pairs(),
+                         solution.decode_alignment_as_list_of_pairs())
+        self.assertEqual([self.solution.objectives], entry['objectives'])
+        self.assertIsInstance(entry['objectives'][0][0], int)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_should_not_load_an_instance_whose_files_changed(self):
+        # setup
+        with open(self.source, 'a') as file:
+            file.write('>seq3\nACTGAC\n')
+
+        # run
+        entry = self.cache.load('instance', [self.source], self.scores_key)
+
+        # check
+        self.assertIsNone(entry)
+        self.assertEqual(1, self.cache.misses)
+
+    def test_should_not_load_an_instance_parsed_from_other_files(self):
+        # run
+        entry = self.cache.load('instance', [os.path.join(self.directory.name, 'other.tfa')], self.scores_key)
+
+        # check
+        self.assertIsNone(entry)
+
+    def test_should_not_load_objectives_computed_with_other_scores(self):
+        # run
+        entry = self.cache.load('instance', [self.source], InstanceCache.get_scores_key([SumOfPairs()]))
+
+        # check
+        self.assertIsNone(entry['objectives'])
+        self.assertEqual(1, len(entry['gaps_groups']))
+
+    def test_should_not_load_an_instance_of_another_version(self):
+        # setup
+        cache = InstanceCache(self.cache.directory)
+        cache.VERSION = InstanceCache.VERSION + 1
+
+        # run
+        entry = cache.load('instance', [self.source], self.scores_key)
+
+        # check
+        self.assertIsNone(entry)
+
+    def test_should_not_load_a_corrupted_instance(self):
+        # setup
+        with open(self.cache.get_path('instance'), 'wb') as file:
+            file.write(b'corrupted')
+
+        # run
+        entry = self.cache.load('instance', [self.source], self.scores_key)
+
+        # check
+        self.assertIsNone(entry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import multiprocessing
+import unittest
+from unittest import mock
+
+from pymsa.core.score import SumOfPairs
+
+from sequoya.core.solution import MSASolution
+from sequoya.core.store import SequencesStore
+from sequoya.problem import MSA
+from sequoya.util.evaluator import BatchEvaluator, ProcessPoolEvaluator
+
+
+class BatchEvaluatorTestCases(unittest.TestCase):
+
+    def test_should_evaluate_the_population_in_a_single_batch(self):
+        # setup
+        problem = mock.Mock()
+        population = [mock.Mock(), mock.Mock()]
+
+        # run
+        result = BatchEvaluator().evaluate(population, problem)
+
+        # check
+        problem.evaluate_batch.assert_called_once_with(population)
+        problem.evaluate.assert_not_called()
+        self.assertEqual(population, result)
+
+    def test_should_evaluate_one_solution_at_a_time_if_the_problem_has_no_batch_evaluation(self):
+        # setup
+        problem = mock.Mock(spec=['evaluate'])
+        population = [mock.Mock(), mock.Mock()]
+
+        # run
+        BatchEvaluator().evaluate(population, problem)
+
+        # check
+        self.assertEqual([mock.call(population[0]), mock.call(population[1])], problem.evaluate.call_args_list)
+
+
+class ProcessPoolEvaluatorTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.problem = MSA(score_list=[SumOfPairs()])
+        self.problem.identifiers = ['seq1', 'seq2']
+        self.problem.number_of_variables = 2
+        self.alignments = [[('seq1', 'AC-TG-AC'), ('seq2', 'A-CTGA-C')], [('seq1', 'ACTG-AC'), ('seq2', 'ACTGA-C')],
+                           [('seq1', 'AC-TGAC'), ('seq2', 'A-CTGAC')]]
+        self.problem.store = SequencesStore.from_alignment(self.problem.identifiers, self.alignments[0])
+
+    def test_should_evaluate_the_population_in_worker_processes(self):
+        # setup
+        population = [MSASolution(self.problem, msa=msa) for msa in self.alignments]
+
+        # run
+        # workers are spawned, so they do not inherit the mock
+        with ProcessPoolEvaluator(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as evaluator:
+            with mock.patch.object(MSA, '_compute_scores') as compute_scores:
+                result = evaluator.evaluate(population, self.problem)
+
+        # check
+        compute_scores.assert_not_called()
+        self.assertEqual(population, result)
+        self.assertEqual([[-SumOfPairs().compute([pair[1] for pair in msa])] for msa in self.alignments],
+                         [solution.objectives for solution in population])
+        self.assertFalse(any(solution.has_dirty_columns() for solution in population))
+
+    def test_should_send_solutions_through_shared_memory(self):
+        # setup
+        population = [MSASolution(self.problem, msa=msa) for msa in self.alignments]
+
+        # run
+        with ProcessPoolEvaluator(max_workers=2, shared_memory=True) as evaluator:
+            evaluator.evaluate(population, self.problem)
+
+        # check
+        self.assertEqual([[-SumOfPairs().compute([pair[1] for pair in msa])] for msa in self.alignments],
+                         [solution.objectives for solution in population])
+
+    def test_should_evaluate_solutions_without_a_shared_store_in_this_process(self):
+        # setup
+        self.problem.store = None
+        population = [MSASolution(self.problem, msa=msa) for msa in self.alignments]
+
+        # run
+        with ProcessPoolEvaluator(max_workers=2) as evaluator:
+            evaluator.evaluate(population, self.problem)
+
+        # check
+        self.assertEqual([[-SumOfPairs().compute([pair[1] for pair in msa])] for msa in self.alignments],
+                         [solution.objectives for solution in population])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import bz2
+import gzip
+import os
+import tempfile
+import unittest
+
+from sequoya.util.fasta import read_encoded_fasta_file, read_fasta_file
+
+FASTA = '>seq1 first sequence\nAC---\n--TGAC\n>seq2\nAT--CT\n--C-\n\n>seq3\n--AACTGC\n'
+
+
+class FastaTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, filename: str, opener=open) -> str:
+        filename = os.path.join(self.directory.name, filename)
+
+        with opener(filename, 'wt') as file:
+            file.write(FASTA)
+
+        return filename
+
+    def test_should_read_the_records_of_a_file(self):
+        # run
+        records = list(read_fasta_file(self._write('alignment.fasta')))
+
+        # check
+        self.assertEqual([('seq1 first sequence', 'AC-----TGAC'), ('seq2', 'AT--CT--C-'), ('seq3', '--AACTGC')],
+                         records)
+
+    def test_should_encode_the_aligned_sequences_of_a_file(self):
+        # run
+        records = list(read_encoded_fasta_file(self._write('alignment.fasta')))
+
+        # check
+        self.assertEqual([('seq1 first sequence', 'ACTGAC', [2, 6]),
+                          ('seq2', 'ATCTC', [2, 3, 6, 7, 9, 9]),
+                          ('seq3', 'AACTGC', [0, 1])], records)
+
+    def test_should_read_compressed_files(self):
+        # setup
+        expected_records = list(read_encoded_fasta_file(self._write('alignment.fasta')))
+
+        # run
+        gzip_records = list(read_encoded_fasta_file(self._write('alignment.fasta.gz', gzip.open)))
+        bzip2_records = list(read_encoded_fasta_file(self._write('alignment', bz2.open)))
+
+        # check
+        self.assertEqual(expected_records, gzip_records)
+        self.assertEqual(expected_records, bzip2_records)
+
+
+if __name__ == "__main__":
+    unittest.main()
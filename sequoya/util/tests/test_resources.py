@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sequoya.util.resources import ResourceIndex
+
+
+class ResourceIndexTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+        for file in ['bb3_release/RV11/BB11001.tfa', 'bb3_release/RV11/BB.11002.tfa', 'bb3_release/RV12/BB12001.tfa',
+                     'bb3_aligned/RV11/BB11001.msf', 'bb3_aligned/RV11/BB11001.tfa_clu',
+                     'bb3_aligned/RV11/BB11001.tfa_muscle.gz', 'bb3_aligned/RV11/BB.11002.tfa_clu',
+                     'bb3_aligned/RV11/BB11001.tfa_clu.bak', 'bb3_aligned/RV11/README']:
+            self._create_file(file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        ResourceIndex._indexes.pop(self.path, None)
+
+    def _create_file(self, file: str) -> None:
+        os.makedirs(os.path.dirname(os.path.join(self.path, file)), exist_ok=True)
+        open(os.path.join(self.path, file), 'w').close()
+
+    def test_should_index_the_files_of_the_instances(self):
+        # run
+        index = ResourceIndex.scan(self.path)
+
+        # check
+        self.assertEqual(['BB.11002', 'BB11001', 'BB12001'], index.get_instances())
+        self.assertEqual(['BB.11002', 'BB11001'], index.get_instances(['RV11']))
+        self.assertEqual('RV11', index.get_reference_set('BB11001'))
+        self.assertEqual(os.path.join(self.path, 'bb3_release/RV11/BB11001.tfa'), index.get_release_file('BB11001'))
+        self.assertEqual(os.path.join(self.path, 'bb3_aligned/RV11/BB11001.msf'), index.get_reference_file('BB11001'))
+        self.assertIsNone(index.get_reference_file('BB12001'))
+        self.assertEqual([os.path.join(self.path, 'bb3_aligned/RV11/BB11001.tfa_clu')],
+                         index.get_aligned_files('BB11001', ['tfa_clu']))
+        self.assertEqual([os.path.join(self.path, 'bb3_aligned/RV11/BB.11002.tfa_clu')],
+                         index.get_aligned_files('BB.11002'))
+        self.assertEqual([os.path.join(self.path, 'bb3_aligned/RV11/BB11001.tfa_muscle.gz')],
+                         index.get_aligned_files('BB11001', ['tfa_muscle']))
+        self.assertEqual(2, len(index.get_aligned_files('BB11001')))
+
+    def test_should_prefer_plain_files_to_compressed_copies(self):
+        # setup
+        for file in ['bb3_release/RV11/BB11001.tfa.gz', 'bb3_aligned/RV11/BB11001.tfa_clu.gz',
+                     'bb3_aligned/RV11/BB11001.tfa_muscle.bz2']:
+            self._create_file(file)
+
+        for order in (sorted, lambda files: sorted(files, reverse=True)):
+            listdir = os.listdir
+
+            # run
+            with mock.patch('os.listdir', side_effect=lambda directory: order(listdir(directory))):
+                index = ResourceIndex.scan(self.path)
+
+            # check
+            self.assertEqual(os.path.join(self.path, 'bb3_release/RV11/BB11001.tfa'),
+                             index.get_release_file('BB11001'))
+            self.assertEqual([os.path.join(self.path, 'bb3_aligned/RV11/BB11001.tfa_clu')],
+                             index.get_aligned_files('BB11001', ['tfa_clu']))
+            self.assertEqual([os.path.join(self.path, 'bb3_aligned/RV11/BB11001.tfa_muscle.gz')],
+                             index.get_aligned_files('BB11001', ['tfa_muscle']))
+
+    def test_should_reuse_the_written_index(self):
+        # setup
+        index = ResourceIndex.get(self.path)
+        ResourceIndex._indexes.pop(self.path)
+
+        # run
+        with mock.patch('os.listdir') as listdir:
+            read_index = ResourceIndex.get(self.path)
+
+        # check
+        listdir.assert_not_called()
+        self.assertIsNot(index, read_index)
+        self.assertEqual(index.instances, read_index.instances)
+        self.assertIs(read_index, ResourceIndex.get(self.path))
+
+    def test_should_scan_the_tree_again_when_files_are_added(self):
+        # setup
+        index = ResourceIndex.get(self.path)
+        stamp = os.stat(os.path.join(self.path, 'bb3_release/RV12')).st_mtime_ns
+
+        # run
+        self._create_file('bb3_release/RV12/BB12002.tfa')
+        os.utime(os.path.join(self.path, 'bb3_release/RV12'), ns=(stamp + 10 ** 9, stamp + 10 ** 9))
+        new_index = ResourceIndex.get(self.path)
+
+        # check
+        self.assertFalse(index.is_valid())
+        self.assertNotIn('BB12002', index)
+        self.assertIn('BB12002', new_index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from sequoya.util.runner import BatchRunner, BenchmarkResults, find_instances
+
+
+def _get_result(instance: str, front: list) -> dict:
+    return {'instance': instance, 'load_time': 0.1, 'computing_time': 2.0, 'evaluations': 100, 'front': front}
+
+
+def _run_instance_killing_the_worker(instance: str, path: str, *args) -> dict:
+    # the worker dies the first time it runs an instance, and every time it runs BB11001
+    marker_filename = os.path.join(path, instance + '.killed')
+
+    if instance == 'BB11001' or not os.path.exists(marker_filename):
+        open(marker_filename, 'w').close()
+        os._exit(1)
+
+    return _get_result(instance, [[1.0, 1.0]])
+
+
+def _get_future(result: dict) -> Future:
+    future = Future()
+    future.set_result(result)
+
+    return future
+
+
+class FindInstancesTestCases(unittest.TestCase):
+
+    def test_should_find_the_instances_of_the_reference_sets(self):
+        # setup
+        with tempfile.TemporaryDirectory() as path:
+            for reference_set, instance in [('RV11', 'BB11002'), ('RV11', 'BB11001'), ('RV12', 'BB12001')]:
+                os.makedirs(os.path.join(path, 'bb3_release', reference_set), exist_ok=True)
+                open(os.path.join(path, 'bb3_release', reference_set, instance + '.tfa'), 'w').close()
+
+            # run
+            instances = find_instances(path)
+            instances_of_rv11 = find_instances(path, ['RV11'])
+
+        # check
+        self.assertEqual(['BB11001', 'BB11002', 'BB12001'], instances)
+        self.assertEqual(['BB11001', 'BB11002'], instances_of_rv11)
+
+
+class BenchmarkResultsTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'results.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_should_read_the_added_results(self):
+        # setup
+        results = BenchmarkResults(self.filename)
+        results.add(_get_result('BB11001', [[10.0, 1.5], [20.0, 0.5]]))
+        results.add(_get_result('BB11002', [[30.0, 2.5]]))
+
+        # run
+        read_results = BenchmarkResults(self.filename)
+
+        # check
+        self.assertEqual(2, len(read_results))
+        self.assertIn('BB11002', read_results)
+        self.assertEqual(['BB11001', 'BB11002'], read_results.columns['instance'])
+        self.assertEqual([2, 1], read_results.columns['front_size'])
+        self.assertEqual([[10.0, 1.5], [20.0, 0.5]], read_results.get_front('BB11001').tolist())
+        self.assertEqual([[30.0, 2.5]], read_results.get_front('BB11002').tolist())
+
+    def test_should_replace_the_result_of_an_instance(self):
+        # setup
+        results = BenchmarkResults(self.filename)
+        results.add(_get_result('BB11001', [[10.0, 1.5], [20.0, 0.5]]))
+
+        # run
+        results.add(_get_result('BB11001', [[30.0, 2.5]]))
+
+        # check
+        read_results = BenchmarkResults(self.filename)
+        self.assertEqual(1, len(read_results))
+        self.assertEqual([[30.0, 2.5]], read_results.get_front('BB11001').tolist())
+
+
+class BatchRunnerTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'results.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_should_skip_completed_instances(self):
+        # setup
+        BenchmarkResults(self.filename).add(_get_result('BB11001', [[10.0, 1.5]]))
+        runner = BatchRunner('resources', [], None, self.filename, max_workers=1)
+
+        # run
+        with mock.patch.object(BatchRunner, '_submit',
+                               side_effect=lambda instance: _get_future(_get_result(instance, [[1.0, 1.0]]))) as submit:
+            results = runner.run(['BB11001', 'BB11002', 'BB11003'])
+
+        # check
+        self.assertEqual([mock.call('BB11002'), mock.call('BB11003')], submit.call_args_list)
+        self.assertEqual(['BB11001', 'BB11002', 'BB11003'], BenchmarkResults(self.filename).columns['instance'])
+        self.assertEqual(3, len(results))
+
+    def test_should_leave_failed_instances_out_of_the_results(self):
+        # setup
+        runner = BatchRunner('resources', [], None, self.filename, max_workers=2)
+        failed_future = Future()
+        failed_future.set_exception(Exception('failed'))
+
+        # run
+        with mock.patch.object(BatchRunner, '_submit',
+                               side_effect=[failed_future, _get_future(_get_result('BB11002', [[1.0, 1.0]]))]):
+            results = runner.run(['BB11001', 'BB11002'])
+
+        # check
+        self.assertNotIn('BB11001', results)
+        self.assertIn('BB11002', results)
+
+    def test_should_resubmit_the_instances_of_a_dead_worker(self):
+        # setup
+        runner = BatchRunner(self.directory.name, [], None, self.filename, max_workers=1)
+
+        # run
+        with mock.patch('sequoya.util.runner.run_instance', _run_instance_killing_the_worker), runner:
+            results = runner.run(['BB11002', 'BB11003'])
+
+        # check
+        self.assertEqual(['BB11002', 'BB11003'], results.columns['instance'])
+
+    def test_should_leave_out_instances_which_always_kill_the_worker(self):
+        # setup
+        runner = BatchRunner(self.directory.name, [], None, self.filename, max_workers=1)
+
+        # run
+        with mock.patch('sequoya.util.runner.run_instance', _run_instance_killing_the_worker), runner:
+            results = runner.run(['BB11001', 'BB11002'])
+
+        # check
+        self.assertNotIn('BB11001', results)
+        self.assertIn('BB11002', results)
+
+
+if __name__ == "__main__":
+    unittest.main()
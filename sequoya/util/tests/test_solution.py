@@ -0,0 +1,38 @@
+import unittest
+
+from sequoya.core.solution import MSASolution
+from sequoya.problem import MSA
+from sequoya.util.solution import is_duplicate, remove_duplicates
+
+
+class DuplicatesTestCases(unittest.TestCase):
+
+    def setUp(self):
+        problem = MSA(score_list=[])
+        problem.identifiers = ['seq1', 'seq2']
+        problem.number_of_variables = 2
+
+        self.msa_1 = MSASolution(problem, msa=[('seq1', 'AC--TGAC'), ('seq2', 'A-C-TGAC')])
+        self.msa_2 = MSASolution(problem, msa=[('seq1', 'ACTG--AC'), ('seq2', 'A-C-TGAC')])
+        self.msa_3 = MSASolution(problem, msa=[('seq1', 'ACTGAC'), ('seq2', 'ACTGAC')])
+        self.msa_3.gaps_groups[0] = [2, 2, 3, 3]
+        self.msa_3.gaps_groups[1] = [1, 1, 3, 3]
+
+    def test_should_find_duplicates(self):
+        # check
+        self.assertTrue(is_duplicate(self.msa_3, [self.msa_2, self.msa_1]))
+        self.assertFalse(is_duplicate(self.msa_2, [self.msa_1, self.msa_3]))
+        self.assertFalse(is_duplicate(self.msa_1, []))
+
+    def test_should_remove_duplicates(self):
+        # run
+        solutions = remove_duplicates([self.msa_1, self.msa_2, self.msa_3, self.msa_2])
+
+        # check
+        self.assertEqual(2, len(solutions))
+        self.assertIs(self.msa_1, solutions[0])
+        self.assertIs(self.msa_2, solutions[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,7 +13,7 @@ setup(
     author_email='antonio.b@uma.es',
     maintainer='Antonio Benítez-Hidalgo',
     maintainer_email='antonio.b@uma.es',
-    python_requires='>=3',
+    python_requires='>=3.8',
     license='MIT',
     url='https://github.com/benhid/Sequoya',
     long_description=open('README.md').read(),
@@ -23,11 +23,17 @@ setup(
         'Intended Audience :: Science/Research',
         'License :: OSI Approved :: MIT License',
         'Topic :: Scientific/Engineering :: Bio-Informatics',
-        'Programming Language :: Python :: 3.6'
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12'
     ],
     install_requires=[
         'jmetalpy==1.5.4',
         'pyMSA==0.5.1',
+        'numpy',
         'bokeh==1.1.0'  # optional for Dask web interface
     ]
 )